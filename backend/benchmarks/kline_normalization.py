@@ -0,0 +1,72 @@
+# benchmarks/kline_normalization.py
+#
+# Compares the legacy per-row kline normalizer (dict(zip(schema, k)) per candle,
+# list of dicts -> DataFrame) with the vectorized, schema-driven parser on
+# synthetic 1,500-row KuCoin pages (the exchange's max page size).
+#
+# Usage (from backend/):  python -m benchmarks.kline_normalization [--pages 200] [--rows 1500]
+
+import argparse
+import time
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+from core.exchange_fetcher import EXCHANGE_CONFIG
+from core.kline_columns import parse_kline_payload, kline_columns_to_frame
+
+KUCOIN_SCHEMA = EXCHANGE_CONFIG['kucoin']['kline_schema']
+
+def make_kucoin_page(rows: int, seed: int = 7) -> List[List[str]]:
+    """KuCoin returns newest-first string arrays: [time(s), open, close, high, low, volume, turnover]."""
+    rng = np.random.default_rng(seed)
+    start = 1_700_000_000 - rows * 300
+    close = 30_000 + np.cumsum(rng.normal(0, 25, rows))
+    page = []
+    for i in range(rows - 1, -1, -1):
+        o, c = close[i - 1] if i else close[i], close[i]
+        h, l = max(o, c) + abs(rng.normal(0, 10)), min(o, c) - abs(rng.normal(0, 10))
+        page.append([str(start + i * 300), f"{o:.2f}", f"{c:.2f}", f"{h:.2f}", f"{l:.2f}", f"{abs(rng.normal(5, 2)):.6f}", f"{abs(rng.normal(150_000, 5_000)):.2f}"])
+    return page
+
+def legacy_normalize(data: List[list], schema: List[str]) -> List[Dict[str, Any]]:
+    normalized = []
+    for k in data:
+        mapping = dict(zip(schema, k)); raw_ts = mapping.get('ts')
+        ts = int(pd.to_datetime(raw_ts).timestamp() * 1000) if isinstance(raw_ts, str) and not str(raw_ts).isdigit() else int(raw_ts)
+        if ts < 1_000_000_000_000: ts *= 1000
+        o, h, l, c, v = float(mapping['o']), float(mapping['h']), float(mapping['l']), float(mapping['c']), float(mapping['v'])
+        h, l = max(h, l), min(h, l)
+        normalized.append({"timestamp": ts, "open": o, "high": h, "low": l, "close": c, "volume": v})
+    return normalized
+
+def legacy_pipeline(page: List[list]) -> pd.DataFrame:
+    df = pd.DataFrame(legacy_normalize(page, KUCOIN_SCHEMA)); df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+    df.set_index('timestamp', inplace=True); df.sort_index(inplace=True)
+    return df
+
+def vectorized_pipeline(page: List[list]) -> pd.DataFrame:
+    cols = parse_kline_payload(page, KUCOIN_SCHEMA, fix_high_low=True, source='kucoin')
+    order = np.argsort(cols['timestamp'], kind='stable')
+    return kline_columns_to_frame({k: v[order] for k, v in cols.items()})
+
+def run(pages: int, rows: int):
+    page = make_kucoin_page(rows)
+    legacy_df, vector_df = legacy_pipeline(page), vectorized_pipeline(page)
+    pd.testing.assert_frame_equal(legacy_df, vector_df, check_freq=False, check_index_type=False)
+    results = {}
+    for name, fn in (("legacy per-row", legacy_pipeline), ("vectorized", vectorized_pipeline)):
+        fn(page)
+        started = time.perf_counter()
+        for _ in range(pages): fn(page)
+        elapsed = time.perf_counter() - started
+        results[name] = elapsed
+        print(f"{name:>16}: {elapsed / pages * 1000:8.3f} ms/page  ({pages * rows / elapsed:,.0f} candles/s)")
+    print(f"{'speedup':>16}: {results['legacy per-row'] / results['vectorized']:.1f}x on {rows}-row KuCoin pages")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark kline normalization on KuCoin-sized pages.")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1500)
+    args = parser.parse_args()
+    run(args.pages, args.rows)
@@ -0,0 +1,70 @@
+# core/candle_history.py (v1.0 - The Ring Buffer)
+
+import logging
+import numpy as np
+import pandas as pd
+
+from core.kline_columns import KLINE_FIELDS, KlineColumns, kline_columns_to_frame
+
+logger = logging.getLogger(__name__)
+
+class CandleHistory:
+    """
+    Fixed-capacity candle history for one symbol/timeframe, kept across worker cycles.
+    The columns are mirrored ring buffers: every row is written at slot i and at
+    slot i + capacity, so the newest `capacity` rows are always one contiguous
+    slice and reading the history never has to stitch the wrap-around back together.
+    Merging a freshly fetched frame rewinds over the overlapping candles (the
+    fetched copy wins, like the forming candle being revised), appends the rest and
+    drops the oldest rows past capacity, all in place. Memory is allocated once.
+    When full, at least `trim_step` rows are dropped at once, so the first row of the
+    history (where carried indicator recursions start) only moves every few cycles.
+    """
+    def __init__(self, capacity: int, trim_step: int = 1):
+        if capacity < 1: raise ValueError(f"CandleHistory capacity must be positive, got {capacity}.")
+        self.capacity, self.trim_step = int(capacity), max(1, int(trim_step))
+        self._buffers = {f: np.empty(2 * self.capacity, dtype=np.int64 if f == 'timestamp' else np.float64) for f in KLINE_FIELDS}
+        self._start = 0; self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def columns(self) -> KlineColumns:
+        """Read-only views of the rows in chronological order (no copy)."""
+        views = {f: buf[self._start:self._start + self._size] for f, buf in self._buffers.items()}
+        for view in views.values(): view.flags.writeable = False
+        return views
+
+    def frame(self) -> pd.DataFrame:
+        return kline_columns_to_frame(self.columns())
+
+    def merge(self, df: pd.DataFrame) -> int:
+        """
+        Merges a chronological OHLCV frame (UTC timestamp index) into the history and
+        returns the number of rows written. Buffered rows at or after the frame's first
+        candle are replaced; a frame that reaches further back than the history resets it.
+        """
+        if df is None or df.empty: return 0
+        ts = df.index.as_unit('ms').asi8
+        if self._size:
+            buffered = self._buffers['timestamp'][self._start:self._start + self._size]
+            if ts[0] <= buffered[0]: self._start = self._size = 0
+            else: self._size = int(np.searchsorted(buffered, ts[0], side='left'))
+        rows = {'timestamp': ts, **{f: df[f].to_numpy(dtype=np.float64) for f in KLINE_FIELDS if f != 'timestamp'}}
+        if len(ts) > self.capacity:
+            rows = {f: values[-self.capacity:] for f, values in rows.items()}
+        count = len(rows['timestamp'])
+        # Make room first: the oldest rows fall off the front.
+        overflow = self._size + count - self.capacity
+        if overflow > 0:
+            dropped = min(self._size, max(overflow, self.trim_step))
+            self._start = (self._start + dropped) % self.capacity; self._size -= dropped
+        first = (self._start + self._size) % self.capacity
+        head = min(count, self.capacity - first)
+        for f, values in rows.items():
+            buf = self._buffers[f]
+            buf[first:first + head] = values[:head]; buf[first + self.capacity:first + self.capacity + head] = values[:head]
+            if head < count:
+                buf[:count - head] = values[head:]; buf[self.capacity:self.capacity + count - head] = values[head:]
+        self._size += count
+        return count
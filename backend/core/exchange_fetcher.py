@@ -1,19 +1,34 @@
-# core/exchange_fetcher.py (v10.3 - The Final Integrity Patch)
+# core/exchange_fetcher.py (v10.4 - The Delta Sync Upgrade)
 
 import asyncio
+import contextvars
 import time
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Callable, Awaitable
 import httpx
 import pandas as pd
 import numpy as np
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 
+from core.ohlcv_store import OhlcvStore
+from core.exchange_health import ExchangeHealthTracker
+from core.rate_limiter import TokenBucket, build_token_bucket, parse_retry_after
+from core.timeframe_aggregator import TimeframeAggregator
+from core.fetch_cache import FetchCache
+from core.single_flight import SingleFlight
+from core.transport import build_transport, build_clock, is_replaying
+from core.quality_gate import run_quality_gate, log_quality_report
+from core.kline_columns import KlineColumns, empty_kline_columns, parse_kline_payload, kline_count, slice_kline_columns, concat_kline_columns, sort_kline_columns, kline_columns_to_frame
+
 logger = logging.getLogger(__name__)
 
-EXCHANGE_CONFIG = { 'mexc': { 'base_url': 'https://api.mexc.com', 'kline_endpoint': '/api/v3/klines', 'ticker_endpoint': '/api/v3/ticker/24hr', 'max_limit_per_req': 500, 'symbol_template': '{base}{quote}', 'timeframe_map': {'5m': '5m', '15m': '15m', '1h': '1h', '4h': '4h', '1d': '1d'}, 'rate_limit_delay': 0.5, 'kline_schema': ['ts', 'o', 'h', 'l', 'c', 'v'] }, 'kucoin': { 'base_url': 'https://api.kucoin.com', 'kline_endpoint': '/api/v1/market/candles', 'ticker_endpoint': '/api/v1/market/stats', 'max_limit_per_req': 1500, 'symbol_template': '{base}-{quote}', 'timeframe_map': {'5m': '5min', '15m': '15min', '1h': '1hour', '4h': '4hour', '1d': '1day'}, 'rate_limit_delay': 0.5, 'kline_schema': ['ts', 'o', 'c', 'h', 'l', 'v'] }, 'okx': { 'base_url': 'https://www.okx.com', 'kline_endpoint': '/api/v5/market/candles', 'ticker_endpoint': '/api/v5/market/ticker', 'max_limit_per_req': 300, 'symbol_template': '{base}-{quote}', 'timeframe_map': {'5m': '5m', '15m': '15m', '1h': '1H', '4h': '4H', '1d': '1D'}, 'rate_limit_delay': 0.2, 'kline_schema': ['ts', 'o', 'h', 'l', 'c', 'v'] }, }
+EXCHANGE_CONFIG = { 'mexc': { 'base_url': 'https://api.mexc.com', 'kline_endpoint': '/api/v3/klines', 'ticker_endpoint': '/api/v3/ticker/24hr', 'bulk_ticker_endpoint': '/api/v3/ticker/24hr', 'max_limit_per_req': 500, 'symbol_template': '{base}{quote}', 'timeframe_map': {'5m': '5m', '15m': '15m', '1h': '1h', '4h': '4h', '1d': '1d'}, 'rate_limit_delay': 0.5, 'rate_limit': {'capacity': 500, 'refill_per_second': 50, 'weights': {'kline': 1, 'ticker': 1, 'bulk_ticker': 40}}, 'kline_schema': ['ts', 'o', 'h', 'l', 'c', 'v'] }, 'kucoin': { 'base_url': 'https://api.kucoin.com', 'kline_endpoint': '/api/v1/market/candles', 'ticker_endpoint': '/api/v1/market/stats', 'bulk_ticker_endpoint': '/api/v1/market/allTickers', 'max_limit_per_req': 1500, 'symbol_template': '{base}-{quote}', 'timeframe_map': {'5m': '5min', '15m': '15min', '1h': '1hour', '4h': '4hour', '1d': '1day'}, 'rate_limit_delay': 0.5, 'rate_limit': {'capacity': 2000, 'refill_per_second': 66.7, 'weights': {'kline': 3, 'ticker': 15, 'bulk_ticker': 15}}, 'kline_schema': ['ts', 'o', 'c', 'h', 'l', 'v'] }, 'okx': { 'base_url': 'https://www.okx.com', 'kline_endpoint': '/api/v5/market/candles', 'history_kline_endpoint': '/api/v5/market/history-candles', 'history_max_limit_per_req': 100, 'recent_kline_depth': 1440, 'ticker_endpoint': '/api/v5/market/ticker', 'bulk_ticker_endpoint': '/api/v5/market/tickers', 'max_limit_per_req': 300, 'symbol_template': '{base}-{quote}', 'timeframe_map': {'5m': '5m', '15m': '15m', '1h': '1H', '4h': '4H', '1d': '1Dutc'}, 'rate_limit_delay': 0.2, 'rate_limit': {'capacity': 40, 'refill_per_second': 20, 'weights': {'kline': 1, 'ticker': 2, 'bulk_ticker': 2}}, 'kline_schema': ['ts', 'o', 'h', 'l', 'c', 'v'] }, }
 SYMBOL_MAP = {'BTC/USDT': {'base': 'BTC', 'quote': 'USDT'}, 'ETH/USDT': {'base': 'ETH', 'quote': 'USDT'}}
 
+# Network requests made by the current hedged attempt (see _first_successful); cache, bulk-table and
+# stream hits make none and are kept out of the exchange health samples.
+_attempt_requests: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar('attempt_requests', default=None)
+
 def is_retryable_exception(exception: BaseException) -> bool:
     if isinstance(exception, (httpx.RequestError, httpx.TimeoutException)): return True
     if isinstance(exception, httpx.HTTPStatusError): return exception.response.status_code >= 500 or exception.response.status_code == 429
@@ -21,33 +36,74 @@ def is_retryable_exception(exception: BaseException) -> bool:
 
 class ExchangeFetcher:
     """
-    ExchangeFetcher (v10.3 - The Final Integrity Patch)
+    ExchangeFetcher (v10.4 - The Delta Sync Upgrade)
     ----------------------------------------------------------------
-    This definitive version includes the final critical patch to correct a
-    swapped argument bug in the data processing pipeline, eliminating the
-    source of the 'invalid frequency' crash. This version represents the
-    peak of stability and data integrity for the AiSignalPro project.
+    This version remembers the last merged candle series per
+    (exchange, symbol, timeframe) and, on subsequent cycles, requests only the
+    candles that closed since then (plus a small overlap) instead of
+    re-paginating the full history. The v10.3 integrity fixes are preserved.
     """
-    def __init__(self, config: Dict[str, Any] = None, cache_ttl: int = 60, cache_max_size: int = 256):
+    def __init__(self, config: Dict[str, Any] = None, cache_ttl: int = 60, cache_max_mb: float = 64):
         effective_config = config or {}
         self.config = effective_config
-        headers = {'User-Agent': 'AiSignalPro/10.3.0', 'Accept': 'application/json'}
+        headers = {'User-Agent': 'AiSignalPro/10.4.0', 'Accept': 'application/json'}
         timeout_cfg = self.config.get("general", {}).get("http_timeout", 20.0)
-        self.client = httpx.AsyncClient(headers=headers, timeout=httpx.Timeout(timeout_cfg), follow_redirects=True)
-        self.cache, self.cache_ttl, self.cache_max_size, self.cache_lock = {}, cache_ttl, cache_max_size, asyncio.Lock()
+        self.client = httpx.AsyncClient(headers=headers, timeout=httpx.Timeout(timeout_cfg), follow_redirects=True, transport=build_transport('exchange'))
+        self.replaying = is_replaying()
+        # Wall clock live; anchored to the cassette's recording time in replay, so planned windows match the recorded candles.
+        self.clock = build_clock('exchange')
+        # The last quality-gate report per (exchange, symbol, timeframe).
+        self.quality_reports: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        cache_cfg = self.config.get("fetch_cache", {})
+        self.cache_ttl = float(cache_cfg.get("ttl_seconds", cache_ttl))
+        self.max_concurrent_pages = int(self.config.get("pagination", {}).get("max_concurrent_pages", 4))
+        self.cache = FetchCache(max_bytes=int(float(cache_cfg.get("max_mb", cache_max_mb)) * 1024 * 1024), default_ttl=self.cache_ttl)
+        # Concurrent identical requests (strategies, the API, backfills) share one in-flight fetch.
+        self.inflight = SingleFlight()
         self.exchange_config = self.config.get("exchange_specific", EXCHANGE_CONFIG)
         self.symbol_map = self.config.get("symbol_map", SYMBOL_MAP)
-        logger.info("ExchangeFetcher (v10.3 - The Final Integrity Patch) initialized.")
+        # Delta-sync state: the last merged candle series per (exchange, symbol, timeframe).
+        delta_cfg = self.config.get("delta_sync", {})
+        self.delta_sync_enabled, self.delta_sync_overlap = delta_cfg.get("enabled", True), int(delta_cfg.get("overlap_candles", 2))
+        self.kline_series: Dict[Tuple[str, str, str], KlineColumns] = {}
+        # Hedged fetching: try the healthiest exchange first and only start the next one after an adaptive delay.
+        self.fetch_mode, hedge_cfg = self.config.get("fetch_mode", "hedged"), self.config.get("hedging", {})
+        self.hedge_min_delay, self.hedge_max_delay = float(hedge_cfg.get("min_delay_seconds", 0.5)), float(hedge_cfg.get("max_delay_seconds", 8.0))
+        self.exchange_health = ExchangeHealthTracker(window=hedge_cfg.get("window", 50), error_penalty=hedge_cfg.get("error_penalty", 4.0), default_latency=hedge_cfg.get("default_delay_seconds", 3.0))
+        # One token bucket per exchange, shared by every coroutine that uses this fetcher.
+        self.rate_limiters: Dict[str, TokenBucket] = {ex: build_token_bucket(ex, cfg) for ex, cfg in self.exchange_config.items()}
+        # Series kept current by the candle stream; while fresh they are served without touching REST.
+        self.stream_fed: set = set()
+        # The latest in-progress candle per streamed series, appended when serving it so stream and REST frames have the same shape.
+        self.stream_forming: Dict[Tuple[str, str, str], KlineColumns] = {}
+        # Derived timeframes: fetch only the base timeframe and build the listed higher ones locally.
+        derived_cfg = self.config.get("derived_timeframes", {})
+        self.derived_timeframes = set(derived_cfg.get("timeframes", [])) if derived_cfg.get("enabled", False) else set()
+        self.base_timeframe = derived_cfg.get("base_timeframe", "5m")
+        self.timeframe_aggregator = TimeframeAggregator(self.base_timeframe, self._get_timeframe_ms(self.base_timeframe))
+        # Bulk tickers: one {exchange symbol: (price, change_24h)} table per exchange, cached under a single TTL.
+        self.ticker_ttl = float(self.config.get("ticker_ttl_seconds", 15))
+        store_cfg = self.config.get("ohlcv_store", {})
+        self.ohlcv_store = OhlcvStore(root=store_cfg.get("path", "data/ohlcv"), max_rows=store_cfg.get("max_rows", 5000)) if store_cfg.get("enabled", False) else None
+        logger.info("ExchangeFetcher (v10.4 - The Delta Sync Upgrade) initialized.")
 
     def _get_pandas_freq(self, timeframe: str) -> str:
         tf_lower = timeframe.lower()
         if 'm' in tf_lower: return tf_lower.replace('m', 'min')
         return tf_lower
 
-    def _get_cache_key(self, prefix: str, exchange: str, symbol: str, timeframe: Optional[str] = None, limit: Optional[int] = None) -> str:
-        key = f"{prefix}:{exchange}:{symbol}";
+    def _get_timeframe_ms(self, timeframe: str) -> int:
+        return int(pd.to_timedelta(self._get_pandas_freq(timeframe)).total_seconds() * 1000)
+
+    def timeframe_ms(self, timeframe: str) -> int:
+        """The length of one `timeframe` candle in milliseconds (e.g. '5m' -> 300000)."""
+        return self._get_timeframe_ms(timeframe)
+
+    def _get_cache_key(self, prefix: str, exchange: str, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> str:
+        # Kline keys deliberately ignore the limit: a longer cached series answers shorter requests by tail slicing.
+        key = f"{prefix}:{exchange}"
+        if symbol: key += f":{symbol}"
         if timeframe: key += f":{timeframe}"
-        if limit: key += f":L{limit}"
         return key
 
     def _format_symbol(self, s: str, e: str) -> Optional[str]:
@@ -63,250 +119,458 @@ class ExchangeFetcher:
     def _format_timeframe(self, t: str, e: str) -> Optional[str]:
         c = self.exchange_config.get(e); return c.get('timeframe_map', {}).get(t) if c else None
 
-    async def _ensure_cache_bound(self):
-        if len(self.cache) > self.cache_max_size:
-            keys_to_drop = list(self.cache.keys())[:len(self.cache) - self.cache_max_size]
-            for key in keys_to_drop: self.cache.pop(key, None)
-            logger.info(f"Cache pruned to {len(self.cache)} items.")
-
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), retry=retry_if_exception(is_retryable_exception), reraise=True)
     async def _safe_async_request(self, method: str, url: str, **kwargs) -> Optional[Any]:
-        exchange_name = kwargs.pop('exchange_name', 'unknown'); delay = self.exchange_config.get(exchange_name, {}).get('rate_limit_delay', 1.0)
-        await asyncio.sleep(delay); resp = await self.client.request(method, url, **kwargs)
+        exchange_name, weight = kwargs.pop('exchange_name', 'unknown'), kwargs.pop('weight', 1)
+        limiter = self.rate_limiters.get(exchange_name)
+        if limiter is None: limiter = self.rate_limiters[exchange_name] = build_token_bucket(exchange_name, self.exchange_config.get(exchange_name, {}))
+        counter = _attempt_requests.get()
+        if counter is not None: counter[0] += 1
+        waited = await limiter.acquire(weight)
+        if waited > 1.0: logger.debug(f"Request to {exchange_name} waited {waited:.2f}s for rate-limit tokens.")
+        resp = await self.client.request(method, url, **kwargs)
+        if resp.status_code == 429: limiter.penalize(parse_retry_after(resp.headers.get('Retry-After')))
         resp.raise_for_status()
         try: return resp.json()
         except ValueError as e: logger.warning(f"JSON decode failed from {exchange_name} for url {url}: {e}. Response text: {resp.text[:200]}"); return None
 
+    def _request_weight(self, exchange: str, kind: str) -> float:
+        return self.exchange_config.get(exchange, {}).get('rate_limit', {}).get('weights', {}).get(kind, 1)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), 'single_flight': self.inflight.stats()}
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cumulative per-exchange limiter stats: request count, how many had to wait, 429s and wait times."""
+        return {ex: limiter.stats() for ex, limiter in self.rate_limiters.items() if limiter.requests}
+
+    def now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
     def _get_request_end_time(self, timeframe: str) -> int:
-        now_utc = pd.Timestamp.utcnow()
+        now_utc = pd.Timestamp(self.now_ms(), unit='ms', tz='UTC')
         freq = self._get_pandas_freq(timeframe)
         start_of_current_candle = now_utc.floor(freq)
         return int(start_of_current_candle.timestamp() * 1000)
         
-    def _normalize_kline_data(self, data: List[list], source: str) -> List[Dict[str, Any]]:
-        if not data: return []
+    def _normalize_kline_data(self, data: List[list], source: str) -> KlineColumns:
         cfg = self.exchange_config.get(source, {})
         schema = cfg.get('kline_schema', ['ts', 'o', 'h', 'l', 'c', 'v'])
-        if source == 'okx': data = list(reversed(data))
-        normalized = []
-        for k in data:
-            try:
-                if len(k) < len(schema): raise IndexError(f"Kline array has {len(k)} elements, but schema requires {len(schema)}")
-                mapping = dict(zip(schema, k))
-                raw_ts = mapping.get('ts')
-                ts = int(pd.to_datetime(raw_ts).timestamp() * 1000) if isinstance(raw_ts, str) and not str(raw_ts).isdigit() else int(raw_ts)
-                if ts < 1_000_000_000_000: ts *= 1000
-                o, h, l, c, v = float(mapping.get('o', np.nan)), float(mapping.get('h', np.nan)), float(mapping.get('l', np.nan)), float(mapping.get('c', np.nan)), float(mapping.get('v', np.nan))
-                if source == 'okx' or source == 'kucoin':
-                    actual_high, actual_low = max(h, l), min(h, l)
-                    h, l = actual_high, actual_low
-                normalized.append({"timestamp": ts, "open": o, "high": h, "low": l, "close": c, "volume": v})
-            except Exception as e:
-                logger.warning(f"Malformed candle from {source} using schema {schema}: {k} -> {e}")
-                fallback_ts = int(time.time() * 1000)
-                normalized.append({"timestamp": fallback_ts, "open": np.nan, "high": np.nan, "low": np.nan, "close": np.nan, "volume": np.nan})
-        return normalized
-
-    def _clean_and_validate_dataframe(self, df: pd.DataFrame, symbol: str, timeframe: str) -> pd.DataFrame:
-        cleaned = df.copy()
-        for col in ['open', 'high', 'low', 'close']: cleaned[col] = cleaned[col].replace(0, np.nan)
-        invalid = cleaned[cleaned['high'] < cleaned['low']]
-        if not invalid.empty:
-            logger.warning(f"{len(invalid)} candles with high < low found for {symbol}@{timeframe}. Nullifying them.")
-            cleaned.loc[invalid.index, ['open', 'high', 'low', 'close', 'volume']] = np.nan
-        nan_count = cleaned[['open', 'high', 'low', 'close']].isnull().sum().sum()
-        if nan_count > 0: logger.warning(f"DataFrame for {symbol}@{timeframe} contains {nan_count} NaN values after cleaning.")
-        return cleaned
-
-    def _validate_data_staleness(self, df: pd.DataFrame, timeframe: str, symbol: str) -> bool:
-        if df.empty: return True
-        try:
-            last_candle_time = df.index[-1]
-            now_utc = pd.Timestamp.utcnow()
-            freq = self._get_pandas_freq(timeframe)
-            timeframe_delta = pd.to_timedelta(freq)
-            allowed_lag = timeframe_delta * 2.5
-            actual_lag = now_utc - last_candle_time
-            if actual_lag > allowed_lag:
-                logger.warning(f"STALE DATA REJECTED for {symbol}@{timeframe}. Last candle is {actual_lag} old. Allowed lag is {allowed_lag}.")
-                return False
-            return True
-        except Exception as e:
-            logger.error(f"Error during staleness check for {symbol}@{timeframe}: {e}. Allowing data to pass as a precaution.")
-            return True
-
-    def _resample_and_fill_gaps(self, df: pd.DataFrame, symbol: str, timeframe: str) -> pd.DataFrame:
-        if df.empty: return df
-        try:
-            freq = self._get_pandas_freq(timeframe)
-            aligned = df.copy()
-            if aligned.index.tz is None: aligned = aligned.tz_localize('UTC')
-            aligned.index = aligned.index.floor(freq)
-            aligned = aligned[~aligned.index.duplicated(keep='last')]
-            ohlcv_agg = {'open':'first', 'high':'max', 'low':'min', 'close':'last', 'volume':'sum'}
-            res = aligned.resample(freq).agg(ohlcv_agg)
-            if res.index.tz is None: res = res.tz_localize('UTC')
-            full_date_range = pd.date_range(start=res.index.min(), end=res.index.max(), freq=freq, tz=res.index.tz)
-            res = res.reindex(full_date_range)
-            missing = res['open'].isna().sum()
-            if missing > 0:
-                logger.warning(f"Detected {missing} missing candle(s) for {symbol}@{timeframe}. Filling.")
-                res['close'] = res['close'].ffill()
-                prev_close = res['close'].shift(1)
-                res['open'] = res['open'].fillna(prev_close).fillna(res['close'])
-                pair = pd.concat([res['open'], res['close']], axis=1)
-                res['high'] = res['high'].fillna(pair.max(axis=1))
-                res['low'] = res['low'].fillna(pair.min(axis=1))
-                res['volume'] = res['volume'].fillna(0.0)
-                logger.info(f"Missing candles for {symbol}@{timeframe} were logically filled.")
-            return res
-        except Exception as e:
-            logger.error(f"Failed to resample/fill gaps for {symbol}@{timeframe}: {e}. Returning original data.", exc_info=True)
-            return df
-
-    async def get_klines_from_one_exchange(self, exchange: str, symbol: str, timeframe: str, limit: int = 500) -> Optional[List[Dict]]:
-        cache_key = self._get_cache_key("kline", exchange, symbol, timeframe, limit)
-        async with self.cache_lock:
-            if cache_key in self.cache and (time.time() - self.cache[cache_key]['timestamp']) < self.cache_ttl: return self.cache[cache_key]['data']
+        return parse_kline_payload(data, schema, reverse=(source == 'okx'), fix_high_low=source in ('okx', 'kucoin'), source=source)
+
+    def _plan_kline_windows(self, exchange: str, start_ts: int, end_ts: int, tf_ms: int) -> List[Tuple[int, int, bool]]:
+        """
+        Splits [start_ts, end_ts] (candle open times, inclusive) into page-sized
+        windows, newest first, as (window_start, window_end, use_history_endpoint).
+        Windows reaching past the exchange's recent-candle depth (OKX serves only
+        the latest 1,440 candles from /market/candles) go to its history endpoint.
+        """
+        config = self.exchange_config.get(exchange, {})
+        page_size = int(config.get('max_limit_per_req', 1000))
+        history_page_size = int(config.get('history_max_limit_per_req', page_size))
+        recent_depth = config.get('recent_kline_depth') if config.get('history_kline_endpoint') else None
+        now_ms = self.now_ms(); current_ts = now_ms - now_ms % tf_ms
+        windows, w_end = [], end_ts
+        while w_end >= start_ts:
+            use_history = recent_depth is not None and (current_ts - (w_end - (page_size - 1) * tf_ms)) // tf_ms >= recent_depth
+            w_start = max(start_ts, w_end - ((history_page_size if use_history else page_size) - 1) * tf_ms)
+            windows.append((w_start, w_end, use_history)); w_end = w_start - tf_ms
+        return windows
+
+    def _kline_page_params(self, exchange: str, fmt_symbol: str, fmt_tf: str, w_start: int, w_end: int, count: int) -> Dict[str, str]:
+        """Exchange-specific query for the candles whose open time lies in [w_start, w_end]."""
+        if exchange == 'okx':
+            # OKX: 'after' returns candles older than ts, 'before' newer than ts.
+            return {'instId': fmt_symbol, 'bar': fmt_tf, 'after': str(w_end + 1), 'before': str(w_start - 1), 'limit': str(count)}
+        if exchange == 'kucoin':
+            return {'symbol': fmt_symbol, 'type': fmt_tf, 'startAt': str(w_start // 1000), 'endAt': str(w_end // 1000)}
+        return {'symbol': fmt_symbol, 'interval': fmt_tf, 'startTime': str(w_start), 'endTime': str(w_end), 'limit': str(count)}
+
+    async def fetch_kline_range(self, exchange: str, symbol: str, timeframe: str, start_ts: int, end_ts: int, raise_on_failure: bool = False) -> Optional[KlineColumns]:
+        """
+        Fetches every candle with an open time in [start_ts, end_ts]. Page windows are
+        computed up front from the timeframe and fetched concurrently (bounded by
+        `max_concurrent_pages` and the exchange's token bucket); each page is written
+        straight into a preallocated, time-indexed array. Missing slots (gaps) and
+        slots delivered more than once (overlaps) are reported at the end, and only
+        the filled rows are returned. With `raise_on_failure`, a failed or malformed page
+        raises instead of leaving a gap (for callers that checkpoint progress).
+        """
         config, fmt_symbol, fmt_tf = self.exchange_config.get(exchange), self._format_symbol(symbol, exchange), self._format_timeframe(timeframe, exchange)
         if not all([config, fmt_symbol, fmt_tf]): return None
-        all_data, rem_limit, max_req, pg = [], limit, config.get('max_limit_per_req', 1000), 1
+        tf_ms = self._get_timeframe_ms(timeframe)
+        start_ts = end_ts - ((end_ts - start_ts) // tf_ms) * tf_ms
+        rows = (end_ts - start_ts) // tf_ms + 1
+        if rows <= 0: return empty_kline_columns()
+        windows = self._plan_kline_windows(exchange, start_ts, end_ts, tf_ms)
+        semaphore, weight = asyncio.Semaphore(self.max_concurrent_pages), self._request_weight(exchange, 'kline')
+        async def fetch_window(page_no: int, w_start: int, w_end: int, use_history: bool) -> Optional[KlineColumns]:
+            count = (w_end - w_start) // tf_ms + 1
+            url = config['base_url'] + (config['history_kline_endpoint'] if use_history else config['kline_endpoint'])
+            async with semaphore:
+                logger.debug(f"Fetching page #{page_no} for {symbol}@{timeframe} from {exchange} ({count} candles{', history' if use_history else ''})...")
+                raw_data = await self._safe_async_request('GET', url, params=self._kline_page_params(exchange, fmt_symbol, fmt_tf, w_start, w_end, count), exchange_name=exchange, weight=weight)
+            # OKX answers with code '0' and KuCoin with '200000'; any other code is an error payload, even with an empty 'data'.
+            if isinstance(raw_data, dict) and str(raw_data.get('code', '0')) not in ('0', '200000'): return None
+            kline_list = raw_data.get('data') if isinstance(raw_data, dict) and 'data' in raw_data else raw_data
+            if isinstance(kline_list, list) and not kline_list: return empty_kline_columns()
+            if not (isinstance(kline_list, list) and isinstance(kline_list[0], (list, tuple))): return None
+            return self._normalize_kline_data(kline_list, exchange)
+        pages = await asyncio.gather(*(fetch_window(i + 1, *w) for i, w in enumerate(windows)), return_exceptions=True)
+        out = {'timestamp': start_ts + np.arange(rows, dtype=np.int64) * tf_ms, **{f: np.full(rows, np.nan) for f in ('open', 'high', 'low', 'close', 'volume')}}
+        hits, failed, stray = np.zeros(rows, dtype=np.int32), 0, 0
+        for page in pages:
+            if isinstance(page, BaseException):
+                if raise_on_failure: raise page
+                failed += 1; logger.warning(f"Request failed during pagination for {symbol}@{timeframe} on {exchange}: {page}"); continue
+            if page is None:
+                # An undecodable body or an error payload in place of candles.
+                if raise_on_failure: raise ValueError(f"Malformed kline page for {symbol}@{timeframe} on {exchange}.")
+                failed += 1; continue
+            if not kline_count(page): continue
+            offset = page['timestamp'] - start_ts; idx = offset // tf_ms
+            valid = (offset >= 0) & (idx < rows) & (offset % tf_ms == 0)
+            stray += int((~valid).sum()); idx = idx[valid]
+            for f in ('open', 'high', 'low', 'close', 'volume'): out[f][idx] = page[f][valid]
+            np.add.at(hits, idx, 1)
+        filled = hits > 0
+        if not filled.any(): return empty_kline_columns()
+        first, last = int(np.argmax(filled)), rows - 1 - int(np.argmax(filled[::-1]))
+        gaps, overlaps = int((~filled[first:last + 1]).sum()), int((hits > 1).sum())
+        if gaps or overlaps or stray or failed:
+            logger.warning(f"Pagination report for {symbol}@{timeframe} on {exchange}: {len(windows)} page(s), {failed} failed, {gaps} gap slot(s), {overlaps} overlapping candle(s), {stray} misaligned/out-of-range candle(s).")
+        return out if filled.all() else {f: arr[filled] for f, arr in out.items()}
+
+    async def _fetch_kline_pages(self, exchange: str, symbol: str, timeframe: str, limit: int, end_ts: int) -> Optional[KlineColumns]:
+        """The newest `limit` candles up to (and including) the candle opening at `end_ts`."""
+        return await self.fetch_kline_range(exchange, symbol, timeframe, end_ts - (limit - 1) * self._get_timeframe_ms(timeframe), end_ts)
+
+    def _merge_kline_delta(self, stored: KlineColumns, delta: KlineColumns, timeframe: str) -> Optional[KlineColumns]:
+        """Splices freshly fetched candles onto the stored series; returns None if the delta is empty or does not connect."""
+        if not kline_count(delta): return None
+        first_new_ts = delta['timestamp'][0]
+        if first_new_ts > stored['timestamp'][-1] + self._get_timeframe_ms(timeframe): return None
+        cut = int(np.searchsorted(stored['timestamp'], first_new_ts, side='left'))
+        return concat_kline_columns([slice_kline_columns(stored, 0, cut), delta])
+
+    def _warm_start_series(self, exchange: str, symbol: str, timeframe: str, limit: int) -> Optional[KlineColumns]:
+        """Seeds the delta-sync series from the on-disk OHLCV store when it was written from the same exchange."""
+        if self.ohlcv_store is None or self.ohlcv_store.source(symbol, timeframe) != exchange: return None
+        cols = self.ohlcv_store.tail(symbol, timeframe, limit)
+        if cols is None or len(cols['ts']) < limit: return None
+        # Copy out of the mapped files: the store overwrites its tail in place on the next append.
+        series = {'timestamp': np.array(cols['ts']), **{f: np.array(cols[f]) for f in ('open', 'high', 'low', 'close', 'volume')}}
+        logger.info(f"Warm-started {symbol}@{timeframe} on {exchange} from the OHLCV store ({kline_count(series)} candles).")
+        self.kline_series[(exchange, symbol, timeframe)] = series
+        return series
+
+    async def _persist_to_store(self, symbol: str, timeframe: str, exchange: str, df: pd.DataFrame):
+        if self.ohlcv_store is None: return
+        # The append writes and flushes the mapped files; keep that disk I/O off the event loop.
+        try: await asyncio.to_thread(self.ohlcv_store.append, symbol, timeframe, df, source=exchange)
+        except Exception as e: logger.error(f"Failed to persist {symbol}@{timeframe} to the OHLCV store: {e}", exc_info=True)
+
+    def ingest_stream_candles(self, exchange: str, symbol: str, timeframe: str, candles: KlineColumns) -> bool:
+        """
+        Merges closed candles pushed by the stream into the stored series. Returns
+        False when there is no series yet or the candles leave a gap, in which case
+        the caller must resync the series over REST.
+        """
+        series_key = (exchange, symbol, timeframe); stored = self.kline_series.get(series_key)
+        if stored is None or series_key not in self.stream_fed: return False
+        candles = sort_kline_columns(candles); newer = candles['timestamp'] > stored['timestamp'][-1]
+        merged = stored
+        if not newer.all():
+            # Closes of candles we already hold (typically the REST copy of the then in-progress candle) overwrite them in place.
+            known = slice_kline_columns(candles, 0, int((~newer).sum()))
+            idx = np.searchsorted(stored['timestamp'], known['timestamp']).clip(max=kline_count(stored) - 1)
+            hit = stored['timestamp'][idx] == known['timestamp']
+            merged = {f: stored[f].copy() for f in stored}
+            for f in merged: merged[f][idx[hit]] = known[f][hit]
+        if newer.any():
+            merged = self._merge_kline_delta(merged, slice_kline_columns(candles, int((~newer).sum())), timeframe)
+            if merged is None:
+                logger.info(f"Streamed candle for {symbol}@{timeframe} on {exchange} leaves a gap. Resync required.")
+                self.stream_fed.discard(series_key); return False
+        self.kline_series[series_key] = slice_kline_columns(merged, -kline_count(stored))
+        forming = self.stream_forming.get(series_key)
+        if forming is not None and forming['timestamp'][-1] <= merged['timestamp'][-1]: del self.stream_forming[series_key]
+        return True
+
+    def ingest_stream_forming(self, exchange: str, symbol: str, timeframe: str, candles: KlineColumns):
+        """Keeps the newest in-progress candle pushed by the stream for a streamed series."""
+        series_key = (exchange, symbol, timeframe); stored = self.kline_series.get(series_key)
+        if stored is None or series_key not in self.stream_fed or not kline_count(candles): return
+        candles = sort_kline_columns(candles); latest = slice_kline_columns(candles, -1)
+        if latest['timestamp'][-1] >= stored['timestamp'][-1]: self.stream_forming[series_key] = latest
+
+    async def resync_stream_series(self, exchange: str, symbol: str, timeframe: str, limit: int) -> Optional[int]:
+        """Refreshes a streamed series over REST (delta sync fills only the gap) and returns its last candle timestamp."""
+        series_key = (exchange, symbol, timeframe); self.stream_fed.discard(series_key)
+        self.cache.invalidate(self._get_cache_key("kline", exchange, symbol, timeframe))
+        cols = await self.get_klines_from_one_exchange(exchange, symbol, timeframe, limit=limit)
+        if not kline_count(cols): return None
+        self.stream_fed.add(series_key)
+        return int(cols['timestamp'][-1])
+
+    async def get_klines_from_one_exchange(self, exchange: str, symbol: str, timeframe: str, limit: int = 500) -> Optional[KlineColumns]:
+        return await self.inflight.do(('kline', exchange, symbol, timeframe, limit), lambda: self._get_klines_from_one_exchange(exchange, symbol, timeframe, limit))
+
+    async def _get_klines_from_one_exchange(self, exchange: str, symbol: str, timeframe: str, limit: int) -> Optional[KlineColumns]:
         end_ts = self._get_request_end_time(timeframe)
-        while rem_limit > 0:
-            fetch_limit = min(rem_limit, max_req);
-            if fetch_limit <= 0: break
-            logger.debug(f"Fetching page #{pg} for {symbol}@{timeframe} from {exchange} (limit: {fetch_limit})...")
-            url = config['base_url'] + config['kline_endpoint']
-            params = {'limit': str(fetch_limit)}
-            if exchange == 'okx': params.update({'instId': fmt_symbol, 'bar': fmt_tf})
-            elif exchange == 'kucoin': params.update({'symbol': fmt_symbol, 'type': fmt_tf})
-            else: params.update({'symbol': fmt_symbol, 'interval': fmt_tf})
-            current_end_ts = end_ts
-            if pg > 1 and all_data:
-                current_end_ts = min(c['timestamp'] for c in all_data) - 1
-            if current_end_ts:
-                if exchange == 'kucoin': params['endAt'] = int(current_end_ts / 1000)
-                elif exchange == 'okx': params['before'] = str(current_end_ts)
-                else: params['endTime'] = current_end_ts
-            try:
-                raw_data = await self._safe_async_request('GET', url, params=params, exchange_name=exchange)
-                if raw_data is None: logger.warning(f"No data returned from {exchange}."); break
-                kline_list = raw_data.get('data') if isinstance(raw_data, dict) and 'data' in raw_data else raw_data
-                if isinstance(kline_list, list) and kline_list and isinstance(kline_list[0], (list, tuple)):
-                    norm_data = self._normalize_kline_data(kline_list, exchange)
-                    if not norm_data: break
-                    all_data = norm_data + all_data
-                    rem_limit -= len(norm_data); pg += 1
-                else: logger.debug(f"Exchange returned no more data. Ending pagination."); break
-            except Exception as e: logger.warning(f"Request failed during pagination: {e}"); break
-        if all_data:
-            if len(all_data) < limit * 0.9:
-                logger.warning(f"Pagination for {exchange} returned less data ({len(all_data)}) than requested ({limit}). Discarding.")
+        series_key = (exchange, symbol, timeframe)
+        if series_key in self.stream_fed:
+            streamed, forming = self.kline_series.get(series_key), self.stream_forming.get(series_key)
+            # Like a REST fetch, the served frame ends with the forming candle (the stream's latest tick of it).
+            if kline_count(streamed) and forming is not None and int(forming['timestamp'][-1]) == end_ts:
+                streamed = concat_kline_columns([slice_kline_columns(streamed, 0, int(np.searchsorted(streamed['timestamp'], end_ts))), forming])
+            if kline_count(streamed) >= limit and int(streamed['timestamp'][-1]) == end_ts:
+                return slice_kline_columns(streamed, -limit)
+        cache_key = self._get_cache_key("kline", exchange, symbol, timeframe)
+        cached = self.cache.get(cache_key)
+        if kline_count(cached) >= limit: return slice_kline_columns(cached, -limit)
+        stored = self.kline_series.get(series_key) if self.delta_sync_enabled else None
+        if stored is None and self.delta_sync_enabled: stored = self._warm_start_series(exchange, symbol, timeframe, limit)
+        final_data = None
+        # ✅ DELTA SYNC: Only request the candles that closed since the stored series' last candle,
+        # plus a small overlap so the previously in-progress candle is refreshed.
+        if stored is not None and kline_count(stored) >= limit:
+            missing = max(0, (end_ts - int(stored['timestamp'][-1])) // self._get_timeframe_ms(timeframe))
+            fetch_count = missing + self.delta_sync_overlap
+            if fetch_count < limit:
+                delta = await self._fetch_kline_pages(exchange, symbol, timeframe, fetch_count, end_ts)
+                if delta is None: return None
+                # A delta that does not reach the candles due since the last sync would re-serve (and cache) a frozen series.
+                new_candles = int((delta['timestamp'] > stored['timestamp'][-1]).sum()) if kline_count(delta) else 0
+                merged = self._merge_kline_delta(stored, delta, timeframe)
+                if new_candles < missing:
+                    logger.info(f"Delta for {symbol}@{timeframe} on {exchange} returned {new_candles} of {missing} new candle(s). Falling back to a full fetch.")
+                elif merged is not None:
+                    logger.debug(f"Delta sync for {symbol}@{timeframe} on {exchange}: fetched {kline_count(delta)} candle(s) instead of {limit}.")
+                    final_data = slice_kline_columns(merged, -limit)
+                else: logger.info(f"Delta for {symbol}@{timeframe} on {exchange} does not connect to the stored series. Falling back to a full fetch.")
+        if final_data is None:
+            all_data = await self._fetch_kline_pages(exchange, symbol, timeframe, limit, end_ts)
+            if not kline_count(all_data): return None
+            if kline_count(all_data) < limit * 0.9:
+                logger.warning(f"Pagination for {exchange} returned less data ({kline_count(all_data)}) than requested ({limit}). Discarding.")
                 return None
-            all_data.sort(key=lambda x: x['timestamp'])
-            final_data = all_data[-limit:]
-            async with self.cache_lock: self.cache[cache_key] = {'timestamp': time.time(), 'data': final_data}; await self._ensure_cache_bound()
-            return final_data
-        return None
+            final_data = slice_kline_columns(all_data, -limit)
+        if self.delta_sync_enabled: self.kline_series[series_key] = final_data
+        self.cache.put(cache_key, final_data)
+        return final_data
 
-    async def get_first_successful_klines(self, symbol: str, timeframe: str, limit: int = 200) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    async def get_first_successful_klines(self, symbol: str, timeframe: str, limit: int = 200, prefer: Optional[str] = None, min_rows: Optional[int] = None) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
         general_cfg = self.config.get("general", {})
         valid_timeframes = general_cfg.get("timeframes_to_analyze", ['5m', '15m', '1h', '4h', '1d'])
         if timeframe not in valid_timeframes:
             logger.critical(f"FATAL: Received an invalid timeframe '{timeframe}' for symbol '{symbol}'. This is likely a bug in the calling code. Aborting fetch.")
             return None, None
             
-        min_rows = general_cfg.get("min_rows_for_analysis", 300)
+        # Callers that size fetches from the indicator plan pass their own minimum.
+        min_rows = general_cfg.get("min_rows_for_analysis", 300) if min_rows is None else min_rows
+        if timeframe in self.derived_timeframes and timeframe != self.base_timeframe:
+            return await self._get_derived_klines(symbol, timeframe, limit, min_rows, prefer)
         exchanges = list(self.exchange_config.keys())
         async def fetch_and_tag(exchange: str):
             res = await self.get_klines_from_one_exchange(exchange, symbol, timeframe, limit=limit)
-            if res:
-                df = pd.DataFrame(res); df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-                df.set_index('timestamp', inplace=True)
-                df = df[~df.index.duplicated(keep='first')]; df.sort_index(inplace=True)
-                
-                if not self._validate_data_staleness(df, timeframe, symbol): return None, None
-                
-                # ✅ CRITICAL FIX (v10.3): Corrected argument order
-                df = self._resample_and_fill_gaps(df, symbol, timeframe)
-                df = self._clean_and_validate_dataframe(df, symbol, timeframe)
-                
-                if len(df) < min_rows:
-                    logger.warning(f"Data from '{exchange}' rejected by Quality Gate: too few rows ({len(df)} < {min_rows}).")
-                    return None, None
-                
-                df = df.tail(limit)
-                if df.empty: return None, None
-                return exchange, df
-            return None, None
-            
-        tasks = [asyncio.create_task(fetch_and_tag(ex)) for ex in exchanges]
-        try:
-            for future in asyncio.as_completed(tasks):
-                try:
-                    exchange_res, df_res = await future
-                    if exchange_res and df_res is not None and not df_res.empty:
-                        for task in tasks:
-                            if not task.done(): task.cancel()
-                        logger.info(f"Klines acquired from '{exchange_res}' for {symbol}@{timeframe}, passed all shields with {len(df_res)} rows.")
-                        return df_res, exchange_res
-                except Exception as exc:
-                    logger.warning(f"A fetcher task for {symbol}@{timeframe} failed: {exc}", exc_info=False)
-                    continue
-        finally:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            df = self._prepare_klines_frame(res, exchange, symbol, timeframe, limit, min_rows)
+            return (exchange, df) if df is not None else None
+
+        result = await self._first_successful(exchanges, fetch_and_tag, f"klines {symbol}@{timeframe}", prefer=prefer)
+        if result:
+            exchange_res, df_res = result
+            logger.info(f"Klines acquired from '{exchange_res}' for {symbol}@{timeframe}, passed all shields with {len(df_res)} rows.")
+            await self._persist_to_store(symbol, timeframe, exchange_res, df_res)
+            return df_res, exchange_res
         logger.error(f"Critical Failure: Could not fetch klines for {symbol}@{timeframe} from any exchange.")
         return None, None
 
+    def _prepare_klines_frame(self, cols: Optional[KlineColumns], exchange: str, symbol: str, timeframe: str, limit: int, min_rows: int) -> Optional[pd.DataFrame]:
+        """Runs the columns through the fused quality gate and the row-count shield, then builds the OHLCV frame."""
+        # Lag is measured on the fetcher's clock (anchored to the recording in a replay). A replay still skips the
+        # staleness check: once a cassette runs dry its last candles are repeated for as long as the replay runs.
+        gated, report = run_quality_gate(cols, self._get_timeframe_ms(timeframe), now_ms=self.now_ms(), check_staleness=not self.replaying)
+        self.quality_reports[(exchange, symbol, timeframe)] = report
+        log_quality_report(report, f"{symbol}@{timeframe} from '{exchange}'")
+        if gated is None: return None
+        if report['rows_out'] < min_rows:
+            logger.warning(f"Data from '{exchange}' rejected by Quality Gate: too few rows ({report['rows_out']} < {min_rows}).")
+            return None
+        return kline_columns_to_frame(slice_kline_columns(gated, -limit))
+
+    def get_quality_report(self, exchange: str, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """The quality-gate report of the last series prepared for (exchange, symbol, timeframe)."""
+        return self.quality_reports.get((exchange, symbol, timeframe))
+
+    async def _get_derived_klines(self, symbol: str, timeframe: str, limit: int, min_rows: int, prefer: Optional[str]) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        Serves a higher timeframe from the base timeframe's candles. The base series is
+        fetched through the normal hedged path (one request per symbol per cycle thanks
+        to delta sync and the cache); the higher timeframe is only fetched, from the same
+        exchange, to seed or reseed its local series.
+        """
+        # Concurrent timeframes of one symbol share the base fetch through single-flight and the cache.
+        base_df, source = await self.get_first_successful_klines(symbol, self.base_timeframe, limit=limit, prefer=prefer, min_rows=min_rows)
+        if base_df is None: return None, None
+        tf_ms = self._get_timeframe_ms(timeframe)
+        base = {'timestamp': base_df.index.as_unit('ms').asi8, **{f: base_df[f].to_numpy(dtype=np.float64) for f in ('open', 'high', 'low', 'close', 'volume')}}
+        derived = self.timeframe_aggregator.update(symbol, timeframe, tf_ms, base, source)
+        if derived is None:
+            seed = await self.get_klines_from_one_exchange(source, symbol, timeframe, limit=limit)
+            if not kline_count(seed):
+                logger.warning(f"Could not seed derived {symbol}@{timeframe} from '{source}'.")
+                return None, None
+            logger.info(f"Seeded derived {symbol}@{timeframe} from '{source}' ({kline_count(seed)} candles); it now follows {self.base_timeframe} locally.")
+            self.timeframe_aggregator.seed(symbol, timeframe, tf_ms, seed, source)
+            derived = self.timeframe_aggregator.update(symbol, timeframe, tf_ms, base, source)
+            if derived is None: return None, None
+        df = self._prepare_klines_frame(derived, source, symbol, timeframe, limit, min_rows)
+        if df is None: return None, None
+        logger.info(f"Klines derived from {self.base_timeframe} ('{source}') for {symbol}@{timeframe}, passed all shields with {len(df)} rows.")
+        await self._persist_to_store(symbol, timeframe, source, df)
+        return df, source
+
+    def _parse_ticker_entry(self, exchange: str, data: Dict) -> Tuple[float, float]:
+        """Returns (price, change_24h %) from one exchange ticker object; the same fields appear in the single and bulk endpoints."""
+        if exchange == 'mexc': return float(data.get('lastPrice') or 0), float(data.get('priceChangePercent') or 0) * 100
+        if exchange == 'kucoin': return float(data.get('last') or 0), float(data.get('changeRate') or 0) * 100
+        if exchange == 'okx':
+            price, open_24h = float(data.get('last') or 0), float(data.get('open24h') or 0)
+            return price, ((price - open_24h) / open_24h) * 100 if open_24h > 0 else 0.0
+        return 0.0, 0.0
+
     async def get_ticker_from_one_exchange(self, exchange: str, symbol: str) -> Optional[Dict]:
+        return await self.inflight.do(('ticker', exchange, symbol), lambda: self._get_ticker_from_one_exchange(exchange, symbol))
+
+    async def _get_ticker_from_one_exchange(self, exchange: str, symbol: str) -> Optional[Dict]:
         cache_key = self._get_cache_key("ticker", exchange, symbol)
-        async with self.cache_lock:
-            if cache_key in self.cache and (time.time() - self.cache[cache_key]['timestamp']) < 15: return self.cache[cache_key]['data']
+        cached = self.cache.get(cache_key)
+        if cached is not None: return cached
         config, fmt_symbol = self.exchange_config.get(exchange), self._format_symbol(symbol, exchange)
         if not all([config, fmt_symbol, 'ticker_endpoint' in config]): return None
         url = config['base_url'] + config['ticker_endpoint']
         params = {'instId': fmt_symbol} if exchange == 'okx' else {'symbol': fmt_symbol}
         try:
-            raw_data = await self._safe_async_request('GET', url, params=params, exchange_name=exchange)
+            raw_data = await self._safe_async_request('GET', url, params=params, exchange_name=exchange, weight=self._request_weight(exchange, 'ticker'))
             if raw_data:
                 price, change = 0.0, 0.0; data = None
                 if exchange == 'mexc':
                     if isinstance(raw_data, list) and raw_data: data = raw_data[0]
                     elif isinstance(raw_data, dict): data = raw_data
-                    if data: price, change = float(data.get('lastPrice', 0)), float(data.get('priceChangePercent', 0)) * 100
                 elif exchange == 'kucoin':
                     data = raw_data.get('data')
-                    if isinstance(data, dict): price, change = float(data.get('last', '0')), float(data.get('changeRate', '0')) * 100
+                    if not isinstance(data, dict): data = None
                 elif exchange == 'okx':
                     data_list = raw_data.get('data')
-                    if isinstance(data_list, list) and data_list:
-                        data = data_list[0]
-                        price = float(data.get('last', '0'))
-                        open_24h = float(data.get('open24h', '0'))
-                        change = ((price - open_24h) / open_24h) * 100 if open_24h > 0 else 0.0
+                    if isinstance(data_list, list) and data_list: data = data_list[0]
+                if data: price, change = self._parse_ticker_entry(exchange, data)
                 if price > 0:
                     result = {'price': price, 'change_24h': change, 'source': exchange, 'symbol': symbol}
-                    async with self.cache_lock: self.cache[cache_key] = {'timestamp': time.time(), 'data': result}; await self._ensure_cache_bound()
+                    self.cache.put(cache_key, result, ttl=self.ticker_ttl)
                     return result
                 else:
                     if data is not None: logger.warning(f"Ticker data from {exchange} for {symbol} had zero price. Data: {data}")
         except Exception as e: logger.warning(f"Ticker data processing failed for {exchange} on {symbol}: {e}")
         return None
-        
-    async def get_first_successful_ticker(self, symbol: str) -> Optional[Dict]:
-        tasks = [asyncio.create_task(self.get_ticker_from_one_exchange(ex, symbol)) for ex in self.exchange_config.keys()]
+
+    async def get_ticker_table(self, exchange: str) -> Optional[Dict[str, Tuple[float, float]]]:
+        """
+        Returns every 24h ticker of `exchange` as {exchange symbol: (price, change_24h)},
+        fetched with a single bulk request and cached for `ticker_ttl` seconds. Concurrent
+        callers share one refresh through single-flight.
+        """
+        config = self.exchange_config.get(exchange)
+        if not config or 'bulk_ticker_endpoint' not in config: return None
+        cache_key = self._get_cache_key("ticker_table", exchange)
+        cached = self.cache.get(cache_key)
+        if cached is not None: return cached
+        return await self.inflight.do(('ticker_table', exchange), lambda: self._refresh_ticker_table(exchange, config, cache_key))
+
+    async def _refresh_ticker_table(self, exchange: str, config: Dict[str, Any], cache_key: str) -> Optional[Dict[str, Tuple[float, float]]]:
+        params = {'instType': 'SPOT'} if exchange == 'okx' else None
         try:
-            for future in asyncio.as_completed(tasks):
-                try:
-                    result = await future
-                    if result:
-                        for task in tasks:
-                            if not task.done(): task.cancel()
-                        return result
-                except Exception as exc: logger.warning(f"A ticker task for {symbol} failed: {exc}", exc_info=False); continue
-        finally: await asyncio.gather(*tasks, return_exceptions=True)
+            raw_data = await self._safe_async_request('GET', config['base_url'] + config['bulk_ticker_endpoint'], params=params, exchange_name=exchange, weight=self._request_weight(exchange, 'bulk_ticker'))
+        except Exception as e: logger.warning(f"Bulk ticker request failed for {exchange}: {e}"); return None
+        if exchange == 'kucoin': entries, key = (raw_data or {}).get('data', {}).get('ticker'), 'symbol'
+        elif exchange == 'okx': entries, key = (raw_data or {}).get('data'), 'instId'
+        else: entries, key = raw_data, 'symbol'
+        if not isinstance(entries, list) or not entries: logger.warning(f"Bulk ticker response from {exchange} had no entries."); return None
+        table = {}
+        for entry in entries:
+            try: price, change = self._parse_ticker_entry(exchange, entry)
+            except (TypeError, ValueError): continue
+            if price > 0 and entry.get(key): table[str(entry[key]).upper()] = (price, change)
+        self.cache.put(cache_key, table, ttl=self.ticker_ttl)
+        logger.debug(f"Bulk ticker table refreshed from {exchange}: {len(table)} symbols.")
+        return table
+
+    async def _ticker_from_table(self, exchange: str, symbol: str) -> Optional[Dict]:
+        fmt_symbol = self._format_symbol(symbol, exchange)
+        table = await self.get_ticker_table(exchange) if fmt_symbol else None
+        if table is None: return await self.get_ticker_from_one_exchange(exchange, symbol)
+        entry = table.get(fmt_symbol)
+        if entry is None: return None
+        return {'price': entry[0], 'change_24h': entry[1], 'source': exchange, 'symbol': symbol}
+
+    async def get_first_successful_ticker(self, symbol: str) -> Optional[Dict]:
+        result = await self._first_successful(list(self.exchange_config.keys()), lambda ex: self._ticker_from_table(ex, symbol), f"ticker {symbol}")
+        if result: return result
         logger.error(f"Critical Failure: Could not fetch ticker for {symbol} from any exchange.")
         return None
 
+    async def get_tickers(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Tickers for many symbols; they are all served from the same cached bulk table(s)."""
+        results = await asyncio.gather(*(self.get_first_successful_ticker(s) for s in symbols))
+        return {s: r for s, r in zip(symbols, results) if r}
+
+    def _hedge_delay(self, exchange: str) -> float:
+        if self.fetch_mode == "race": return 0.0
+        p95 = self.exchange_health.latency_percentile(exchange, 95)
+        delay = p95 if p95 is not None else self.exchange_health.default_latency
+        return min(max(delay, self.hedge_min_delay), self.hedge_max_delay)
+
+    async def _first_successful(self, exchanges: List[str], attempt: Callable[[str], Awaitable[Any]], label: str, prefer: Optional[str] = None) -> Any:
+        """
+        Hedged execution: starts `attempt` on the healthiest exchange (or on `prefer`,
+        e.g. the streaming venue) and only starts the next-ranked one when the current
+        leader fails or exceeds its adaptive delay (its observed p95 latency). The
+        first truthy result wins and the remaining attempts are cancelled.
+        fetch_mode 'race' starts all at once.
+        """
+        ranked = self.exchange_health.rank(exchanges)
+        if prefer in ranked: ranked.remove(prefer); ranked.insert(0, prefer)
+        started: Dict[asyncio.Task, Tuple[str, float]] = {}
+        async def timed(exchange: str):
+            # Only attempts that reached the network are health samples; a cancelled loser's latency is unknown.
+            t0, requests = time.monotonic(), [0]; _attempt_requests.set(requests)
+            try: res = await attempt(exchange)
+            except Exception as exc:
+                logger.warning(f"A fetcher task for {label} on {exchange} failed: {exc}", exc_info=False); res = None
+            if requests[0]: self.exchange_health.record(exchange, time.monotonic() - t0, bool(res))
+            return res
+        pending = set()
+        def launch():
+            task = asyncio.create_task(timed(ranked[len(started)]))
+            started[task] = (ranked[len(started)], time.monotonic()); pending.add(task)
+        try:
+            launch()
+            while pending:
+                can_hedge = len(started) < len(ranked)
+                newest_exchange, newest_start = started[next(reversed(started))]
+                timeout = max(0.0, newest_start + self._hedge_delay(newest_exchange) - time.monotonic()) if can_hedge else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result():
+                        if len(started) > 1: logger.debug(f"Hedged {label}: '{started[task][0]}' won after {len(started)} attempt(s).")
+                        return task.result()
+                # Start the next venue when the newest one outlived its delay, or when everything in flight has failed.
+                if can_hedge and (not done or not pending): launch()
+            return None
+        finally:
+            for task in started:
+                if not task.done(): task.cancel()
+            await asyncio.gather(*started, return_exceptions=True)
+
     async def close(self):
         await self.client.aclose()
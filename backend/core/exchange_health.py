@@ -0,0 +1,50 @@
+# core/exchange_health.py (v1.0 - The Venue Scoreboard)
+
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class ExchangeHealthTracker:
+    """
+    Keeps a rolling window of (latency, success) samples per exchange and turns it
+    into a ranking score and an adaptive hedge delay. Lower scores are healthier:
+    the score is the median latency inflated by the recent error rate, so a fast
+    but flaky venue drops below a slower, reliable one. A failure counts as at
+    least `default_latency` in the score (failing fast is not being fast), and
+    the hedge delay percentiles only use successful samples.
+    """
+    def __init__(self, window: int = 50, error_penalty: float = 4.0, default_latency: float = 3.0):
+        self.window, self.error_penalty, self.default_latency = int(window), float(error_penalty), float(default_latency)
+        self._samples: Dict[str, Deque[Tuple[float, bool]]] = {}
+
+    def record(self, exchange: str, latency: float, ok: bool):
+        self._samples.setdefault(exchange, deque(maxlen=self.window)).append((float(latency), bool(ok)))
+
+    def _latencies(self, exchange: str, ok_only: bool = True) -> Optional[np.ndarray]:
+        samples = self._samples.get(exchange)
+        latencies = [lat if ok else max(lat, self.default_latency) for lat, ok in samples or () if ok or not ok_only]
+        return np.asarray(latencies, dtype=np.float64) if latencies else None
+
+    def error_rate(self, exchange: str) -> float:
+        samples = self._samples.get(exchange)
+        return sum(1 for _, ok in samples if not ok) / len(samples) if samples else 0.0
+
+    def latency_percentile(self, exchange: str, pct: float) -> Optional[float]:
+        latencies = self._latencies(exchange)
+        return float(np.percentile(latencies, pct)) if latencies is not None else None
+
+    def score(self, exchange: str) -> float:
+        latencies = self._latencies(exchange, ok_only=False)
+        if latencies is None: return 0.0  # Unmeasured venues rank first once, so every exchange gets sampled.
+        return float(np.median(latencies)) * (1.0 + self.error_penalty * self.error_rate(exchange))
+
+    def rank(self, exchanges: List[str]) -> List[str]:
+        """Healthiest first; ties (e.g. several unmeasured venues) keep the configured order."""
+        return sorted(exchanges, key=lambda ex: (self.score(ex), exchanges.index(ex)))
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        return {ex: {'score': round(self.score(ex), 3), 'p50': self.latency_percentile(ex, 50), 'p95': self.latency_percentile(ex, 95),
+                     'error_rate': round(self.error_rate(ex), 3), 'samples': len(self._samples[ex])} for ex in self._samples}
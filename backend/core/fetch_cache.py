@@ -0,0 +1,72 @@
+# core/fetch_cache.py (v1.0 - The Byte-Bounded LRU)
+
+import sys
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def estimate_nbytes(value: Any) -> int:
+    """Approximate memory footprint: exact for numpy columns, shallow sizes for everything else."""
+    if isinstance(value, np.ndarray): return int(value.nbytes)
+    if isinstance(value, dict): return sys.getsizeof(value) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)): return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+class FetchCache:
+    """
+    FetchCache (v1.0 - The Byte-Bounded LRU)
+    ----------------------------------------------------------------
+    An LRU cache with per-entry TTLs whose capacity is a byte budget rather than
+    an entry count, so a handful of long 1,500-candle series and hundreds of
+    tiny ticker entries are weighed by what they actually cost. Reads refresh
+    recency; writes evict least-recently-used entries until the budget fits.
+    All operations are synchronous, so they are atomic within the event loop.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, default_ttl: float = 60.0):
+        self.max_bytes, self.default_ttl = int(max_bytes), float(default_ttl)
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self) -> int: return len(self._entries)
+
+    def __contains__(self, key: str) -> bool: return self.peek(key) is not None
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Like get(), but without touching recency or the hit/miss counters."""
+        entry = self._entries.get(key)
+        return entry[2] if entry and entry[0] > time.monotonic() else None
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None: self.misses += 1; return None
+        if entry[0] <= time.monotonic():
+            self._drop(key); self.expirations += 1; self.misses += 1; return None
+        self._entries.move_to_end(key); self.hits += 1
+        return entry[2]
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        size = estimate_nbytes(value)
+        if key in self._entries: self._drop(key)
+        if size > self.max_bytes:
+            logger.warning(f"Cache entry '{key}' ({size} bytes) exceeds the cache budget ({self.max_bytes} bytes). Not cached.")
+            return
+        self._entries[key] = (time.monotonic() + (self.default_ttl if ttl is None else ttl), size, value); self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            oldest = next(iter(self._entries)); self._drop(oldest); self.evictions += 1
+
+    def invalidate(self, key: str) -> bool:
+        if key not in self._entries: return False
+        self._drop(key); return True
+
+    def _drop(self, key: str):
+        _, size, _ = self._entries.pop(key); self.nbytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {'entries': len(self._entries), 'bytes': self.nbytes, 'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0, 'evictions': self.evictions, 'expirations': self.expirations}
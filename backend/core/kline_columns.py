@@ -0,0 +1,85 @@
+# core/kline_columns.py (v1.0 - The Columnar Candle Toolkit)
+
+import logging
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# A kline series travels through the fetcher as a dict of equally long numpy columns:
+# 'timestamp' (int64, epoch ms) plus float64 'open', 'high', 'low', 'close', 'volume'.
+KLINE_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+PRICE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+KlineColumns = Dict[str, np.ndarray]
+
+def empty_kline_columns() -> KlineColumns:
+    return {f: np.empty(0, dtype=np.int64 if f == 'timestamp' else np.float64) for f in KLINE_FIELDS}
+
+def kline_count(cols: Optional[KlineColumns]) -> int:
+    return 0 if not cols else len(cols['timestamp'])
+
+def slice_kline_columns(cols: KlineColumns, start: Optional[int] = None, stop: Optional[int] = None) -> KlineColumns:
+    """Returns views (not copies) of a contiguous row range."""
+    return {f: cols[f][start:stop] for f in KLINE_FIELDS}
+
+def concat_kline_columns(parts: Iterable[KlineColumns]) -> KlineColumns:
+    parts = [p for p in parts if kline_count(p)]
+    if not parts: return empty_kline_columns()
+    if len(parts) == 1: return parts[0]
+    return {f: np.concatenate([p[f] for p in parts]) for f in KLINE_FIELDS}
+
+def sort_kline_columns(cols: KlineColumns) -> KlineColumns:
+    ts = cols['timestamp']
+    if len(ts) < 2 or bool(np.all(ts[1:] >= ts[:-1])): return cols
+    order = np.argsort(ts, kind='stable')
+    return {f: cols[f][order] for f in KLINE_FIELDS}
+
+def kline_columns_to_frame(cols: KlineColumns) -> pd.DataFrame:
+    """Builds the OHLCV DataFrame (UTC 'timestamp' index) straight from the columns."""
+    index = pd.DatetimeIndex(pd.to_datetime(cols['timestamp'], unit='ms', utc=True), name='timestamp')
+    return pd.DataFrame({f: cols[f] for f in PRICE_FIELDS}, index=index)
+
+def parse_kline_payload(data: list, schema: list, reverse: bool = False, fix_high_low: bool = False, source: str = 'unknown') -> KlineColumns:
+    """
+    Schema-driven, vectorized parser for raw exchange kline arrays. The payload is
+    converted into a float64 matrix in one pass (falling back to an object matrix
+    parsed column-wise for non-numeric fields such as ISO timestamps). Rows that
+    are too short or carry an unparseable timestamp are dropped in bulk.
+    """
+    if not data: return empty_kline_columns()
+    rows = data[::-1] if reverse else data
+    width = len(schema)
+    lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    short = lengths < width
+    if short.any():
+        logger.warning(f"Dropping {int(short.sum())} malformed candle(s) from {source}: schema {schema} requires {width} fields.")
+        rows = [r for r, bad in zip(rows, short) if not bad]
+        if not rows: return empty_kline_columns()
+    uniform = bool(np.all(lengths[~short] == lengths[~short][0]))
+    try:
+        # Fast path: every field is numeric (or a numeric string), so one C-level pass parses the whole page.
+        if not uniform: raise ValueError("ragged kline rows")
+        matrix = np.array(rows, dtype=np.float64)
+    except (ValueError, TypeError):
+        matrix = np.array(rows if uniform else [r[:width] for r in rows], dtype=object)
+    fields = {name: matrix[:, i] for i, name in enumerate(schema[:matrix.shape[1]])}
+    raw_ts = fields.get('ts')
+    ts = raw_ts.copy() if matrix.dtype == np.float64 else pd.to_numeric(raw_ts, errors='coerce').astype(np.float64)
+    unparsed = np.isnan(ts)
+    if unparsed.any():
+        parsed = pd.to_datetime(pd.Series(raw_ts[unparsed]), utc=True, errors='coerce')
+        ts[unparsed] = ((parsed - pd.Timestamp(0, tz='UTC')) / pd.Timedelta(milliseconds=1)).to_numpy(dtype=np.float64)
+    valid = ~np.isnan(ts)
+    if not valid.all():
+        logger.warning(f"Dropping {int((~valid).sum())} candle(s) with unparseable timestamps from {source}.")
+    ts = ts.astype(np.int64) if valid.all() else ts[valid].astype(np.int64)
+    ts = np.where(ts < 1_000_000_000_000, ts * 1000, ts)
+    def column(key: str) -> np.ndarray:
+        raw = fields.get(key)
+        if raw is None: return np.full(len(ts), np.nan)
+        values = raw if matrix.dtype == np.float64 else pd.to_numeric(raw, errors='coerce').astype(np.float64)
+        return values if valid.all() else values[valid]
+    o, h, l, c, v = column('o'), column('h'), column('l'), column('c'), column('v')
+    if fix_high_low: h, l = np.maximum(h, l), np.minimum(h, l)
+    return {'timestamp': ts, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
@@ -0,0 +1,136 @@
+# file: backend/core/management/commands/backfill_klines.py
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exchange_fetcher import ExchangeFetcher
+from core.kline_columns import kline_count, kline_columns_to_frame
+from core.ohlcv_store import OhlcvStore
+
+class Command(BaseCommand):
+    """
+    Downloads historical klines for every monitored symbol/timeframe into a local
+    columnar OHLCV store (separate from the live worker's store) for research and
+    backtests. Progress is checkpointed after every chunk, so an interrupted run
+    resumes where it stopped. Throughput is reported in candles per second.
+    """
+    help = "Backfill historical klines for all monitored symbols and timeframes into a local columnar store."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365, help="How far back to backfill (ignored when --since is given).")
+        parser.add_argument("--since", type=str, default=None, help="UTC start date, e.g. 2023-01-01.")
+        parser.add_argument("--symbols", nargs="*", default=None, help="Defaults to general.symbols_to_monitor.")
+        parser.add_argument("--timeframes", nargs="*", default=None, help="Defaults to general.timeframes_to_analyze.")
+        parser.add_argument("--exchange", type=str, default=None, help="Source exchange (defaults to the first configured one).")
+        parser.add_argument("--store-path", type=str, default="data/backfill", help="Root directory of the backfill store.")
+        parser.add_argument("--chunk-candles", type=int, default=5000, help="Candles per checkpointed chunk.")
+        parser.add_argument("--config", type=str, default="config.json")
+        parser.add_argument("--reset", action="store_true", help="Ignore the existing checkpoint and start over.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["config"], "r", encoding="utf-8") as f: config = json.load(f)
+        except Exception as e:
+            raise CommandError(f"Could not load or parse '{options['config']}': {e}")
+        general = config.get("general", {}); exchange_settings = dict(config.get("exchange_settings", {}))
+        # The backfill writes its own store; keep the live worker's store and delta-sync state out of it.
+        exchange_settings.update({"ohlcv_store": {"enabled": False}, "delta_sync": {"enabled": False}})
+        exchange = options["exchange"] or next(iter(exchange_settings.get("exchange_specific", {})), None)
+        if exchange not in exchange_settings.get("exchange_specific", {}):
+            raise CommandError(f"Unknown exchange '{exchange}'.")
+        symbols = options["symbols"] or general.get("symbols_to_monitor", [])
+        timeframes = options["timeframes"] or general.get("timeframes_to_analyze", [])
+        since = pd.Timestamp(options["since"], tz="UTC") if options["since"] else pd.Timestamp.now(tz="UTC").floor("D") - pd.Timedelta(days=options["days"])
+        store = OhlcvStore(root=options["store_path"], max_rows=None)
+        checkpoint_path = os.path.join(options["store_path"], "backfill_checkpoint.json")
+        checkpoint = {} if options["reset"] else self._load_checkpoint(checkpoint_path)
+        try:
+            asyncio.run(self._run(exchange_settings, exchange, symbols, timeframes, int(since.timestamp() * 1000), store, checkpoint, checkpoint_path, max(1, options["chunk_candles"])))
+        except KeyboardInterrupt:
+            self._save_checkpoint(checkpoint_path, checkpoint)
+            self.stdout.write(self.style.WARNING("Interrupted. Progress is checkpointed; run the command again to resume."))
+
+    async def _run(self, exchange_settings: Dict[str, Any], exchange: str, symbols: List[str], timeframes: List[str], since_ms: int, store: OhlcvStore, checkpoint: Dict[str, Any], checkpoint_path: str, chunk_candles: int):
+        fetcher = ExchangeFetcher(config=exchange_settings)
+        total_candles, started = 0, time.monotonic()
+        try:
+            for symbol in symbols:
+                for timeframe in timeframes:
+                    total_candles += await self._backfill_series(fetcher, exchange, symbol, timeframe, since_ms, store, checkpoint, checkpoint_path, chunk_candles)
+        finally:
+            await fetcher.close()
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(self.style.SUCCESS(f"Backfill finished: {total_candles} candles in {elapsed:.1f}s ({total_candles / elapsed:,.0f} candles/s)."))
+
+    async def _backfill_series(self, fetcher: ExchangeFetcher, exchange: str, symbol: str, timeframe: str, since_ms: int, store: OhlcvStore, checkpoint: Dict[str, Any], checkpoint_path: str, chunk_candles: int) -> int:
+        key = f"{exchange}|{symbol}|{timeframe}"; tf_ms = fetcher.timeframe_ms(timeframe)
+        # Only closed candles are backfilled; the in-progress one belongs to the live worker.
+        now_ms = fetcher.now_ms(); end_ts = now_ms - now_ms % tf_ms - tf_ms
+        state = checkpoint.get(key)
+        if state is None:
+            state = checkpoint[key] = {"since_ts": since_ms, "next_ts": since_ms - since_ms % tf_ms, "candles": 0}
+        elif since_ms < state["since_ts"]:
+            # Reaching further back only adds [since, old since); the rows already backfilled stay as they are.
+            old_start = state["since_ts"] - state["since_ts"] % tf_ms
+            state.setdefault("head_ranges", []).append({"next_ts": since_ms - since_ms % tf_ms, "end_ts": old_start - tf_ms})
+            state["since_ts"] = since_ms
+            self._save_checkpoint(checkpoint_path, checkpoint)
+        fetched = 0
+        for head in list(state.get("head_ranges", [])):
+            self.stdout.write(f"{symbol}@{timeframe}: backfilling earlier history from {pd.Timestamp(head['next_ts'], unit='ms', tz='UTC')} on {exchange}...")
+            n, complete = await self._fill_range(fetcher, exchange, symbol, timeframe, tf_ms, head, int(head["end_ts"]), store, state, checkpoint, checkpoint_path, chunk_candles)
+            fetched += n
+            if not complete: return fetched
+            state["head_ranges"].remove(head); self._save_checkpoint(checkpoint_path, checkpoint)
+        if int(state["next_ts"]) > end_ts:
+            self.stdout.write(f"{symbol}@{timeframe}: up to date ({state['candles']} candles)."); return fetched
+        self.stdout.write(f"{symbol}@{timeframe}: backfilling from {pd.Timestamp(int(state['next_ts']), unit='ms', tz='UTC')} on {exchange}...")
+        n, _ = await self._fill_range(fetcher, exchange, symbol, timeframe, tf_ms, state, end_ts, store, state, checkpoint, checkpoint_path, chunk_candles)
+        fetched += n
+        self.stdout.write(self.style.SUCCESS(f"{symbol}@{timeframe}: {fetched} new candles, {state['candles']} total."))
+        return fetched
+
+    async def _fill_range(self, fetcher: ExchangeFetcher, exchange: str, symbol: str, timeframe: str, tf_ms: int, cursor: Dict[str, Any], end_ts: int, store: OhlcvStore, state: Dict[str, Any], checkpoint: Dict[str, Any], checkpoint_path: str, chunk_candles: int) -> Tuple[int, bool]:
+        """Fetches [cursor['next_ts'], end_ts] chunk by chunk, advancing and checkpointing the cursor. Returns (candles, completed)."""
+        fetched, started, next_ts = 0, time.monotonic(), int(cursor["next_ts"])
+        while next_ts <= end_ts:
+            chunk_end = min(next_ts + (chunk_candles - 1) * tf_ms, end_ts)
+            cols = None
+            for attempt in range(1, 4):
+                # A failed or malformed page raises, so the cursor never moves past a gap.
+                try: cols = await fetcher.fetch_kline_range(exchange, symbol, timeframe, next_ts, chunk_end, raise_on_failure=True); break
+                except Exception as e:
+                    self.stdout.write(self.style.WARNING(f"{symbol}@{timeframe}: chunk failed (attempt {attempt}/3): {e}"))
+                    if attempt == 3:
+                        self.stdout.write(self.style.ERROR(f"{symbol}@{timeframe}: giving up for now; the next run resumes from the checkpoint."))
+                        return fetched, False
+                    await asyncio.sleep(5 * attempt)
+            if cols is None:
+                self.stdout.write(self.style.ERROR(f"{symbol}@{timeframe}: {exchange} does not support this symbol/timeframe. Skipping.")); return fetched, False
+            if kline_count(cols):
+                await asyncio.to_thread(store.append, symbol, timeframe, kline_columns_to_frame(cols), source=exchange)
+                fetched += kline_count(cols)
+            state["candles"] += kline_count(cols); cursor["next_ts"] = next_ts = chunk_end + tf_ms
+            self._save_checkpoint(checkpoint_path, checkpoint)
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.stdout.write(f"  ...{pd.Timestamp(chunk_end, unit='ms', tz='UTC')}: {fetched} candles ({fetched / elapsed:,.0f} candles/s)")
+        return fetched, True
+
+    def _load_checkpoint(self, path: str) -> Dict[str, Any]:
+        if not os.path.exists(path): return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f: return json.load(f)
+        except (OSError, ValueError) as e:
+            self.stdout.write(self.style.WARNING(f"Checkpoint '{path}' is unreadable ({e}). Starting over.")); return {}
+
+    def _save_checkpoint(self, path: str, checkpoint: Dict[str, Any]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f: json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_path, path)
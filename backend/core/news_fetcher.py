@@ -4,6 +4,8 @@ import logging
 import os
 from typing import List, Dict, Optional, Set
 import httpx
+
+from core.transport import build_transport, is_replaying, REDACTED
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -18,11 +20,12 @@ class NewsFetcher:
     """
 
     def __init__(self):
-        self.api_key = os.getenv("NEWS_API_KEY")
+        # A replay answers from the cassette, which never holds the real key.
+        self.api_key = os.getenv("NEWS_API_KEY") or (REDACTED if is_replaying() else None)
         if not self.api_key:
             logger.warning("NEWS_API_KEY not found. NewsFetcher will be disabled.")
         self.base_url = "https://newsapi.org/v2/everything"
-        self.client = httpx.AsyncClient(timeout=10.0)
+        self.client = httpx.AsyncClient(timeout=10.0, transport=build_transport('news'))
         
         # ✅ CACHING ENGINE: Initialize cache and TTL
         self.cache: Dict[str, Dict[str, Any]] = {}
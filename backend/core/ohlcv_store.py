@@ -0,0 +1,158 @@
+# core/ohlcv_store.py (v1.0 - The Columnar Vault)
+
+import json
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS: Dict[str, Any] = {'ts': np.int64, 'open': np.float64, 'high': np.float64, 'low': np.float64, 'close': np.float64, 'volume': np.float64}
+
+class _SeriesFiles:
+    """Memory-mapped column files plus the metadata of a single symbol/timeframe series."""
+    def __init__(self, directory: Path, meta: Dict[str, Any]):
+        self.directory, self.meta = directory, meta
+        self.columns: Dict[str, np.memmap] = {}
+        self.remap()
+
+    @property
+    def length(self) -> int: return int(self.meta.get('length', 0))
+
+    @property
+    def capacity(self) -> int: return int(self.meta.get('capacity', 0))
+
+    def remap(self):
+        self.columns = {}
+        for col, dtype in OHLCV_COLUMNS.items():
+            path = self.directory / f"{col}.bin"; nbytes = self.capacity * np.dtype(dtype).itemsize
+            with open(path, 'a+b') as fh:
+                if os.fstat(fh.fileno()).st_size != nbytes: fh.truncate(nbytes)
+            self.columns[col] = np.memmap(path, dtype=dtype, mode='r+', shape=(self.capacity,))
+
+    def flush(self):
+        for arr in self.columns.values(): arr.flush()
+        tmp_path = self.directory / "meta.json.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as fh: json.dump(self.meta, fh)
+        os.replace(tmp_path, self.directory / "meta.json")
+
+class OhlcvStore:
+    """
+    OhlcvStore (v1.0 - The Columnar Vault)
+    ----------------------------------------------------------------
+    A local, append-only candle store that keeps the cleaned OHLCV output of
+    the ExchangeFetcher as one memory-mapped column file per field
+    (ts, open, high, low, close, volume) for every symbol/timeframe. Reads via
+    `tail()` return read-only views into the mapped files, so warm-starting a
+    worker costs a few page faults instead of a full exchange refetch.
+    `max_rows=None` makes the store unbounded: appends never compact it.
+    """
+    def __init__(self, root: str = "data/ohlcv", max_rows: Optional[int] = 5000, initial_capacity: int = 1024):
+        self.root, self.max_rows, self.initial_capacity = Path(root), None if max_rows is None else int(max_rows), int(initial_capacity)
+        self._series: Dict[Tuple[str, str], _SeriesFiles] = {}
+        # Appends run in worker threads (off the event loop); one writer at a time.
+        self._lock = threading.RLock()
+
+    def _series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol.replace('/', '_').upper() / timeframe
+
+    def _open(self, symbol: str, timeframe: str, create: bool = False) -> Optional[_SeriesFiles]:
+        key = (symbol, timeframe)
+        if key in self._series: return self._series[key]
+        directory = self._series_dir(symbol, timeframe); meta_path = directory / "meta.json"
+        if meta_path.exists():
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as fh: meta = json.load(fh)
+            except (OSError, ValueError) as e:
+                logger.error(f"OHLCV store metadata for {symbol}@{timeframe} is unreadable: {e}. Series will be rebuilt."); meta = None
+        else: meta = None
+        if meta is None:
+            if not create: return None
+            directory.mkdir(parents=True, exist_ok=True); meta = {'length': 0, 'capacity': self.initial_capacity, 'source': None}
+        series = _SeriesFiles(directory, meta); self._series[key] = series
+        return series
+
+    def _reserve(self, series: _SeriesFiles, required: int):
+        if required <= series.capacity: return
+        new_capacity = max(series.capacity, 1)
+        while new_capacity < required: new_capacity *= 2
+        for arr in series.columns.values(): arr.flush()
+        series.columns = {}; series.meta['capacity'] = new_capacity; series.remap()
+
+    def append(self, symbol: str, timeframe: str, df: pd.DataFrame, source: Optional[str] = None) -> int:
+        """
+        Merges a cleaned OHLCV DataFrame (UTC DatetimeIndex, ascending) into the
+        series by timestamp. Stored rows inside the frame's time span are replaced,
+        so refreshed in-progress candles overwrite their stale copies; stored rows
+        after the frame's last timestamp are kept. Returns the rows written.
+        Blocking (file I/O); async callers should run it in a thread.
+        """
+        if df is None or df.empty: return 0
+        ts = df.index.as_unit('ms').asi8 if isinstance(df.index, pd.DatetimeIndex) else np.asarray(df.index, dtype=np.int64)
+        with self._lock:
+            series = self._open(symbol, timeframe, create=True); length = series.length
+            if source and series.meta.get('source') not in (None, source):
+                logger.info(f"OHLCV store source for {symbol}@{timeframe} changed from {series.meta.get('source')} to {source}. Resetting series.")
+                length = 0
+            stored_ts = series.columns['ts'][:length]
+            start = int(np.searchsorted(stored_ts, ts[0], side='left')) if length else 0
+            end = int(np.searchsorted(stored_ts, ts[-1], side='right')) if length else 0
+            # Rows after the frame are shifted behind it; copy them out before the write (or a remap) touches them.
+            later = {col: np.array(arr[end:length]) for col, arr in series.columns.items()} if end < length else None
+            new_length = start + len(ts) + (length - end)
+            self._reserve(series, new_length)
+            stop = start + len(ts)
+            series.columns['ts'][start:stop] = ts
+            for col in ('open', 'high', 'low', 'close', 'volume'): series.columns[col][start:stop] = df[col].to_numpy(dtype=np.float64)
+            if later is not None:
+                for col, values in later.items(): series.columns[col][stop:new_length] = values
+            series.meta['length'] = new_length
+            if source: series.meta['source'] = source
+            series.flush()
+            if self.max_rows is not None and series.length > self.max_rows * 2: self.compact(symbol, timeframe)
+        return len(ts)
+
+    def tail(self, symbol: str, timeframe: str, n: Optional[int] = None) -> Optional[Dict[str, np.ndarray]]:
+        """Returns read-only views of the last `n` stored rows, or None if the series is unknown."""
+        with self._lock:
+            series = self._open(symbol, timeframe)
+            if series is None or series.length == 0: return None
+            length = series.length; start = max(0, length - n) if n else 0
+            views = {}
+            for col, arr in series.columns.items():
+                view = arr[start:length].view(np.ndarray); view.flags.writeable = False
+                views[col] = view
+            return views
+
+    def tail_frame(self, symbol: str, timeframe: str, n: Optional[int] = None) -> Optional[pd.DataFrame]:
+        cols = self.tail(symbol, timeframe, n)
+        if cols is None: return None
+        index = pd.DatetimeIndex(pd.to_datetime(cols['ts'], unit='ms', utc=True), name='timestamp')
+        return pd.DataFrame({col: cols[col] for col in ('open', 'high', 'low', 'close', 'volume')}, index=index)
+
+    def source(self, symbol: str, timeframe: str) -> Optional[str]:
+        with self._lock:
+            series = self._open(symbol, timeframe)
+            return series.meta.get('source') if series else None
+
+    def compact(self, symbol: str, timeframe: str, keep: Optional[int] = None) -> int:
+        """Keeps only the newest `keep` rows (default: max_rows, or all of them when unbounded) and shrinks the column files to fit."""
+        with self._lock: return self._compact(symbol, timeframe, keep)
+
+    def _compact(self, symbol: str, timeframe: str, keep: Optional[int]) -> int:
+        series = self._open(symbol, timeframe)
+        if series is None: return 0
+        keep = int(keep or self.max_rows or series.length); length = series.length; start = max(0, length - keep); length -= start
+        new_capacity = max(self.initial_capacity, 1 << max(0, (length - 1).bit_length()))
+        # Rewrite into fresh files and swap them in, so views handed out by tail() keep the old inode alive.
+        for col, dtype in OHLCV_COLUMNS.items():
+            tmp_path = series.directory / f"{col}.bin.tmp"
+            compacted = np.zeros(new_capacity, dtype=dtype); compacted[:length] = series.columns[col][start:start + length]
+            compacted.tofile(tmp_path); os.replace(tmp_path, series.directory / f"{col}.bin")
+        series.columns = {}; series.meta.update({'length': length, 'capacity': new_capacity}); series.remap(); series.flush()
+        logger.info(f"OHLCV store compacted {symbol}@{timeframe} to {length} rows (capacity {new_capacity}).")
+        return length
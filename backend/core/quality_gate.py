@@ -0,0 +1,78 @@
+# core/quality_gate.py (v1.0 - The Fused Quality Gate)
+
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+
+from core.kline_columns import KlineColumns, PRICE_FIELDS, kline_count, sort_kline_columns
+
+logger = logging.getLogger(__name__)
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Forward-fills NaNs (leading NaNs stay NaN)."""
+    positions = np.where(np.isnan(values), 0, np.arange(len(values)))
+    np.maximum.accumulate(positions, out=positions)
+    return values[positions]
+
+def run_quality_gate(cols: Optional[KlineColumns], timeframe_ms: int, now_ms: Optional[int] = None, max_lag_factor: float = 2.5, check_staleness: bool = True) -> Tuple[Optional[KlineColumns], Dict[str, Any]]:
+    """
+    Runs the candle quality shields over the raw columns in one pass and returns
+    (gated columns, report). Columns are None when the series is empty or stale.
+    The shields, in order:
+      - staleness: the last candle may lag the wall clock by at most max_lag_factor candles;
+      - alignment: open times are floored to the timeframe grid and duplicates dropped
+        (the first copy of an exact timestamp, the last copy of a grid slot);
+      - gap fill: missing slots get close=previous close, open=previous close,
+        high/low=max/min(open, close) and volume=0; present candles with a missing
+        open/close are repaired the same way, and a missing volume becomes 0;
+      - nulling: zero prices become NaN and candles with high < low are nulled entirely.
+    The input arrays are never modified; every output column is written exactly once.
+    """
+    report = {'rows_in': kline_count(cols), 'rows_out': 0, 'duplicates_dropped': 0, 'gaps_filled': 0, 'rows_repaired': 0,
+              'zero_prices_nulled': 0, 'invalid_rows_nulled': 0, 'lag_seconds': None, 'allowed_lag_seconds': timeframe_ms * max_lag_factor / 1000, 'stale': False}
+    if not report['rows_in']: return None, report
+    cols = sort_kline_columns(cols); raw_ts = cols['timestamp']
+    # Exact duplicates keep their first copy; after flooring, a grid slot keeps its last candle.
+    first = np.r_[True, raw_ts[1:] != raw_ts[:-1]]
+    ts = raw_ts[first]; slots = ts - ts % timeframe_ms
+    keep = np.r_[slots[1:] != slots[:-1], True]
+    rows = np.flatnonzero(first)[keep]; slots = slots[keep]
+    report['duplicates_dropped'] = report['rows_in'] - len(rows)
+
+    lag_ms = (int(time.time() * 1000) if now_ms is None else now_ms) - int(ts[-1])
+    report['lag_seconds'] = lag_ms / 1000
+    if check_staleness and lag_ms > timeframe_ms * max_lag_factor:
+        report['stale'] = True; return None, report
+
+    size = int((slots[-1] - slots[0]) // timeframe_ms) + 1; at = (slots - slots[0]) // timeframe_ms
+    out = {'timestamp': slots[0] + np.arange(size, dtype=np.int64) * timeframe_ms}
+    for f in PRICE_FIELDS:
+        column = np.full(size, np.nan); column[at] = cols[f][rows]; out[f] = column
+    report['gaps_filled'] = size - len(rows)
+    missing_open = np.isnan(out['open'])
+    report['rows_repaired'] = int(missing_open.sum()) - report['gaps_filled']
+    if missing_open.any():
+        close = out['close'] = _ffill(out['close'])
+        prev_close = np.r_[np.nan, close[:-1]]
+        out['open'] = np.where(missing_open, np.where(np.isnan(prev_close), close, prev_close), out['open'])
+        out['high'] = np.where(np.isnan(out['high']), np.fmax(out['open'], close), out['high'])
+        out['low'] = np.where(np.isnan(out['low']), np.fmin(out['open'], close), out['low'])
+    np.nan_to_num(out['volume'], copy=False, nan=0.0)
+
+    for f in ('open', 'high', 'low', 'close'):
+        zero = out[f] == 0
+        if zero.any(): report['zero_prices_nulled'] += int(zero.sum()); out[f][zero] = np.nan
+    invalid = out['high'] < out['low']
+    if invalid.any():
+        report['invalid_rows_nulled'] = int(invalid.sum())
+        for f in PRICE_FIELDS: out[f][invalid] = np.nan
+    report['rows_out'] = size
+    return out, report
+
+def log_quality_report(report: Dict[str, Any], label: str):
+    if report['stale']:
+        logger.warning(f"STALE DATA REJECTED for {label}. Last candle is {report['lag_seconds']:.0f}s old. Allowed lag is {report['allowed_lag_seconds']:.0f}s."); return
+    if report['gaps_filled'] or report['rows_repaired']: logger.warning(f"Filled {report['gaps_filled']} missing and repaired {report['rows_repaired']} incomplete candle(s) for {label}.")
+    if report['invalid_rows_nulled']: logger.warning(f"{report['invalid_rows_nulled']} candles with high < low found for {label}. Nullified them.")
+    if report['zero_prices_nulled']: logger.warning(f"{report['zero_prices_nulled']} zero price(s) nulled for {label}.")
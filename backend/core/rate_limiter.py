@@ -0,0 +1,67 @@
+# core/rate_limiter.py (v1.0 - The Token Bucket Gatekeeper)
+
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Weight-based token bucket shared by every coroutine that talks to one exchange.
+    It allows bursts up to `capacity`, refills continuously at `refill_per_second`,
+    and can be frozen by a 429's Retry-After. Waiters are served in FIFO order.
+    """
+    def __init__(self, name: str, capacity: float, refill_per_second: float):
+        self.name, self.capacity, self.refill_per_second = name, float(capacity), float(refill_per_second)
+        self.tokens, self.updated, self.blocked_until = self.capacity, time.monotonic(), 0.0
+        self._lock = asyncio.Lock()
+        self.requests, self.waited_requests, self.throttled, self.total_wait, self.max_wait = 0, 0, 0, 0.0, 0.0
+
+    def _refill(self, now: float):
+        if now <= self.updated: return  # Still inside a 429 block; nothing accrues until it ends.
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second); self.updated = now
+
+    async def acquire(self, weight: float = 1.0) -> float:
+        """Waits until `weight` tokens are available, consumes them and returns the seconds spent waiting."""
+        weight = min(float(weight), self.capacity); started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic(); self._refill(now)
+                if now < self.blocked_until: await asyncio.sleep(self.blocked_until - now); continue
+                if self.tokens >= weight: self.tokens -= weight; break
+                await asyncio.sleep((weight - self.tokens) / self.refill_per_second)
+        waited = time.monotonic() - started
+        self.requests += 1; self.total_wait += waited; self.max_wait = max(self.max_wait, waited)
+        if waited > 0.001: self.waited_requests += 1
+        return waited
+
+    def penalize(self, retry_after: Optional[float]):
+        """Called on HTTP 429: drains the bucket and blocks it for Retry-After seconds (or one refill of the full bucket)."""
+        backoff = retry_after if retry_after is not None else self.capacity / self.refill_per_second
+        self.blocked_until = max(self.blocked_until, time.monotonic() + backoff); self.throttled += 1
+        # Refill from the end of the block, so the bucket starts empty instead of bursting the blocked period's tokens.
+        self.tokens, self.updated = 0.0, self.blocked_until
+        logger.warning(f"Rate limit hit on {self.name}. Backing off for {backoff:.2f}s.")
+
+    def stats(self) -> Dict[str, Any]:
+        return {'requests': self.requests, 'waited_requests': self.waited_requests, 'throttled': self.throttled,
+                'total_wait_s': round(self.total_wait, 3), 'avg_wait_ms': round(self.total_wait / self.requests * 1000, 2) if self.requests else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 2)}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP-date."""
+    if not value: return None
+    try: return max(0.0, float(value))
+    except ValueError: pass
+    try: return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError): return None
+
+def build_token_bucket(name: str, exchange_cfg: Dict[str, Any]) -> TokenBucket:
+    """Uses the exchange's `rate_limit` block, or derives a one-request burst from the legacy `rate_limit_delay`."""
+    rl_cfg = exchange_cfg.get('rate_limit')
+    if rl_cfg: return TokenBucket(name, rl_cfg.get('capacity', 10), rl_cfg.get('refill_per_second', 5))
+    rate = 1.0 / max(float(exchange_cfg.get('rate_limit_delay', 1.0)), 1e-3)
+    return TokenBucket(name, max(1.0, rate), rate)
@@ -0,0 +1,47 @@
+# core/single_flight.py (v1.0 - The Request Coalescer)
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class _Flight:
+    __slots__ = ('task', 'waiters')
+    def __init__(self, task: asyncio.Task):
+        self.task, self.waiters = task, 0
+
+class SingleFlight:
+    """
+    SingleFlight (v1.0 - The Request Coalescer)
+    ----------------------------------------------------------------
+    Deduplicates concurrent calls by key: the first caller starts the work as a
+    task and every caller that arrives while it is in flight awaits the same
+    task. Waiters are reference-counted, so cancelling one caller (e.g. a hedged
+    loser) never cancels the shared work for the others; the task is only
+    cancelled when its last waiter goes away.
+    """
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.executed = self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(fn())); self.executed += 1
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._forget(key, flight))
+        else:
+            self.coalesced += 1; logger.debug(f"Coalesced in-flight request {key}.")
+        flight.waiters += 1
+        try: return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Detach first, so a caller arriving while the cancellation unwinds starts fresh work.
+                self._forget(key, flight); flight.task.cancel()
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight: del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {'executed': self.executed, 'coalesced': self.coalesced, 'in_flight': len(self._flights)}
@@ -0,0 +1,151 @@
+# core/stream_fetcher.py (v1.0 - The Candle Stream)
+
+import asyncio
+import json
+import logging
+import random
+from typing import Dict, List, Optional, Set, Tuple, Any
+
+try:
+    from websockets.asyncio.client import connect as ws_connect
+    from websockets.exceptions import WebSocketException
+except ImportError:
+    ws_connect = None
+    WebSocketException = OSError
+
+from core.exchange_fetcher import ExchangeFetcher
+from core.kline_columns import parse_kline_payload, kline_count
+
+logger = logging.getLogger(__name__)
+
+OKX_BUSINESS_WS_URL = "wss://ws.okx.com:8443/ws/v5/business"
+
+class CandleStreamFetcher:
+    """
+    CandleStreamFetcher (v1.0 - The Candle Stream)
+    ----------------------------------------------------------------
+    Subscribes to the OKX v5 candle channels for every monitored symbol/timeframe
+    and pushes each *closed* candle (confirm flag "1") into the ExchangeFetcher's
+    delta-sync series, so the analysis pipeline runs within seconds of a candle
+    close without polling REST. In-progress updates (confirm "0") only refresh the
+    forming candle the fetcher appends to the served frame, as a REST fetch would. On every (re)connect, and whenever a streamed
+    candle does not connect to the stored series, the affected series is resynced
+    over REST, where delta sync only fetches the missing candles.
+    """
+    def __init__(self, fetcher: ExchangeFetcher, config: Dict[str, Any], symbols: List[str], timeframes: List[str], limit: int):
+        self.fetcher, self.limit = fetcher, int(limit)
+        self.exchange = config.get("exchange", "okx")
+        self.url = config.get("url", OKX_BUSINESS_WS_URL)
+        self.ping_interval = float(config.get("ping_interval_seconds", 20.0))
+        self.reconnect_min_delay, self.reconnect_max_delay = float(config.get("reconnect_min_delay_seconds", 1.0)), float(config.get("reconnect_max_delay_seconds", 60.0))
+        self.batch_window = float(config.get("batch_window_seconds", 2.0))
+        exchange_cfg = fetcher.exchange_config.get(self.exchange, {})
+        self.kline_schema = exchange_cfg.get('kline_schema', ['ts', 'o', 'h', 'l', 'c', 'v'])
+        # (channel, instId) -> (symbol, timeframe), e.g. ('candle1H', 'BTC-USDT') -> ('BTC/USDT', '1h')
+        self.channels: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for symbol in symbols:
+            inst_id = fetcher._format_symbol(symbol, self.exchange)
+            for timeframe in timeframes:
+                bar = fetcher._format_timeframe(timeframe, self.exchange)
+                if inst_id and bar: self.channels[(f"candle{bar}", inst_id)] = (symbol, timeframe)
+                else: logger.warning(f"No {self.exchange} stream channel for {symbol}@{timeframe}; it will not be streamed.")
+        self.last_closed: Dict[Tuple[str, str], int] = {}
+        self._dirty: Set[Tuple[str, str]] = set(); self._ready = asyncio.Event()
+        self.stats = {'messages': 0, 'closed_candles': 0, 'reconnects': 0, 'resyncs': 0}
+
+    @staticmethod
+    def available() -> bool:
+        return ws_connect is not None
+
+    async def run(self):
+        """Connects, subscribes and consumes forever, reconnecting with jittered exponential backoff."""
+        if ws_connect is None: raise RuntimeError("The 'websockets' package is required for stream ingestion.")
+        delay = self.reconnect_min_delay
+        while True:
+            try:
+                async with ws_connect(self.url, ping_interval=None, open_timeout=15) as ws:
+                    logger.info(f"Candle stream connected to {self.url} ({len(self.channels)} channels).")
+                    await self._subscribe(ws)
+                    await self._resync_all()
+                    delay = self.reconnect_min_delay
+                    await self._consume(ws)
+            except asyncio.CancelledError: raise
+            except (WebSocketException, OSError, asyncio.TimeoutError) as e:
+                logger.warning(f"Candle stream disconnected: {e}")
+            except Exception as e:
+                logger.error(f"Unexpected candle stream failure: {e}", exc_info=True)
+            self.stats['reconnects'] += 1
+            wait = delay * (0.5 + random.random() / 2)
+            logger.info(f"Reconnecting candle stream in {wait:.1f}s...")
+            await asyncio.sleep(wait); delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def _subscribe(self, ws):
+        args = [{"channel": channel, "instId": inst_id} for channel, inst_id in self.channels]
+        await ws.send(json.dumps({"op": "subscribe", "args": args}))
+
+    async def _consume(self, ws):
+        awaiting_pong = False
+        while True:
+            try: raw = await asyncio.wait_for(ws.recv(), timeout=self.ping_interval)
+            except asyncio.TimeoutError:
+                # OKX drops idle connections after 30s; a missed pong means the link is dead.
+                if awaiting_pong: raise asyncio.TimeoutError("no pong received from the stream server")
+                await ws.send("ping"); awaiting_pong = True; continue
+            awaiting_pong = False
+            if raw == "pong": continue
+            self.stats['messages'] += 1
+            await self._handle_message(raw)
+
+    async def _handle_message(self, raw: str):
+        try: msg = json.loads(raw)
+        except ValueError: logger.warning(f"Ignoring non-JSON stream message: {str(raw)[:200]}"); return
+        if msg.get("event") == "error": logger.error(f"Candle stream error {msg.get('code')}: {msg.get('msg')}"); return
+        if "event" in msg: logger.debug(f"Candle stream event: {msg}"); return
+        arg, rows = msg.get("arg", {}), msg.get("data")
+        target = self.channels.get((arg.get("channel"), arg.get("instId")))
+        if target is None or not isinstance(rows, list): return
+        # Only closed candles move the pipeline; in-progress updates (confirm "0") just refresh the forming candle.
+        rows = [row for row in rows if isinstance(row, list) and len(row) > 8]
+        closed, forming = [row for row in rows if str(row[8]) == "1"], [row for row in rows if str(row[8]) != "1"]
+        symbol, timeframe = target
+        if forming:
+            self.fetcher.ingest_stream_forming(self.exchange, symbol, timeframe, parse_kline_payload(forming, self.kline_schema, fix_high_low=True, source=f"{self.exchange}-stream"))
+        if not closed: return
+        candles = parse_kline_payload(closed, self.kline_schema, fix_high_low=True, source=f"{self.exchange}-stream")
+        if not kline_count(candles): return
+        self.stats['closed_candles'] += kline_count(candles)
+        if self.fetcher.ingest_stream_candles(self.exchange, symbol, timeframe, candles):
+            self._mark_closed(symbol, timeframe, int(candles['timestamp'].max()), force=True)
+        else:
+            await self._resync(symbol, timeframe)
+
+    async def _resync(self, symbol: str, timeframe: str):
+        self.stats['resyncs'] += 1
+        try: last_ts = await self.fetcher.resync_stream_series(self.exchange, symbol, timeframe, self.limit)
+        except Exception as e: logger.error(f"REST resync failed for {symbol}@{timeframe}: {e}"); return
+        if last_ts is None: logger.warning(f"REST resync returned no data for {symbol}@{timeframe} on {self.exchange}."); return
+        self._mark_closed(symbol, timeframe, last_ts)
+
+    async def _resync_all(self):
+        """Fills whatever closed while we were disconnected (or, on the first connect, seeds every series)."""
+        pairs = list(self.channels.values())
+        logger.info(f"Resyncing {len(pairs)} streamed series over REST...")
+        await asyncio.gather(*(self._resync(symbol, timeframe) for symbol, timeframe in pairs))
+
+    def _mark_closed(self, symbol: str, timeframe: str, last_ts: int, force: bool = False):
+        # A resync that brought nothing new is not worth a re-analysis; a confirmed close always is,
+        # even when REST had already delivered the same candle while it was still in progress.
+        key = (symbol, timeframe)
+        if not force and self.last_closed.get(key) == last_ts: return
+        self.last_closed[key] = last_ts; self._dirty.add(key); self._ready.set()
+
+    async def next_batch(self) -> Set[Tuple[str, str]]:
+        """
+        Waits for at least one new closed candle, then lingers for `batch_window`
+        seconds so timeframes closing together (e.g. 5m, 15m and 1h on the hour)
+        are analyzed in one pass. Returns the (symbol, timeframe) pairs to process.
+        """
+        await self._ready.wait()
+        if self.batch_window > 0: await asyncio.sleep(self.batch_window)
+        batch, self._dirty = self._dirty, set(); self._ready.clear()
+        return batch
@@ -0,0 +1,118 @@
+# core/stream_standin.py (v1.0 - The Offline Exchange)
+#
+# A local stand-in for the OKX v5 candle stream, so stream ingestion can be run
+# and tested without network access. One port serves both protocols:
+#   ws://HOST:PORT/ws/v5/business         subscribe/ping/candle pushes (OKX message format)
+#   http://HOST:PORT/api/v5/market/candles REST candles for the gap resync (OKX response format)
+# Candles are deterministic per (seed, instId, open time) and aligned to the real
+# wall clock, so resynced and streamed copies agree and the staleness shield accepts them.
+#
+# Usage (from backend/):
+#   python -m core.stream_standin --port 8765 --push-interval 1 --drop-after 60
+# then point the worker at it in config.json:
+#   "general": {"ingestion_mode": "stream"}
+#   "exchange_settings": {"streaming": {"url": "ws://127.0.0.1:8765/ws/v5/business"},
+#                         "exchange_specific": {"okx": {"base_url": "http://127.0.0.1:8765", ...}}}
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import zlib
+from http import HTTPStatus
+from typing import Dict, List, Set, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+from websockets.asyncio.server import serve, ServerConnection
+from websockets.exceptions import ConnectionClosed
+
+logger = logging.getLogger(__name__)
+
+BAR_MS = {'5m': 300_000, '15m': 900_000, '1H': 3_600_000, '4H': 14_400_000, '1Dutc': 86_400_000}
+
+class StandInMarket:
+    """Deterministic candle source: the candle at a given open time is always the same."""
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+
+    def candle(self, inst_id: str, bar: str, ts: int, confirm: bool) -> List[str]:
+        rng = np.random.default_rng([self.seed, zlib.crc32(inst_id.encode()), ts // 1000])
+        base = 30_000.0 if inst_id.startswith('BTC') else 2_000.0
+        # A slow sine of the open time plus per-candle noise, so neighbouring candles stay close together.
+        o = base * (1 + 0.05 * np.sin(ts / 86_400_000 / 3)) + rng.normal(0, base * 0.001)
+        c = o + rng.normal(0, base * 0.002)
+        h, l = max(o, c) + abs(rng.normal(0, base * 0.001)), min(o, c) - abs(rng.normal(0, base * 0.001))
+        vol = abs(rng.normal(50, 10))
+        return [str(ts), f"{o:.2f}", f"{h:.2f}", f"{l:.2f}", f"{c:.2f}", f"{vol:.4f}", f"{vol * c:.2f}", f"{vol * c:.2f}", "1" if confirm else "0"]
+
+    def history(self, inst_id: str, bar: str, limit: int, after: int = None, before: int = None) -> List[List[str]]:
+        """Newest-first like OKX: candles older than `after` (default: up to the in-progress one) and newer than `before`."""
+        step = BAR_MS[bar]; now = int(time.time() * 1000); current = now - now % step
+        newest = current if after is None else min(current, (int(after) - 1) - (int(after) - 1) % step)
+        times = [newest - i * step for i in range(limit)]
+        return [self.candle(inst_id, bar, ts, confirm=ts < current) for ts in times if before is None or ts > int(before)]
+
+class StandInServer:
+    def __init__(self, market: StandInMarket, push_interval: float, drop_after: float):
+        self.market, self.push_interval, self.drop_after = market, push_interval, drop_after
+
+    def process_request(self, connection: ServerConnection, request):
+        parts = urlsplit(request.path)
+        if parts.path not in ('/api/v5/market/candles', '/api/v5/market/history-candles'): return None
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        bar, inst_id = query.get('bar', '1H'), query.get('instId', 'BTC-USDT')
+        if bar not in BAR_MS: return connection.respond(HTTPStatus.OK, json.dumps({"code": "51000", "msg": "Parameter bar error", "data": []}))
+        max_limit = 100 if parts.path.endswith('history-candles') else 300
+        rows = self.market.history(inst_id, bar, min(int(query.get('limit', 100)), max_limit), query.get('after'), query.get('before'))
+        return connection.respond(HTTPStatus.OK, json.dumps({"code": "0", "msg": "", "data": rows}))
+
+    async def handler(self, ws: ServerConnection):
+        subscriptions: Set[Tuple[str, str]] = set(); last_pushed: Dict[Tuple[str, str], int] = {}
+        started = time.monotonic()
+        async def pusher():
+            while True:
+                await asyncio.sleep(self.push_interval)
+                now = int(time.time() * 1000)
+                for channel, inst_id in list(subscriptions):
+                    bar = channel[len('candle'):]; step = BAR_MS[bar]; current = now - now % step
+                    # Confirm the previous candle once, exactly like OKX does at the close, then stream the live one.
+                    if last_pushed.get((channel, inst_id)) != current - step:
+                        last_pushed[(channel, inst_id)] = current - step
+                        await ws.send(json.dumps({"arg": {"channel": channel, "instId": inst_id}, "data": [self.market.candle(inst_id, bar, current - step, True)]}))
+                    await ws.send(json.dumps({"arg": {"channel": channel, "instId": inst_id}, "data": [self.market.candle(inst_id, bar, current, False)]}))
+                if self.drop_after and time.monotonic() - started > self.drop_after:
+                    logger.info("Simulating a dropped connection."); await ws.close(); return
+        push_task = asyncio.create_task(pusher())
+        try:
+            async for message in ws:
+                if message == 'ping': await ws.send('pong'); continue
+                request = json.loads(message)
+                if request.get('op') != 'subscribe': continue
+                for arg in request.get('args', []):
+                    channel, inst_id = arg.get('channel', ''), arg.get('instId', '')
+                    if channel[len('candle'):] not in BAR_MS:
+                        await ws.send(json.dumps({"event": "error", "code": "60012", "msg": f"Illegal request: {arg}"})); continue
+                    subscriptions.add((channel, inst_id))
+                    await ws.send(json.dumps({"event": "subscribe", "arg": arg, "connId": "standin"}))
+        except ConnectionClosed: pass
+        finally: push_task.cancel()
+
+async def main(host: str, port: int, push_interval: float, drop_after: float, seed: int):
+    server = StandInServer(StandInMarket(seed), push_interval, drop_after)
+    async with serve(server.handler, host, port, process_request=server.process_request):
+        logger.info(f"Stand-in OKX candle server listening on ws://{host}:{port}/ws/v5/business and http://{host}:{port}/api/v5/market/candles")
+        await asyncio.Future()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in for the OKX candle websocket and REST candle endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--push-interval", type=float, default=1.0, help="Seconds between candle pushes per channel.")
+    parser.add_argument("--drop-after", type=float, default=0.0, help="Close each connection after N seconds to exercise reconnect/resync (0 = never).")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%(name)s] - %(message)s')
+    try: asyncio.run(main(args.host, args.port, args.push_interval, args.drop_after, args.seed))
+    except KeyboardInterrupt: pass
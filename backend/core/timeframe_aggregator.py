@@ -0,0 +1,67 @@
+# core/timeframe_aggregator.py (v1.0 - The Timeframe Ladder)
+
+import logging
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from core.kline_columns import KlineColumns, KLINE_FIELDS, kline_count, slice_kline_columns, concat_kline_columns, sort_kline_columns
+
+logger = logging.getLogger(__name__)
+
+def aggregate_kline_columns(base: KlineColumns, timeframe_ms: int) -> KlineColumns:
+    """
+    Buckets a sorted, gap-free base series into `timeframe_ms` candles with the
+    same rules as the pandas resample it replaces: open=first, high=max,
+    low=min, close=last, volume=sum. Buckets are labelled by their UTC-aligned open time.
+    """
+    if not kline_count(base): return base
+    buckets = base['timestamp'] - base['timestamp'] % timeframe_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]]); ends = np.r_[starts[1:], len(buckets)] - 1
+    return {'timestamp': buckets[starts], 'open': base['open'][starts], 'close': base['close'][ends],
+            'high': np.fmax.reduceat(base['high'], starts), 'low': np.fmin.reduceat(base['low'], starts),
+            'volume': np.add.reduceat(np.nan_to_num(base['volume']), starts)}
+
+class TimeframeAggregator:
+    """
+    TimeframeAggregator (v1.0 - The Timeframe Ladder)
+    ----------------------------------------------------------------
+    Keeps higher-timeframe series (e.g. 15m/1h/4h/1d) current from the base
+    timeframe's candles instead of fetching each timeframe separately. Each
+    series is seeded once from the same exchange that supplies the base candles
+    (a 1d history cannot be rebuilt from a few hundred 5m candles); afterwards
+    only its open bucket and any newly started buckets are recomputed from the
+    base series on every update.
+    """
+    def __init__(self, base_timeframe: str, base_timeframe_ms: int):
+        self.base_timeframe, self.base_timeframe_ms = base_timeframe, int(base_timeframe_ms)
+        self._series: Dict[Tuple[str, str], KlineColumns] = {}
+        self._sources: Dict[Tuple[str, str], str] = {}
+
+    def source(self, symbol: str, timeframe: str) -> Optional[str]:
+        return self._sources.get((symbol, timeframe))
+
+    def seed(self, symbol: str, timeframe: str, timeframe_ms: int, cols: KlineColumns, source: str):
+        """Installs a fetched higher-timeframe series, normalizing its labels to UTC-aligned bucket open times."""
+        ts = cols['timestamp'] - cols['timestamp'] % timeframe_ms
+        seeded = sort_kline_columns({**{f: np.array(cols[f]) for f in KLINE_FIELDS if f != 'timestamp'}, 'timestamp': ts})
+        self._series[(symbol, timeframe)], self._sources[(symbol, timeframe)] = seeded, source
+
+    def update(self, symbol: str, timeframe: str, timeframe_ms: int, base: KlineColumns, source: str) -> Optional[KlineColumns]:
+        """
+        Rebuilds the open bucket and any newer ones from `base` (sorted, gap-free)
+        and returns the updated series. Returns None when the series needs a reseed:
+        it was never seeded, came from another exchange, or the base window no longer
+        reaches back to the start of its open bucket.
+        """
+        key = (symbol, timeframe); series = self._series.get(key)
+        if series is None or self._sources.get(key) != source or not kline_count(base): return None
+        open_bucket = int(series['timestamp'][-1])
+        if int(base['timestamp'][0]) > open_bucket:
+            logger.info(f"Base {self.base_timeframe} window no longer covers the open {timeframe} bucket of {symbol}. Reseed required.")
+            return None
+        start = int(np.searchsorted(base['timestamp'], open_bucket, side='left'))
+        rebuilt = aggregate_kline_columns(slice_kline_columns(base, start), timeframe_ms)
+        size = kline_count(series)
+        updated = concat_kline_columns([slice_kline_columns(series, 0, size - 1), rebuilt])
+        self._series[key] = slice_kline_columns(updated, -size) if kline_count(updated) > size else updated
+        return self._series[key]
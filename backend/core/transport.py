@@ -0,0 +1,205 @@
+# core/transport.py (v1.0 - The Flight Recorder)
+#
+# Record/replay for every outbound call the worker makes, so a full cycle can be
+# run offline, deterministically and at full speed for benchmarks and regression
+# runs. Configured through the environment, like the API keys it sits next to:
+#   AISP_TRANSPORT_MODE   live (default) | record | replay
+#   AISP_CASSETTE_DIR     where cassettes live (default: data/cassettes)
+#   AISP_REPLAY_LATENCY   seconds added to each replayed call, or "recorded" to
+#                         reproduce the latency measured while recording (default: 0)
+# One JSONL cassette per client (exchange.jsonl, telegram.jsonl, news.jsonl, gemini.jsonl).
+# Secrets (API keys, tokens, signatures, the Telegram bot token) are redacted before
+# anything is written, and request matching uses the redacted form, so a replay
+# never needs the real credentials.
+
+import base64
+import hashlib
+from email.utils import parsedate_to_datetime
+import json
+import logging
+import os
+import re
+import time
+import asyncio
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MODES = ('live', 'record', 'replay')
+REDACTED = 'REDACTED'
+SECRET_PARAMS = {'apikey', 'api_key', 'key', 'token', 'signature', 'sign', 'passphrase'}
+SECRET_HEADERS = {'authorization', 'x-api-key', 'x-mbx-apikey', 'ok-access-key', 'ok-access-sign', 'ok-access-passphrase', 'kc-api-key', 'kc-api-sign', 'kc-api-passphrase'}
+# Query parameters derived from the wall clock; they never match between a recording and a replay.
+VOLATILE_PARAMS = {'starttime', 'endtime', 'startat', 'endat', 'after', 'before', 'from', 'to', 'timestamp'}
+# Hop-by-hop and encoding headers no longer describe the decoded body that is stored.
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+TELEGRAM_BOT_PATH = re.compile(r'/bot[^/]+/')
+
+def transport_mode() -> str:
+    mode = os.getenv('AISP_TRANSPORT_MODE', 'live').strip().lower()
+    if mode not in MODES:
+        logger.error(f"Unknown AISP_TRANSPORT_MODE '{mode}'. Expected one of {MODES}. Using 'live'."); return 'live'
+    return mode
+
+def is_replaying() -> bool: return transport_mode() == 'replay'
+
+def redact_path(path: str) -> str: return TELEGRAM_BOT_PATH.sub(f'/bot{REDACTED}/', path)
+
+def redact_params(params) -> list:
+    return [(k, REDACTED if k.lower() in SECRET_PARAMS else v) for k, v in params]
+
+def redact_headers(headers) -> Dict[str, str]:
+    return {k: (REDACTED if k.lower() in SECRET_HEADERS else v) for k, v in headers.items()}
+
+def _replay_latency() -> Optional[float]:
+    """Fixed seconds per replayed call, or None to reproduce the recorded latency."""
+    raw = os.getenv('AISP_REPLAY_LATENCY', '0').strip().lower()
+    if raw == 'recorded': return None
+    try: return max(0.0, float(raw))
+    except ValueError:
+        logger.error(f"Invalid AISP_REPLAY_LATENCY '{raw}'. Using 0."); return 0.0
+
+class Cassette:
+    """
+    One client's recorded traffic. Each entry is filed under an exact key (route
+    plus the stable request parameters) and under its bare route; a replay serves
+    exact matches in recorded order and falls back to the route when the request
+    differs only in ways the recording could not anticipate (e.g. a larger delta
+    window). The last response of a queue is repeated once it runs dry, so a
+    replay can run for more cycles than were recorded. Entries carry their
+    recording time, which anchors the replay clock (see `clock()`).
+    """
+    def __init__(self, name: str, mode: str, directory: str):
+        self.name, self.mode, self.path = name, mode, os.path.join(directory, f"{name}.jsonl")
+        self._by_key: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque); self._by_route: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self.latency = _replay_latency()
+        self.calls = self.misses = 0; self.network_seconds = 0.0
+        # Replay clock: the recording time of the first entry, advanced by the replay's own elapsed time
+        # and never behind the recording time of the last entry served.
+        self.recorded_at: Optional[float] = None; self.served_at: Optional[float] = None; self.loaded_at = time.monotonic()
+        if mode == 'replay': self._load()
+        elif mode == 'record': os.makedirs(directory, exist_ok=True)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            logger.error(f"Replay cassette '{self.path}' not found. Every '{self.name}' call will miss."); return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip(): continue
+                entry = json.loads(line); self._by_key[entry['key']].append(entry); self._by_route[entry['route']].append(entry)
+                if self.recorded_at is None: self.recorded_at = _entry_time(entry)
+        self.loaded_at = time.monotonic()
+        if self.recorded_at is None: logger.warning(f"Cassette '{self.path}' carries no recording time. Its replay clock follows the wall clock.")
+        logger.info(f"Loaded {sum(len(q) for q in self._by_key.values())} recorded '{self.name}' responses from '{self.path}'.")
+
+    def record(self, entry: Dict[str, Any]):
+        self.calls += 1; self.network_seconds += entry.get('elapsed', 0.0)
+        with open(self.path, 'a', encoding='utf-8') as f: f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def take(self, key: str, route: str) -> Optional[Dict[str, Any]]:
+        self.calls += 1
+        queue = self._by_key.get(key) or self._by_route.get(route)
+        if not queue: self.misses += 1; return None
+        entry = queue.popleft() if len(queue) > 1 else queue[0]
+        self.network_seconds += self.delay_for(entry)
+        served_at = _entry_time(entry)
+        if served_at is not None: self.served_at = max(self.served_at or served_at, served_at)
+        return entry
+
+    def delay_for(self, entry: Dict[str, Any]) -> float:
+        return float(entry.get('elapsed', 0.0)) if self.latency is None else self.latency
+
+    def clock(self) -> float:
+        """Seconds since the epoch as seen by the recording (the wall clock when nothing anchors it)."""
+        if self.recorded_at is None: return time.time()
+        return max(self.recorded_at + (time.monotonic() - self.loaded_at), self.served_at or 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'mode': self.mode, 'calls': self.calls, 'misses': self.misses, 'network_seconds': round(self.network_seconds, 3)}
+
+def _entry_time(entry: Dict[str, Any]) -> Optional[float]:
+    """When an entry was recorded: its own stamp, else the server's Date header (cassettes from before the stamp)."""
+    if 'recorded_at' in entry: return float(entry['recorded_at'])
+    date = next((v for k, v in entry.get('headers', {}).items() if k.lower() == 'date'), None)
+    try: return parsedate_to_datetime(date).timestamp() if date else None
+    except (TypeError, ValueError): return None
+
+_cassettes: Dict[str, Cassette] = {}
+
+def get_cassette(name: str) -> Optional[Cassette]:
+    """The shared cassette for a client name, or None in live mode."""
+    mode = transport_mode()
+    if mode == 'live': return None
+    if name not in _cassettes: _cassettes[name] = Cassette(name, mode, os.getenv('AISP_CASSETTE_DIR', 'data/cassettes'))
+    return _cassettes[name]
+
+def transport_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-client call counts and network time (measured when recording, simulated when replaying)."""
+    return {name: cassette.stats() for name, cassette in _cassettes.items()}
+
+def build_clock(name: str) -> Callable[[], float]:
+    """
+    The clock a client should plan time windows with: time.time live and while
+    recording, the cassette's anchored clock when replaying, so a replay asks for
+    (and keeps) the candles that existed when the cassette was recorded.
+    """
+    cassette = get_cassette(name)
+    return cassette.clock if cassette is not None and cassette.mode == 'replay' else time.time
+
+def request_key(request: httpx.Request) -> Tuple[str, str]:
+    """(exact key, route) for a request, both built from its redacted, clock-independent form."""
+    route = f"{request.method} {request.url.host}{redact_path(request.url.path)}"
+    stable = sorted((k, v) for k, v in redact_params(parse_qsl(request.url.query.decode())) if k.lower() not in VOLATILE_PARAMS)
+    return (f"{route}?{urlencode(stable)}" if stable else route), route
+
+class RecordReplayTransport(httpx.AsyncBaseTransport):
+    """
+    An httpx transport that either records the responses of the real network
+    transport into a cassette or answers from one without touching the network.
+    A replay miss answers 404 (not a connection error) so retry loops do not
+    stall an offline run.
+    """
+    def __init__(self, cassette: Cassette, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self.inner = inner if inner is not None or cassette.mode == 'replay' else httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key, route = request_key(request)
+        if self.cassette.mode == 'replay': return await self._replay(request, key, route)
+        started, recorded_at = time.monotonic(), time.time()
+        response = await self.inner.handle_async_request(request)
+        try: content = await response.aread()
+        finally: await response.aclose()
+        elapsed = time.monotonic() - started
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS}
+        try: body = {'text': content.decode('utf-8')}
+        except UnicodeDecodeError: body = {'base64': base64.b64encode(content).decode('ascii')}
+        self.cassette.record({'key': key, 'route': route, 'status': response.status_code, 'headers': redact_headers(headers), 'elapsed': round(elapsed, 4), 'recorded_at': round(recorded_at, 3), **body})
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def _replay(self, request: httpx.Request, key: str, route: str) -> httpx.Response:
+        entry = self.cassette.take(key, route)
+        if entry is None:
+            logger.warning(f"No recorded '{self.cassette.name}' response for {key}.")
+            return httpx.Response(404, json={'error': 'not recorded', 'key': key}, request=request)
+        delay = self.cassette.delay_for(entry)
+        if delay: await asyncio.sleep(delay)
+        content = entry['text'].encode('utf-8') if 'text' in entry else base64.b64decode(entry['base64'])
+        return httpx.Response(entry['status'], headers=entry.get('headers', {}), content=content, request=request)
+
+    async def aclose(self):
+        if self.inner is not None: await self.inner.aclose()
+
+def build_transport(name: str) -> Optional[httpx.AsyncBaseTransport]:
+    """The transport for an httpx.AsyncClient: None (httpx's default) in live mode."""
+    cassette = get_cassette(name)
+    if cassette is None: return None
+    logger.info(f"'{name}' HTTP traffic is in {cassette.mode} mode ({cassette.path}).")
+    return RecordReplayTransport(cassette)
+
+def query_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
@@ -0,0 +1,64 @@
+# engines/analysis_worker.py (v1.0 - The Process Pool Offload)
+#
+# The indicator analysis runs in worker processes so the event loop never blocks on
+# pandas. The parent writes the OHLCV window into shared memory (one float64 block:
+# timestamp in epoch ms, open, high, low, close, volume), a worker attaches, copies
+# it into its own frame and returns only the analysis summary; the parent re-attaches
+# the OHLCV tail (`final_df`) it already holds.
+
+import asyncio
+import logging
+from multiprocessing import shared_memory
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type
+import numpy as np
+import pandas as pd
+
+from core.kline_columns import KLINE_FIELDS
+from .indicator_analyzer import IndicatorAnalyzer, indicator_plan_key
+from .indicators.base import enable_copy_on_write
+
+logger = logging.getLogger(__name__)
+
+# Per-process context, set once by init_worker.
+_context: Dict[str, Any] = {}
+# Incremental indicator states by (symbol, timeframe). A pair is not pinned to a process,
+# so a state may be missing or stale here; the analyzer validates it before any use.
+_states: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+
+def init_worker(config: Dict[str, Any], strategy_classes: List[Type], log_level: int):
+    logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - [%(name)s] - %(message)s')
+    enable_copy_on_write()
+    _context.update(config=config, strategy_classes=strategy_classes,
+                    plan_key=indicator_plan_key(config.get("indicators", {}), config.get("strategies", {}), strategy_classes))
+
+def write_shared_frame(df: pd.DataFrame) -> shared_memory.SharedMemory:
+    """Copies an OHLCV frame into a new shared memory block; the caller closes and unlinks it."""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(KLINE_FIELDS) * len(df) * 8))
+    block = np.ndarray((len(KLINE_FIELDS), len(df)), dtype=np.float64, buffer=shm.buf)
+    block[0] = df.index.as_unit('ms').asi8
+    for row, field in enumerate(KLINE_FIELDS[1:], start=1): block[row] = df[field].to_numpy(dtype=np.float64)
+    return shm
+
+def _read_shared_frame(name: str, rows: int) -> pd.DataFrame:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        block = np.ndarray((len(KLINE_FIELDS), rows), dtype=np.float64, buffer=shm.buf)
+        index = pd.DatetimeIndex(pd.to_datetime(block[0].astype(np.int64), unit='ms', utc=True), name='timestamp')
+        return pd.DataFrame({field: block[row].copy() for row, field in enumerate(KLINE_FIELDS) if row}, index=index)
+    finally:
+        shm.close()
+
+def analyze_shared_frame(name: str, rows: int, symbol: str, timeframe: str, demand: Optional[FrozenSet[str]] = None) -> Optional[Dict[str, Any]]:
+    """Runs the indicator analysis on a shared OHLCV block and returns the summary without `final_df` (its row count instead)."""
+    config = _context["config"]; incremental = config.get("general", {}).get("incremental_indicators", False)
+    df = _read_shared_frame(name, rows)
+    analyzer = IndicatorAnalyzer(df, config.get("indicators", {}), config.get("strategies", {}), _context["strategy_classes"], timeframe, symbol,
+                                 indicator_states=_states.get((symbol, timeframe)) if incremental else None, plan_key=_context["plan_key"], demand=demand)
+    async def run() -> Dict[str, Any]:
+        await analyzer.calculate_all()
+        return await analyzer.get_analysis_summary()
+    summary = asyncio.run(run())
+    if incremental: _states[(symbol, timeframe)] = analyzer.indicator_states
+    final_df = summary.pop("final_df", None)
+    summary["_final_rows"] = len(final_df) if isinstance(final_df, pd.DataFrame) else 0
+    return summary
@@ -8,6 +8,8 @@ import json
 import time
 from typing import Dict, Any, List, Optional
 
+from core.transport import get_cassette, query_key
+
 logger = logging.getLogger(__name__)
 
 class GeminiHandler:
@@ -20,6 +22,8 @@ class GeminiHandler:
     the system ('confidence_percent'), and uses the latest stable model names.
     """
     def __init__(self):
+        # The SDK owns its HTTP stack, so record/replay happens at the query level (prompt hash -> parsed result).
+        self.cassette = get_cassette('gemini')
         keys_str = os.getenv('GEMINI_API_KEYS')
         if not keys_str:
             self.api_keys: List[str] = []
@@ -44,6 +48,7 @@ class GeminiHandler:
 
     def query(self, prompt: str) -> Dict[str, Any]:
         """Sends a prompt to Gemini and processes the JSON response synchronously."""
+        if self.cassette and self.cassette.mode == 'replay': return self._replay(prompt)
         api_key = self._get_next_key()
         if not api_key:
             return {"signal": "HOLD", "confidence_percent": 0, "explanation_fa": "هیچ کلید API معتبری برای Gemini پیکربندی نشده است."}
@@ -51,6 +56,7 @@ class GeminiHandler:
         last_exception = None
         for model_name in self.model_names:
             try:
+                started = time.monotonic()
                 genai.configure(api_key=api_key)
                 model = genai.GenerativeModel(model_name)
                 
@@ -88,7 +94,9 @@ class GeminiHandler:
                 explanation = json_response.get("explanation_fa", "توضیحات توسط AI ارائه نشد.")
                 
                 # FIX 2: Use the consistent key "confidence_percent" in the output
-                return {"signal": signal, "confidence_percent": confidence, "explanation_fa": explanation}
+                result = {"signal": signal, "confidence_percent": confidence, "explanation_fa": explanation}
+                if self.cassette: self.cassette.record({'key': query_key(prompt), 'route': 'gemini.query', 'elapsed': round(time.monotonic() - started, 4), 'response': result})
+                return result
             
             except Exception as e:
                 last_exception = e
@@ -98,3 +106,10 @@ class GeminiHandler:
         logger.error(f"All Gemini models failed. Last error: {last_exception}")
         return {"signal": "HOLD", "confidence_percent": 0, "explanation_fa": f"خطا در پردازش پاسخ AI: {last_exception}"}
 
+    def _replay(self, prompt: str) -> Dict[str, Any]:
+        entry = self.cassette.take(query_key(prompt), 'gemini.query')
+        if entry is None:
+            return {"signal": "HOLD", "confidence_percent": 0, "explanation_fa": "پاسخ ضبط‌شده‌ای برای این درخواست Gemini وجود ندارد."}
+        delay = self.cassette.delay_for(entry)
+        if delay: time.sleep(delay)
+        return dict(entry['response'])
@@ -5,9 +5,13 @@ import logging
 import json
 import asyncio
 import inspect
-from typing import Dict, Any, Type, List, Optional, Tuple
+import hashlib
+import time
+from concurrent.futures import Executor
+from typing import Dict, Any, FrozenSet, Type, List, Optional, Tuple
 from collections import deque
 from .indicators import *
+from .indicators.base import shared_frame
 from .strategies import BaseStrategy
 
 logger = logging.getLogger(__name__)
@@ -24,6 +28,45 @@ def get_indicator_config_key(name: str, params: Dict[str, Any]) -> str:
         param_str = "_".join(f"{k}_{v}" for k, v in sorted(params.items()) if k not in ["enabled", "dependencies", "name"])
         return f"{name}_{param_str}" if param_str else name
 
+def indicator_plan_key(config: Dict[str, Any], strategies_config: Dict[str, Any], strategy_classes: List[Type[BaseStrategy]]) -> str:
+    """A content hash of everything the indicator plan is built from (it changes only when config.json does)."""
+    payload = json.dumps([config, strategies_config, [f"{c.__module__}.{c.__qualname__}" for c in strategy_classes]], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class IndicatorPlan:
+    """
+    The compiled, read-only indicator DAG shared by every analyzer with the same
+    configuration: node configs by unique key, each node's direct dependency keys,
+    the topological calculation order and the simple-name -> key map consumers use.
+    """
+    __slots__ = ('indicator_configs', 'dependency_keys', 'calculation_order', 'indicator_map', 'levels', '_closures')
+    def __init__(self, indicator_configs: Dict[str, Dict[str, Any]], dependency_keys: Dict[str, List[str]], calculation_order: List[str], indicators_config: Dict[str, Any]):
+        self.indicator_configs, self.dependency_keys, self.calculation_order = indicator_configs, dependency_keys, calculation_order
+        self.indicator_map = {config['name']: key for key, config in indicator_configs.items() if config['name'] in indicators_config}
+        # Level 0 has no dependencies; every other node sits one level below its deepest dependency.
+        self.levels: Dict[str, int] = {}
+        for key in calculation_order: self.levels[key] = 1 + max((self.levels[dep] for dep in dependency_keys.get(key, [])), default=-1)
+        self._closures: Dict[FrozenSet[str], List[str]] = {}
+
+    def closure(self, demand: FrozenSet[str]) -> List[str]:
+        """
+        The calculation order restricted to the demanded indicators and everything they
+        depend on. Demand entries are simple names (resolved through indicator_map) or
+        unique keys; entries the plan does not contain are ignored.
+        """
+        if demand not in self._closures:
+            needed = set(); stack = [self.indicator_map.get(entry, entry) for entry in demand]
+            while stack:
+                key = stack.pop()
+                if key in needed or key not in self.indicator_configs: continue
+                needed.add(key); stack.extend(self.dependency_keys.get(key, []))
+            self._closures[demand] = [key for key in self.calculation_order if key in needed]
+        return self._closures[demand]
+
+# Compiled plans by indicator_plan_key; a config change produces a new key and a fresh compile.
+_PLAN_CACHE: Dict[str, IndicatorPlan] = {}
+_PLAN_CACHE_SIZE = 8
+
 class IndicatorAnalyzer:
     """
     The Self-Aware Analysis Engine for AiSignalPro (v17.5 - The Final Architecture Patch)
@@ -35,10 +78,21 @@ class IndicatorAnalyzer:
     """
     def __init__(self, df: pd.DataFrame, config: Dict[str, Any], strategies_config: Dict[str, Any], 
                  strategy_classes: List[Type[BaseStrategy]],
-                 timeframe: str, symbol: str, previous_df: Optional[pd.DataFrame] = None):
+                 timeframe: str, symbol: str, previous_df: Optional[pd.DataFrame] = None,
+                 indicator_states: Optional[Dict[str, Dict[str, Any]]] = None, plan_key: Optional[str] = None,
+                 executor: Optional[Executor] = None, demand: Optional[FrozenSet[str]] = None):
         if not isinstance(df, pd.DataFrame): raise ValueError("Input must be a pandas DataFrame.")
-        self.base_df, self.previous_df, self.indicators_config, self.strategies_config = df, previous_df, config, strategies_config
-        self.strategy_classes = strategy_classes
+        self.base_df, self.previous_df = df, previous_df
+        self._build_plan(config, strategies_config, strategy_classes, timeframe, symbol, plan_key, demand)
+        self.final_df: Optional[pd.DataFrame] = None
+        # Carried state of incremental indicators: read from the previous cycle, written for the next one.
+        self.previous_states, self.indicator_states = indicator_states or {}, {}
+        self._recomputed: set = set(); self._incremental_keys: set = set()
+        # With an executor, independent nodes run concurrently on it; without one, strictly in topological order.
+        self.executor = executor; self._timings: Dict[str, Tuple[float, float]] = {}
+
+    def _build_plan(self, config: Dict[str, Any], strategies_config: Dict[str, Any], strategy_classes: List[Type[BaseStrategy]], timeframe: str, symbol: str, plan_key: Optional[str] = None, demand: Optional[FrozenSet[str]] = None):
+        self.indicators_config, self.strategies_config, self.strategy_classes = config, strategies_config, strategy_classes
         self.timeframe, self.symbol, self.recalc_buffer = timeframe, symbol, 250
         self._indicator_classes: Dict[str, Type[BaseIndicator]] = { 
             'rsi': RsiIndicator, 
@@ -68,10 +122,44 @@ class IndicatorAnalyzer:
             'fibonacci': FibonacciIndicator, 
             'volume': VolumeIndicator,   # ✅ تنها تغییر اضافه‌شده
         }
-        self._indicator_configs: Dict[str, Dict[str, Any]] = {}
         self._indicator_instances: Dict[str, BaseIndicator] = {}
-        self._calculation_order: List[str] = self._resolve_dependencies()
-        self.final_df: Optional[pd.DataFrame] = None
+        # Callers that know their config's indicator_plan_key share one compiled plan; without a key the plan is built privately.
+        plan = _PLAN_CACHE.get(plan_key) if plan_key else None
+        if plan is None:
+            self._indicator_configs: Dict[str, Dict[str, Any]] = {}
+            # Direct dependency keys of every node, for lookback planning.
+            self._dependency_keys: Dict[str, List[str]] = {}
+            plan = IndicatorPlan(self._indicator_configs, self._dependency_keys, self._resolve_dependencies(), config)
+            if plan_key:
+                if len(_PLAN_CACHE) >= _PLAN_CACHE_SIZE: _PLAN_CACHE.clear()
+                _PLAN_CACHE[plan_key] = plan
+                logger.info(f"Compiled indicator plan {plan_key[:12]}: {len(plan.calculation_order)} nodes.")
+        self._plan = plan
+        self._indicator_configs, self._dependency_keys, self._calculation_order = plan.indicator_configs, plan.dependency_keys, plan.calculation_order
+        # With a demand only what the consumers read (and its dependencies) is calculated and analyzed.
+        if demand is not None: self._calculation_order = plan.closure(frozenset(demand))
+
+    @classmethod
+    def required_lookback(cls, config: Dict[str, Any], strategies_config: Dict[str, Any], strategy_classes: List[Type[BaseStrategy]], timeframe: str, plan_key: Optional[str] = None,
+                          demand: Optional[FrozenSet[str]] = None) -> int:
+        """
+        The minimum candle history the enabled indicator DAG (or its demanded part) needs
+        on `timeframe`: for every node, its own lookback plus the deepest lookback among
+        its dependencies (their output feeds its windows), maximized over the DAG.
+        """
+        planner = cls.__new__(cls); planner._build_plan(config, strategies_config, strategy_classes, timeframe, "*", plan_key, demand)
+        return planner._plan_lookback()
+
+    def _plan_lookback(self) -> int:
+        needed: Dict[str, int] = {}
+        for key in self._calculation_order:
+            config = self._indicator_configs[key]; indicator_cls = self._indicator_classes.get(config["name"])
+            own = indicator_cls.required_lookback(config["params"], self.timeframe) if indicator_cls else 0
+            needed[key] = own + max((needed[dep] for dep in self._dependency_keys.get(key, [])), default=0)
+        if needed:
+            deepest = max(needed, key=needed.get)
+            logger.debug(f"Indicator plan for {self.timeframe} needs {needed[deepest]} candles (deepest: '{deepest}').")
+        return max(needed.values(), default=0)
 
     def _resolve_dependencies(self) -> List[str]:
         adj, in_degree = {}, {}
@@ -86,6 +174,7 @@ class IndicatorAnalyzer:
             # We store the FULL parameter block for later use in _calculate_and_store
             self._indicator_configs[key] = {'name': ind_name, 'params': params}
             adj[key], in_degree[key] = [], 0
+            self._dependency_keys[key] = []
             
             for dep_name, dep_params in (params.get("dependencies") or {}).items():
                 # We need to find the full config for this dependency from the main list
@@ -99,6 +188,7 @@ class IndicatorAnalyzer:
                 
                 adj[dep_key].append(key)
                 in_degree[key] += 1
+                self._dependency_keys[key].append(dep_key)
         
         # --- Discovery Phase ---
         # 1. Discover from main indicators config
@@ -134,26 +224,80 @@ class IndicatorAnalyzer:
         return sorted_order
 
     async def _calculate_and_store(self, key: str, base_df: pd.DataFrame) -> None:
+        if self.executor is None: self._calculate_node(key, base_df)
+        else: await asyncio.get_running_loop().run_in_executor(self.executor, self._calculate_node, key, base_df)
+
+    def _calculate_node(self, key: str, base_df: pd.DataFrame) -> None:
+        started = time.perf_counter()
+        try: self._calculate_instance(key, base_df)
+        finally: self._timings[key] = (started, time.perf_counter())
+
+    def _new_instance(self, key: str, base_df: pd.DataFrame) -> Optional[BaseIndicator]:
         config = self._indicator_configs[key]; name, params_block = config["name"], config["params"]
         cls = self._indicator_classes.get(name)
-        if not cls: logger.warning(f"Indicator class not found for key '{key}'"); return
+        if not cls: logger.warning(f"Indicator class not found for key '{key}'"); return None
+        instance_params = {**params_block, "timeframe": self.timeframe, "symbol": self.symbol}
+        return cls(df=shared_frame(base_df), params=instance_params, dependencies=self._indicator_instances)
+
+    def _continuation(self, key: str, instance: BaseIndicator) -> Optional[int]:
+        """The row an instance continues its previous state from, or None when it must be calculated in full."""
+        start = instance.incremental_start(self.previous_states.get(key))
+        # A node only continues from its state when every dependency did too; a fully
+        # recomputed dependency may have changed the history the state was built on.
+        return start if start is not None and not self._recomputed.intersection(self._dependency_keys.get(key, ())) else None
+
+    def _store_instance(self, key: str, instance: BaseIndicator):
+        self._indicator_instances[key] = instance
+        state = instance.get_state()
+        if state is not None: self.indicator_states[key] = state
+
+    def _calculation_failed(self, key: str, error: Exception):
+        logger.error(f"Indicator calculation CRASHED for key '{key}' on {self.symbol}@{self.timeframe}: {error}", exc_info=True)
+        self._indicator_instances[key] = error; self._recomputed.add(key)
+
+    def _calculate_instance(self, key: str, base_df: pd.DataFrame) -> None:
         try:
-            instance_params = {**params_block, "timeframe": self.timeframe, "symbol": self.symbol}
-            instance = cls(df=base_df.copy(), params=instance_params, dependencies=self._indicator_instances).calculate()
-            self._indicator_instances[key] = instance
+            instance = self._new_instance(key, base_df)
+            if instance is None: return
+            start = self._continuation(key, instance)
+            if start is not None:
+                instance = instance.update(instance.df.iloc[start:], self.previous_states[key]); self._incremental_keys.add(key)
+            else:
+                instance = instance.calculate(); self._recomputed.add(key)
+            self._store_instance(key, instance)
         except Exception as e:
-            logger.error(f"Indicator calculation CRASHED for key '{key}' on {self.symbol}@{self.timeframe}: {e}", exc_info=True)
-            self._indicator_instances[key] = e 
+            self._calculation_failed(key, e)
 
-    async def calculate_all(self) -> "IndicatorAnalyzer":
-        df_for_calc = self.base_df.copy()
+    def _frame_for_calculation(self) -> pd.DataFrame:
+        # Every indicator reads this one frame through a shallow view and adds its own columns to that view.
+        df_for_calc = shared_frame(self.base_df)
         if self.previous_df is not None and not self.previous_df.empty:
             df_for_calc = pd.concat([self.previous_df, df_for_calc])
             df_for_calc = df_for_calc.sort_index(); df_for_calc = df_for_calc[~df_for_calc.index.duplicated(keep="last")]
-            
+        return df_for_calc
+
+    async def calculate_all(self) -> "IndicatorAnalyzer":
+        df_for_calc = self._frame_for_calculation()
         logger.info(f"--- Starting DI Calculations for {self.symbol}@{self.timeframe} ({len(self._calculation_order)} tasks) ---")
-        for key in self._calculation_order:
-            await self._calculate_and_store(key, df_for_calc)
+        started = time.perf_counter()
+        if self.executor is None:
+            for key in self._calculation_order:
+                await self._calculate_and_store(key, df_for_calc)
+        else:
+            # Each node starts as soon as its own dependencies finish; the order only guarantees they were scheduled first.
+            tasks: Dict[str, asyncio.Task] = {}
+            async def run_node(key: str):
+                await asyncio.gather(*(tasks[dep] for dep in self._dependency_keys.get(key, [])))
+                await self._calculate_and_store(key, df_for_calc)
+            for key in self._calculation_order: tasks[key] = asyncio.ensure_future(run_node(key))
+            await asyncio.gather(*tasks.values())
+            # Nodes finished in completion order; restore the topological order so the summary is deterministic.
+            finished = [(key, self._indicator_instances[key]) for key in self._calculation_order if key in self._indicator_instances]
+            self._indicator_instances.clear(); self._indicator_instances.update(finished)
+        return self._finish_calculation(df_for_calc, time.perf_counter() - started)
+
+    def _finish_calculation(self, df_for_calc: pd.DataFrame, wall_seconds: float, mode: Optional[str] = None) -> "IndicatorAnalyzer":
+        self._log_schedule(wall_seconds, mode)
         self.final_df = df_for_calc
 
         success_count = sum(1 for v in self._indicator_instances.values() if isinstance(v, BaseIndicator))
@@ -163,11 +307,96 @@ class IndicatorAnalyzer:
             failed_names = [self._indicator_configs.get(key, {}).get('name', key) for key in failed_keys]
             logger.warning(f"⚠️ DI Calculations for {self.symbol}@{self.timeframe}: {success_count} succeeded, {failed_count} FAILED. Failed indicators: [{', '.join(failed_names)}]")
         else:
-            logger.info(f"✅ DI Calculations complete for {self.symbol}@{self.timeframe}: {success_count} succeeded, {failed_count} failed.")
+            logger.info(f"✅ DI Calculations complete for {self.symbol}@{self.timeframe}: {success_count} succeeded ({self.incremental_count} incremental), {failed_count} failed.")
         if self.final_df is not None: 
             logger.info(f"📊 Final stateful DF for {self.symbol}@{self.timeframe} now contains {len(self.final_df)} rows.")
         return self
 
+    @classmethod
+    def calculate_batch(cls, analyzers: List["IndicatorAnalyzer"]) -> List["IndicatorAnalyzer"]:
+        """
+        calculate_all() for many symbols at once. Analyzers sharing a timeframe, a plan,
+        a calculation order and the exact same candle index walk the DAG together: per
+        node, instances that can continue from their state update on their own and the
+        rest go through the indicator class's calculate_batch (one vectorized pass over
+        a symbols x candles matrix for `batched` indicators). Every analyzer ends up as
+        if calculate_all() had run on it. Synchronous; run it off the event loop.
+        """
+        groups: List[Tuple[List["IndicatorAnalyzer"], pd.DataFrame, List[pd.DataFrame]]] = []
+        for analyzer in analyzers:
+            frame = analyzer._frame_for_calculation()
+            group = next((g for g in groups if g[0][0].timeframe == analyzer.timeframe and g[0][0]._plan is analyzer._plan
+                          and g[0][0]._calculation_order == analyzer._calculation_order and g[1].index.equals(frame.index)), None)
+            if group is None: groups.append(([analyzer], frame, [frame]))
+            else: group[0].append(analyzer); group[2].append(frame)
+        for members, _, frames in groups:
+            started = time.perf_counter(); lead = members[0]
+            logger.info(f"--- Starting batched DI Calculations for {len(members)} symbol(s) @{lead.timeframe} ({len(lead._calculation_order)} tasks) ---")
+            for key in lead._calculation_order: cls._calculate_node_batch(key, list(zip(members, frames)))
+            wall = time.perf_counter() - started
+            for analyzer, frame in zip(members, frames): analyzer._finish_calculation(frame, wall, "batched")
+        return analyzers
+
+    @staticmethod
+    def _calculate_node_batch(key: str, members: List[Tuple["IndicatorAnalyzer", pd.DataFrame]]):
+        fresh: List[Tuple["IndicatorAnalyzer", BaseIndicator]] = []
+        for analyzer, frame in members:
+            started = time.perf_counter()
+            try:
+                instance = analyzer._new_instance(key, frame)
+                if instance is None: continue
+                start = analyzer._continuation(key, instance)
+                if start is None: fresh.append((analyzer, instance)); continue
+                analyzer._store_instance(key, instance.update(instance.df.iloc[start:], analyzer.previous_states[key])); analyzer._incremental_keys.add(key)
+            except Exception as e:
+                analyzer._calculation_failed(key, e)
+            finally:
+                analyzer._timings[key] = (started, time.perf_counter())
+        if not fresh: return
+        indicator_cls = type(fresh[0][1])
+        if indicator_cls.batched and len(fresh) > 1:
+            started = time.perf_counter()
+            try:
+                indicator_cls.calculate_batch([instance for _, instance in fresh])
+                # Each symbol is charged its share of the batch in the schedule log.
+                share = (time.perf_counter() - started) / len(fresh)
+                for analyzer, instance in fresh:
+                    analyzer._recomputed.add(key); analyzer._store_instance(key, instance); analyzer._timings[key] = (started, started + share)
+                return
+            except Exception as e:
+                logger.warning(f"Batched {indicator_cls.__name__} for '{key}' failed on {len(fresh)} symbols ({e}). Calculating them one by one.")
+        for analyzer, instance in fresh:
+            started = time.perf_counter()
+            try:
+                analyzer._recomputed.add(key); analyzer._store_instance(key, instance.calculate())
+            except Exception as e:
+                analyzer._calculation_failed(key, e)
+            finally:
+                analyzer._timings[key] = (started, time.perf_counter())
+
+    @property
+    def incremental_count(self) -> int:
+        return len(self._incremental_keys)
+
+    def _log_schedule(self, wall_seconds: float, mode: Optional[str] = None):
+        """Logs the DAG schedule: per level, its slowest node; overall, the critical path (the slowest dependency chain)."""
+        if not self._timings: return
+        durations = {key: end - start for key, (start, end) in self._timings.items()}
+        path: Dict[str, Tuple[float, List[str]]] = {}
+        for key in self._calculation_order:
+            if key not in durations: continue
+            deps = [path[dep] for dep in self._dependency_keys.get(key, []) if dep in path]
+            longest = max(deps, key=lambda p: p[0], default=(0.0, []))
+            path[key] = (longest[0] + durations[key], longest[1] + [key])
+        levels: Dict[int, List[str]] = {}
+        for key in durations: levels.setdefault(self._plan.levels.get(key, 0), []).append(key)
+        name = lambda key: self._indicator_configs.get(key, {}).get('name', key)
+        level_report = " | ".join(f"L{level}: {len(keys)} nodes, slowest {name(slowest)} {durations[slowest] * 1000:.1f}ms"
+                                  for level, keys in sorted(levels.items()) for slowest in [max(keys, key=durations.get)])
+        critical_time, critical_keys = max(path.values(), key=lambda p: p[0])
+        logger.info(f"⏱️ DI schedule for {self.symbol}@{self.timeframe} ({mode or ('parallel' if self.executor else 'sequential')}): wall {wall_seconds * 1000:.1f}ms, "
+                    f"work {sum(durations.values()) * 1000:.1f}ms, critical path {critical_time * 1000:.1f}ms ({' -> '.join(map(name, critical_keys))}). {level_report}")
+
     async def get_analysis_summary(self) -> Dict[str, Any]:
         if self.final_df is None: return {"status": "Calculation Not Run"}
         if len(self.final_df) < 2: return {"status": "Insufficient Data"}
@@ -178,11 +407,7 @@ class IndicatorAnalyzer:
         except IndexError:
             return {"status": "Insufficient Data after calculations"}
         
-        indicator_map = {}
-        for unique_key, config in self._indicator_configs.items():
-            simple_name = config['name']
-            if simple_name in self.indicators_config: indicator_map[simple_name] = unique_key
-        summary["_indicator_map"] = indicator_map
+        summary["_indicator_map"] = dict(self._plan.indicator_map)
 
         total_calculated_instances = sum(1 for v in self._indicator_instances.values() if isinstance(v, BaseIndicator))
         logger.info(f"--- Starting Analysis Aggregation for {self.symbol}@{self.timeframe} ({total_calculated_instances} successful instances) ---")
@@ -191,7 +416,8 @@ class IndicatorAnalyzer:
             if not isinstance(instance, BaseIndicator): summary[unique_key] = {"status": "Calculation Failed"}; continue
             try:
                 analyze_method = getattr(instance, "analyze", None)
-                analysis = await analyze_method() if inspect.iscoroutinefunction(analyze_method) else analyze_method() if analyze_method else {"status": "No analyze() method found"}
+                # Synchronous analyses go through the instance's memo, shared with dependents that already read it.
+                analysis = await analyze_method() if inspect.iscoroutinefunction(analyze_method) else instance.cached_analysis() if analyze_method else {"status": "No analyze() method found"}
                 summary[unique_key] = analysis
                 if not analysis or analysis.get("status") != "OK":
                     indicator_name = self._indicator_configs.get(unique_key, {}).get('name', unique_key)
@@ -3,9 +3,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, ewm_continue, at_checkpoint, ewm_rows, shift_rows, rolling_rank_pct_rows, ffill_rows, nan_where_zero, stack_columns
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +39,9 @@ class AdxIndicator(BaseIndicator):
         }
     }
 
+    incremental = True
+    batched = True
+
     def __init__(self, df: pd.DataFrame, params: Dict[str, Any], **kwargs):
         super().__init__(df, params=params, **kwargs)
         self.period = int(self.params.get('period', self.default_config['period']))
@@ -55,6 +58,12 @@ class AdxIndicator(BaseIndicator):
         self.minus_di_col = f'minus_di{suffix}'
         self.adx_percentile_col = f'adx_pct{suffix}' # New column for the percentile
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        # Wilder smoothing runs twice (DI, then ADX) before the percentile rank window.
+        cfg = {**cls.default_config, **params}
+        return 2 * int(cfg['period']) + int(cfg['regime_lookback_period'])
+
     def calculate(self) -> 'AdxIndicator':
         min_data_needed = max(self.period * 2, self.regime_lookback_period)
         if len(self.df) < min_data_needed:
@@ -100,6 +109,53 @@ class AdxIndicator(BaseIndicator):
         self.df[self.minus_di_col] = minus_di.ffill(limit=fill_limit)
         self.df[self.adx_percentile_col] = self.df[self.adx_percentile_col].ffill(limit=fill_limit)
             
+
+        self._carry = {'atr': float(atr.iloc[-2]), 'plus_dm': float(plus_dm_smooth.iloc[-2]), 'minus_dm': float(minus_dm_smooth.iloc[-2])}
+        return self
+
+    @classmethod
+    def calculate_batch(cls, instances: List['AdxIndicator']) -> List['AdxIndicator']:
+        first = instances[0]
+        if len(first.df) < max(first.period * 2, first.regime_lookback_period): return super().calculate_batch(instances)
+        alpha = 1 / first.period
+        high, low, close = (stack_columns(instances, c) for c in ('high', 'low', 'close'))
+        prev_close = shift_rows(close)
+        atr = ewm_rows(np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))), alpha)
+        move_up, move_down = high - shift_rows(high), shift_rows(low) - low
+        plus_dm = ewm_rows(np.where((move_up > move_down) & (move_up > 0), move_up, 0.0), alpha)
+        minus_dm = ewm_rows(np.where((move_down > move_up) & (move_down > 0), move_down, 0.0), alpha)
+        safe_atr = nan_where_zero(atr, 1e-9)
+        plus_di, minus_di = plus_dm / safe_atr * 100, minus_dm / safe_atr * 100
+        adx = ewm_rows(np.abs(plus_di - minus_di) / nan_where_zero(plus_di + minus_di, 1e-9) * 100, alpha)
+        window = first.regime_lookback_period
+        percentile = rolling_rank_pct_rows(adx, window, int(window / 2)) * 100
+        columns = {'adx_percentile_col': percentile, 'adx_col': adx, 'plus_di_col': plus_di, 'minus_di_col': minus_di}
+        columns = {attr: ffill_rows(values, 3) for attr, values in columns.items()}
+        for row, instance in enumerate(instances):
+            for attr, values in columns.items(): instance.df[getattr(instance, attr)] = values[row]
+            instance._carry = {'atr': float(atr[row, -2]), 'plus_dm': float(plus_dm[row, -2]), 'minus_dm': float(minus_dm[row, -2])}
+        return instances
+
+    def output_columns(self) -> List[str]:
+        return [self.adx_col, self.plus_di_col, self.minus_di_col, self.adx_percentile_col]
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'AdxIndicator':
+        n, alpha, carry = len(new_rows), 1 / self.period, state['carry']
+        high, low, close = (self.df[c].to_numpy(dtype=float)[-n - 1:] for c in ('high', 'low', 'close'))
+        tr = np.fmax(high[1:] - low[1:], np.fmax(np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])))
+        move_up, move_down = np.diff(high), -np.diff(low)
+        atr = ewm_continue(carry['atr'], tr, alpha)
+        plus_dm = ewm_continue(carry['plus_dm'], np.where((move_up > move_down) & (move_up > 0), move_up, 0.0), alpha)
+        minus_dm = ewm_continue(carry['minus_dm'], np.where((move_down > move_up) & (move_down > 0), move_down, 0.0), alpha)
+        safe_atr = np.where(atr == 0, 1e-9, atr)
+        plus_di, minus_di = plus_dm / safe_atr * 100, minus_dm / safe_atr * 100
+        di_sum = plus_di + minus_di
+        adx = ewm_continue(self._carried(state, self.adx_col, n)[-1], np.abs(plus_di - minus_di) / np.where(di_sum == 0, 1e-9, di_sum) * 100, alpha)
+        window = self.regime_lookback_period
+        history = pd.Series(np.r_[self._carried(state, self.adx_col, n)[-(window - 1):], adx])
+        percentile = history.rolling(window=window, min_periods=int(window / 2)).rank(pct=True).to_numpy()[-n:] * 100
+        self._write_incremental(state, {self.adx_col: adx, self.plus_di_col: plus_di, self.minus_di_col: minus_di, self.adx_percentile_col: percentile})
+        self._carry = {'atr': at_checkpoint(carry['atr'], atr), 'plus_dm': at_checkpoint(carry['plus_dm'], plus_dm), 'minus_dm': at_checkpoint(carry['minus_dm'], minus_dm)}
         return self
 
     def analyze(self) -> Dict[str, Any]:
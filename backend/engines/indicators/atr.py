@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, ewm_continue, ewm_rows, shift_rows, ffill_rows, bfill_rows, nan_where_zero, stack_columns
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,8 @@ class AtrIndicator(BaseIndicator):
     valid output series under all data conditions.
     """
     dependencies: list = []
+    incremental = True
+    batched = True
 
     def __init__(self, df: pd.DataFrame, **kwargs):
         super().__init__(df, **kwargs)
@@ -33,6 +35,10 @@ class AtrIndicator(BaseIndicator):
         self.atr_col = f'atr{suffix}'
         self.atr_pct_col = f'atr_pct{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return int(params.get('period', 14)) + 1
+
     def calculate(self) -> 'AtrIndicator':
         df_for_calc = self.df
         if len(df_for_calc) < self.period:
@@ -63,6 +69,39 @@ class AtrIndicator(BaseIndicator):
         self.df[self.atr_col] = filled_atr.bfill(limit=2)
         self.df[self.atr_pct_col] = filled_atr_pct.bfill(limit=2)
 
+        self._carry = {}
+        return self
+
+    @classmethod
+    def calculate_batch(cls, instances: List['AtrIndicator']) -> List['AtrIndicator']:
+        first = instances[0]
+        if len(first.df) < first.period: return super().calculate_batch(instances)
+        high, low, close = (stack_columns(instances, c) for c in ('high', 'low', 'close'))
+        prev_close = shift_rows(close)
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = ewm_rows(tr, 1 / first.period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            atr_pct = atr / nan_where_zero(close) * 100
+        atr_pct = np.where(np.isinf(atr_pct), np.nan, atr_pct)
+        atr, atr_pct = bfill_rows(ffill_rows(atr, 3), 2), bfill_rows(ffill_rows(atr_pct, 3), 2)
+        for row, instance in enumerate(instances):
+            instance.df[instance.atr_col] = atr[row]
+            instance.df[instance.atr_pct_col] = atr_pct[row]
+            instance._carry = {}
+        return instances
+
+    def output_columns(self) -> List[str]:
+        return [self.atr_col, self.atr_pct_col]
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'AtrIndicator':
+        n = len(new_rows); close = self.df['close'].to_numpy(dtype=float); prev_close = close[-n - 1:-1]
+        high, low = new_rows['high'].to_numpy(dtype=float), new_rows['low'].to_numpy(dtype=float)
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = ewm_continue(self._carried(state, self.atr_col, n)[-1], tr, 1 / self.period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            atr_pct = atr / np.where(close[-n:] == 0, np.nan, close[-n:]) * 100
+        self._write_incremental(state, {self.atr_col: atr, self.atr_pct_col: np.where(np.isinf(atr_pct), np.nan, atr_pct)})
+        self._carry = {}
         return self
 
     def analyze(self) -> Dict[str, Any]:
@@ -1,9 +1,11 @@
 # backend/engines/indicators/base.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import math
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, Any, Optional, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
 
 # This is a standard Python practice for handling circular type hints
 if TYPE_CHECKING:
@@ -11,6 +13,131 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+# With Copy-on-Write (always on from pandas 3) a shallow copy shares every column until
+# one side writes to it, so indicators can read one shared frame without copying it.
+PANDAS_MAJOR = int(pd.__version__.split('.')[0])
+
+def enable_copy_on_write():
+    """
+    Turns Copy-on-Write on for pandas 2.x (pandas 3 always has it). Called once at
+    process start-up by the live worker and by every analysis pool process; without
+    it shared_frame falls back to a deep copy per indicator.
+    """
+    if PANDAS_MAJOR < 3 and pd.get_option('mode.copy_on_write') is not True:
+        pd.set_option('mode.copy_on_write', True); logger.info(f"pandas {pd.__version__}: Copy-on-Write enabled.")
+
+def copy_on_write() -> bool:
+    return PANDAS_MAJOR >= 3 or pd.get_option('mode.copy_on_write') is True
+
+def shared_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """A frame an indicator may add columns to without affecting `df`; zero-copy under Copy-on-Write."""
+    return df.copy(deep=not copy_on_write())
+
+def ewm_continue(seed: float, values: np.ndarray, alpha: float) -> np.ndarray:
+    """Continues an `ewm(alpha=alpha, adjust=False)` series whose value on the row before `values` was `seed`."""
+    out = np.empty(len(values)); prev = seed
+    for i, x in enumerate(values):
+        if not np.isnan(x): prev = x if np.isnan(prev) else (1 - alpha) * prev + alpha * x
+        out[i] = prev
+    return out
+
+def at_checkpoint(seed: float, values: np.ndarray) -> float:
+    """The value of a continued series on the new checkpoint row (second-to-last), which is the old seed when only one row is new."""
+    return float(values[-2]) if len(values) >= 2 else float(seed)
+
+def ewm_adjusted_carry(mean: float, position: int, alpha: float) -> Dict[str, float]:
+    """Carry for an `ewm(adjust=True)` series of NaN-free inputs: its mean and weight sum at 0-based row `position`."""
+    return {'mean': float(mean), 'weight': (1 - (1 - alpha) ** (position + 1)) / alpha, 'count': position + 1}
+
+def ewm_adjusted_continue(carry: Dict[str, float], values: np.ndarray, alpha: float, min_periods: int = 0) -> Tuple[np.ndarray, Dict[str, float]]:
+    """Continues an `ewm(adjust=True)` mean of NaN-free inputs; returns the new values and the carry at the last one."""
+    out = np.empty(len(values)); mean, weight, count = carry['mean'], carry['weight'], carry['count']
+    for i, x in enumerate(values):
+        weight = 1 + (1 - alpha) * weight; count += 1
+        mean = x if np.isnan(mean) else mean + (x - mean) / weight
+        out[i] = mean if count >= min_periods else np.nan
+    return out, {'mean': mean, 'weight': weight, 'count': count}
+
+def candles_per_period(period: str, timeframe: Optional[str]) -> int:
+    """How many `timeframe` candles span one calendar `period` (e.g. '1D' on 5m -> 288); 1 when either is unknown."""
+    if not timeframe: return 1
+    try:
+        tf = timeframe.lower(); tf_delta = pd.to_timedelta(tf.replace('m', 'min') if tf.endswith('m') else tf)
+        # Measured from an on-offset anchor, so calendar periods (days, weeks, months) get their full length.
+        offset = pd.tseries.frequencies.to_offset(period); anchor = offset.rollback(pd.Timestamp("2000-01-01"))
+        period_delta = (anchor + offset) - anchor
+        return max(1, math.ceil(period_delta / tf_delta))
+    except (ValueError, TypeError):
+        logger.debug(f"Could not relate period '{period}' to timeframe '{timeframe}'."); return 1
+
+# --- Row-wise kernels for calculate_batch: one row per symbol, one column per candle ---
+# They follow pandas' own recursions and window semantics, so a batched column matches
+# the per-symbol pandas result.
+
+def ewm_rows(values: np.ndarray, alpha: float, adjust: bool = False, min_periods: int = 0) -> np.ndarray:
+    """`ewm(alpha=alpha, adjust=adjust, min_periods=min_periods).mean()` along every row (pandas' recursion, NaNs not ignored)."""
+    out = np.empty(values.shape); weighted = values[:, 0].astype(float)
+    old_wt = np.ones(len(values)); new_wt = 1.0 if adjust else alpha
+    nobs = (~np.isnan(weighted)).astype(int); out[:, 0] = np.where(nobs >= min_periods, weighted, np.nan)
+    for t in range(1, values.shape[1]):
+        cur = values[:, t]; observed = ~np.isnan(cur); nobs += observed
+        started = ~np.isnan(weighted); old_wt = np.where(started, old_wt * (1 - alpha), old_wt)
+        update = started & observed & (weighted != cur)
+        with np.errstate(invalid='ignore'):
+            weighted = np.where(update, (old_wt * weighted + new_wt * cur) / (old_wt + new_wt), weighted)
+        old_wt = np.where(started & observed, old_wt + new_wt if adjust else 1.0, old_wt)
+        weighted = np.where(~started & observed, cur, weighted)
+        out[:, t] = np.where(nobs >= min_periods, weighted, np.nan)
+    return out
+
+def shift_rows(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    out = np.full(values.shape, np.nan); out[:, periods:] = values[:, :-periods]
+    return out
+
+def rolling_rows(values: np.ndarray, window: int, reducer: str, **kwargs) -> np.ndarray:
+    """
+    `rolling(window).<reducer>(**kwargs)` along every row. The whole block goes through
+    pandas' own window kernels in one call: their online sums leave round-off residue
+    (e.g. a tiny std over a flat window) that a closed-form reduction would not.
+    """
+    return getattr(pd.DataFrame(values.T).rolling(window=window), reducer)(**kwargs).to_numpy().T
+
+def rolling_rank_pct_rows(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """`rolling(window, min_periods).rank(pct=True)` along every row: average rank of the last value among the window's non-NaN values."""
+    less = np.zeros(values.shape); equal = np.zeros(values.shape); nobs = np.zeros(values.shape)
+    for lag in range(min(window, values.shape[1])):
+        current, past = values[:, lag:], values[:, :values.shape[1] - lag]
+        less[:, lag:] += past < current; equal[:, lag:] += past == current; nobs[:, lag:] += ~np.isnan(past)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where((nobs >= max(min_periods, 1)) & ~np.isnan(values), (less + (equal + 1) / 2) / nobs, np.nan)
+
+def ffill_rows(values: np.ndarray, limit: int) -> np.ndarray:
+    """`ffill(limit=limit)` along every row."""
+    positions = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    last = np.maximum.accumulate(np.where(np.isnan(values), -1, positions), axis=1)
+    fill = np.isnan(values) & (last >= 0) & (positions - last <= limit)
+    return np.where(fill, np.take_along_axis(values, np.maximum(last, 0), axis=1), values)
+
+def bfill_rows(values: np.ndarray, limit: int) -> np.ndarray:
+    """`bfill(limit=limit)` along every row."""
+    return ffill_rows(values[:, ::-1], limit)[:, ::-1]
+
+def nan_where_zero(values: np.ndarray, replacement: float = np.nan) -> np.ndarray:
+    """`Series.replace(0, replacement)` for a matrix."""
+    return np.where(values == 0, replacement, values)
+
+def stack_columns(instances: List['BaseIndicator'], column: str) -> np.ndarray:
+    """One column of every instance's frame as a (symbols x candles) float matrix."""
+    return np.vstack([instance.df[column].to_numpy(dtype=float) for instance in instances])
+
+def _spare_buffer(values: np.ndarray, size: Optional[int] = None) -> np.ndarray:
+    """A copy of `values` in a buffer with room for the frame to grow to `size` rows and beyond (amortized growth)."""
+    size = max(len(values), size or 0)
+    buffer = np.empty(size + max(64, size // 2), dtype=values.dtype if values.dtype.kind in 'if' else float)
+    buffer[:len(values)] = values
+    return buffer
+
 class BaseIndicator(ABC):
     """
     Abstract Base Class for all AiSignalPro indicators (v4.0 - Dependency Injection Ready).
@@ -40,9 +167,108 @@ class BaseIndicator(ABC):
         
         # ✅ CORE UPGRADE: Directly store the injected dependency instances.
         self.dependencies = dependencies or {}
+        # Recursive state at the checkpoint row (see get_state); set by incremental indicators.
+        self._carry: Optional[Dict[str, Any]] = None
+        # Output column buffers written in place by update(); see _write_incremental.
+        self._buffers: Dict[str, np.ndarray] = {}
+        # analyze() result, memoized by cached_analysis(); an instance lives for one analysis cycle.
+        self._analysis: Optional[Dict[str, Any]] = None
         
         logger.debug(f"Initialized {self.__class__.__name__} with params: {self.params} and {len(self.dependencies)} dependencies.")
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        """
+        The minimum number of candles this indicator needs (from its own params,
+        not counting its dependencies) before its latest values are fully formed:
+        its longest rolling window plus any statistics window stacked on top.
+        The IndicatorAnalyzer adds dependency lookbacks and sizes fetches from it.
+        Indicators that use the whole available history (e.g. swing pivots) keep this default.
+        """
+        return 2
+
+    def dependency_column(self, instance: 'BaseIndicator', column: str) -> pd.Series:
+        """A dependency's output column aligned to this frame: the same series by reference when the rows match, else reindexed (a left join)."""
+        series = instance.df[column]
+        return series if series.index.equals(self.df.index) else series.reindex(self.df.index)
+
+    # --- Incremental contract (optional) ---
+    # Indicators that set `incremental = True` list their output columns in
+    # output_columns(), leave their recursive state at the checkpoint row in
+    # self._carry from both calculate() and update(), and implement update().
+    # The checkpoint is the second-to-last row: the last candle is still forming
+    # and is recomputed on the next cycle. A state is only valid for a frame with
+    # the same first row (origin): the recursions start there on the full path
+    # too, so both paths agree. Callers therefore trim frames in steps (see
+    # CandleHistory's trim_step), and a trim falls back to one full calculation.
+    incremental: bool = False
+
+    def output_columns(self) -> List[str]:
+        return []
+
+    def get_state(self) -> Optional[Dict[str, Any]]:
+        """The state carried to the next cycle, or None when there is nothing valid to carry."""
+        columns = self.output_columns()
+        if not self.incremental or self._carry is None or len(self.df) < 2 or not all(c in self.df.columns for c in columns): return None
+        checkpoint = self.df.index[-2]; fingerprint = self.df.loc[checkpoint, OHLCV_COLUMNS].to_numpy(dtype=float)
+        if np.isnan(fingerprint).any(): return None
+        # After update() the buffers are carried as they are; after a full calculation they are allocated once.
+        buffers = {c: self._buffers[c] if c in self._buffers else _spare_buffer(self.df[c].to_numpy()) for c in columns}
+        return {'checkpoint': checkpoint, 'position': len(self.df) - 2, 'origin': self.df.index[0], 'fingerprint': fingerprint,
+                'columns': buffers, 'carry': dict(self._carry)}
+
+    def incremental_start(self, state: Optional[Dict[str, Any]]) -> Optional[int]:
+        """
+        The position of the first row to compute from `state`, or None when the state
+        does not match this frame: the frame starts at another row, the checkpoint
+        candle is missing, moved or was revised. New rows with missing prices also
+        fall back, since the recursions skip them differently.
+        """
+        if not self.incremental or not state or state['checkpoint'] not in self.df.index or self.df.index[0] != state.get('origin'): return None
+        position = self.df.index.get_loc(state['checkpoint'])
+        if not isinstance(position, int) or position != state.get('position') or position + 1 >= len(self.df): return None
+        if not np.array_equal(self.df[OHLCV_COLUMNS].iloc[position].to_numpy(dtype=float), state['fingerprint']): return None
+        if self.df[OHLCV_COLUMNS].iloc[position + 1:].isna().to_numpy().any(): return None
+        return position + 1
+
+    def _carried(self, state: Dict[str, Any], column: str, new_count: int) -> np.ndarray:
+        """A carried output column, aligned to this frame's rows up to the checkpoint (all but the last `new_count`); a view, not a copy."""
+        return state['columns'][column][:len(self.df) - new_count]
+
+    def _write_incremental(self, state: Dict[str, Any], new_values: Dict[str, np.ndarray]):
+        """
+        Writes the freshly computed rows into the carried column buffers in place and
+        exposes each buffer's first len(self.df) rows as the output column without
+        copying. Only rows after the checkpoint are written: in the previous cycle's
+        frame that is its forming candle, which is superseded anyway.
+        """
+        size = len(self.df)
+        for column, values in new_values.items():
+            buffer = state['columns'][column]; start = size - len(values)
+            if len(buffer) < size: buffer = _spare_buffer(buffer[:start], size)
+            buffer[start:size] = np.asarray(values, dtype=buffer.dtype)
+            self._buffers[column] = buffer
+            self.df[column] = pd.Series(buffer[:size], index=self.df.index, name=column, copy=False)
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'BaseIndicator':
+        """
+        Computes only `new_rows` (the tail of self.df after the state's checkpoint)
+        from the carried `state`. The default recomputes everything.
+        """
+        return self.calculate()
+
+    # --- Batched contract (optional) ---
+    # Indicators that set `batched = True` implement calculate_batch(): one vectorized
+    # pass over the instances of several symbols on one timeframe (same params, identical
+    # candle index), on (symbols x candles) matrices built with stack_columns. It writes
+    # every instance's columns and side effects exactly like calculate() would, carry included.
+    batched: bool = False
+
+    @classmethod
+    def calculate_batch(cls, instances: List['BaseIndicator']) -> List['BaseIndicator']:
+        """Calculates every instance; the default runs calculate() one by one."""
+        return [instance.calculate() for instance in instances]
+
     @abstractmethod
     def calculate(self) -> 'BaseIndicator':
         """
@@ -51,6 +277,11 @@ class BaseIndicator(ABC):
         """
         pass
 
+    def cached_analysis(self) -> Dict[str, Any]:
+        """analyze(), run at most once per instance: the analyzer's summary and every dependent share the result."""
+        if self._analysis is None: self._analysis = self.analyze()
+        return self._analysis
+
     @abstractmethod
     def analyze(self) -> Dict[str, Any]:
         """
@@ -3,9 +3,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, rolling_rows, rolling_rank_pct_rows, ffill_rows, bfill_rows, nan_where_zero, stack_columns
 from .utils import get_indicator_config_key
 
 logger = logging.getLogger(__name__)
@@ -21,6 +21,7 @@ class BollingerIndicator(BaseIndicator):
     data required by advanced strategies without introducing any regressions.
     """
     dependencies: list = ['whales'] # ✅ PRESERVED: Original dependency is untouched.
+    batched = True
 
     def __init__(self, df: pd.DataFrame, **kwargs):
         super().__init__(df, **kwargs)
@@ -46,6 +47,10 @@ class BollingerIndicator(BaseIndicator):
         
         self.whales_instance: Optional[BaseIndicator] = None
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return int(params.get('period', 20)) + int(params.get('squeeze_stats_period', 240))
+
     def calculate(self) -> 'BollingerIndicator':
         if len(self.df) < max(self.period, self.squeeze_stats_period): # Check against squeeze period as well
             logger.warning(f"Not enough data for Bollinger Bands on {self.timeframe or 'base'}.")
@@ -82,6 +87,25 @@ class BollingerIndicator(BaseIndicator):
         
         return self
 
+    @classmethod
+    def calculate_batch(cls, instances: List['BollingerIndicator']) -> List['BollingerIndicator']:
+        first = instances[0]
+        if len(first.df) < max(first.period, first.squeeze_stats_period): return super().calculate_batch(instances)
+        close = stack_columns(instances, 'close')
+        middle = rolling_rows(close, first.period, 'mean')
+        std = rolling_rows(close, first.period, 'std', ddof=0)
+        upper, lower = middle + std * first.std_dev, middle - std * first.std_dev
+        width = (upper - lower) / nan_where_zero(middle) * 100
+        percent_b = (close - lower) / nan_where_zero(upper - lower)
+        bw_percentile = rolling_rank_pct_rows(width, first.squeeze_stats_period, int(first.squeeze_stats_period / 2)) * 100
+        columns = {'middle_col': middle, 'upper_col': upper, 'lower_col': lower, 'width_col': width, 'percent_b_col': percent_b, 'bw_percentile_col': bw_percentile}
+        columns = {attr: bfill_rows(ffill_rows(values, 3), 2) for attr, values in columns.items()}
+        for row, instance in enumerate(instances):
+            whales_unique_key = get_indicator_config_key('whales', instance.params.get('dependencies', {}).get('whales', {}))
+            instance.whales_instance = instance.dependencies.get(whales_unique_key)
+            for attr, values in columns.items(): instance.df[getattr(instance, attr)] = values[row]
+        return instances
+
     def analyze(self) -> Dict[str, Any]:
         # ✅ PRESERVED: Check against original required columns.
         required_cols = [self.middle_col, self.upper_col, self.lower_col, self.width_col, self.percent_b_col]
@@ -114,7 +138,7 @@ class BollingerIndicator(BaseIndicator):
         # ✅ PRESERVED: The critical whales logic is untouched.
         volume_spike = False
         if self.whales_instance:
-            whales_analysis = self.whales_instance.analyze()
+            whales_analysis = self.whales_instance.cached_analysis()
             volume_spike = (whales_analysis.get('analysis') or {}).get('is_whale_activity', False)
         if is_squeeze_release:
             strength = "Strong" if volume_spike else "Weak"
@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from .base import BaseIndicator
 
@@ -55,6 +55,12 @@ class CciIndicator(BaseIndicator):
         if self.timeframe: suffix += f'_{self.timeframe}'
         self.cci_col = f'cci{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        cfg = {**cls.default_config, **params}
+        stats_window = int(cfg['adaptive_lookback']) if cfg['use_adaptive_thresholds'] else int(cfg['momentum_lookback'])
+        return int(cfg['period']) + stats_window
+
     def calculate(self) -> 'CciIndicator':
         if len(self.df) < self.period:
             logger.warning(f"Not enough data for CCI on {self.timeframe or 'base'}.")
@@ -31,6 +31,10 @@ class ChandelierExitIndicator(BaseIndicator):
         self.long_stop_col = f'CHEX_L{suffix}'
         self.short_stop_col = f'CHEX_S{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return int(params.get('dependencies', {}).get('atr', {}).get('period', 22)) + 1
+
     def calculate(self) -> 'ChandelierExitIndicator':
         my_deps_config = self.params.get("dependencies", {})
         atr_order_params = my_deps_config.get('atr')
@@ -50,7 +54,7 @@ class ChandelierExitIndicator(BaseIndicator):
             return self
         atr_col_name = atr_col_options[0]
         
-        df_for_calc = self.df.join(atr_instance.df[[atr_col_name]], how='left')
+        df_for_calc = self.df.assign(**{atr_col_name: self.dependency_column(atr_instance, atr_col_name)})
         
         if len(df_for_calc) < self.atr_period:
             logger.warning(f"Not enough data for Chandelier Exit on {self.timeframe or 'base'}.")
@@ -4,7 +4,7 @@ import numpy as np
 import logging
 from typing import Dict, Any, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, candles_per_period
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +35,13 @@ class DonchianChannelIndicator(BaseIndicator):
         self.lower_col = f'donchian_lower{suffix}'
         self.middle_col = f'donchian_middle{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        # A coarser source timeframe needs its period in source candles, expressed in chart candles.
+        source = params.get('source_timeframe')
+        per_source = candles_per_period(source.lower().replace('m', 'min') if source.lower().endswith('m') else source, timeframe) if source and source != timeframe else 1
+        return int(params.get('period', 20)) * per_source + 1
+
     def calculate(self) -> 'DonchianChannelIndicator':
         # ✅ MULTI-FRAME INTELLIGENCE: Use source_timeframe for calculation if provided.
         if self.source_timeframe and self.source_timeframe != self.timeframe:
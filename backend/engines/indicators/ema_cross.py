@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, ewm_continue
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,7 @@ class EMACrossIndicator(BaseIndicator):
     alignment confirmation. All previous hardening and features are preserved.
     """
     dependencies: list = []
+    incremental = True
 
     def __init__(self, df: pd.DataFrame, **kwargs):
         super().__init__(df, **kwargs)
@@ -44,6 +45,10 @@ class EMACrossIndicator(BaseIndicator):
         self.long_ema_slope_col = f'{self.long_ema_col}_slope'
 
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return max(int(params.get('long_period', 21)), int(params.get('rvol_period', 20))) + 1
+
     def calculate(self) -> 'EMACrossIndicator':
         if len(self.df) < self.long_period:
             logger.warning(f"Not enough data for EMA Cross on {self.timeframe or 'base'}.")
@@ -75,6 +80,31 @@ class EMACrossIndicator(BaseIndicator):
                 self.df[self.rvol_col] = rvol.ffill(limit=3).bfill(limit=2)
             else:
                 self.df[self.rvol_col] = np.nan
+        self._carry = {}
+        return self
+
+    def output_columns(self) -> List[str]:
+        columns = [self.short_ema_col, self.long_ema_col, self.short_ema_slope_col, self.long_ema_slope_col, self.signal_col]
+        return columns + [self.rvol_col] if self.use_volume_filter else columns
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'EMACrossIndicator':
+        n, smoothing_period = len(new_rows), 3; close = new_rows['close'].to_numpy(dtype=float)
+        prev_short, prev_long = self._carried(state, self.short_ema_col, n)[-1], self._carried(state, self.long_ema_col, n)[-1]
+        short_ema = ewm_continue(prev_short, close, 2 / (self.short_period + 1))
+        long_ema = ewm_continue(prev_long, close, 2 / (self.long_period + 1))
+        prev_short, prev_long = np.r_[prev_short, short_ema[:-1]], np.r_[prev_long, long_ema[:-1]]
+        new_values = {
+            self.short_ema_col: short_ema, self.long_ema_col: long_ema,
+            self.short_ema_slope_col: ewm_continue(self._carried(state, self.short_ema_slope_col, n)[-1], short_ema - prev_short, 2 / (smoothing_period + 1)),
+            self.long_ema_slope_col: ewm_continue(self._carried(state, self.long_ema_slope_col, n)[-1], long_ema - prev_long, 2 / (smoothing_period + 1)),
+            self.signal_col: np.where((prev_short <= prev_long) & (short_ema > long_ema), 1, np.where((prev_short >= prev_long) & (short_ema < long_ema), -1, 0)),
+        }
+        if self.use_volume_filter:
+            volume = self.df['volume'].iloc[-(n + 3 + self.rvol_period - 1):]
+            rvol = (volume / volume.rolling(window=self.rvol_period).mean().replace(0, np.nan)).replace([np.inf, -np.inf], np.nan)
+            new_values[self.rvol_col] = rvol.ffill(limit=3).to_numpy()[-n:]
+        self._write_incremental(state, new_values)
+        self._carry = {}
         return self
 
     def analyze(self) -> Dict[str, Any]:
@@ -3,9 +3,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, ewm_continue, at_checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +19,7 @@ class FastMAIndicator(BaseIndicator):
     of robustness, flexibility, and analytical depth for this indicator.
     """
     dependencies: list = []
+    incremental = True
 
     def __init__(self, df: pd.DataFrame, **kwargs):
         super().__init__(df, **kwargs)
@@ -40,6 +41,10 @@ class FastMAIndicator(BaseIndicator):
         self.slope_col = f'{self.ma_col}_slope'
         self.accel_col = f'{self.ma_col}_accel'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return 2 * int(params.get('period', 200)) + 2 * int(params.get('slope_smoothing_period', 3))
+
     def calculate(self) -> 'FastMAIndicator':
         if len(self.df) < self.period * 2:
             logger.warning(f"Not enough data for {self.ma_type} on {self.timeframe or 'base'}.")
@@ -64,6 +69,27 @@ class FastMAIndicator(BaseIndicator):
         self.df[self.slope_col] = slope_series
         self.df[self.accel_col] = slope_series.diff().ewm(span=self.slope_smoothing_period, adjust=False).mean()
         
+
+        self._carry = {'ema1': float(ema1.iloc[-2]), 'ema2': float(ema2.iloc[-2]), 'ema3': float(ema3.iloc[-2]) if self.ma_type == 'TEMA' else None}
+        return self
+
+    def output_columns(self) -> List[str]:
+        return [self.ma_col, self.slope_col, self.accel_col]
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'FastMAIndicator':
+        n, alpha, carry = len(new_rows), 2 / (self.period + 1), state['carry']
+        smoothing_alpha = 2 / (self.slope_smoothing_period + 1)
+        ema1 = ewm_continue(carry['ema1'], new_rows['close'].to_numpy(dtype=float), alpha)
+        ema2 = ewm_continue(carry['ema2'], ema1, alpha)
+        if self.ma_type == 'DEMA':
+            ema3, ma = None, 2 * ema1 - ema2
+        else: # TEMA
+            ema3 = ewm_continue(carry['ema3'], ema2, alpha); ma = 3 * ema1 - 3 * ema2 + ema3
+        prev_slope = self._carried(state, self.slope_col, n)[-1]
+        slope = ewm_continue(prev_slope, np.diff(np.r_[self._carried(state, self.ma_col, n)[-1], ma]), smoothing_alpha)
+        accel = ewm_continue(self._carried(state, self.accel_col, n)[-1], np.diff(np.r_[prev_slope, slope]), smoothing_alpha)
+        self._write_incremental(state, {self.ma_col: ma, self.slope_col: slope, self.accel_col: accel})
+        self._carry = {'ema1': at_checkpoint(carry['ema1'], ema1), 'ema2': at_checkpoint(carry['ema2'], ema2), 'ema3': at_checkpoint(carry['ema3'], ema3) if ema3 is not None else None}
         return self
 
     def analyze(self) -> Dict[str, Any]:
@@ -61,7 +61,7 @@ class FibonacciIndicator(BaseIndicator):
             return {"status": "Calculation Incomplete - ZigZag dependency missing"}
 
         # Use the already-analyzed data from the ZigZag instance
-        zigzag_analysis = self.zigzag_instance.analyze()
+        zigzag_analysis = self.zigzag_instance.cached_analysis()
         zigzag_values = zigzag_analysis.get('values', {})
 
         # Rely on ZigZag v8.0+'s confirmed pivot logic
@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from .base import BaseIndicator
 
@@ -40,6 +40,11 @@ class IchimokuIndicator(BaseIndicator):
         self.senkou_a_col = f'ichi_senkou_a{suffix}'
         self.senkou_b_col = f'ichi_senkou_b{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        # Senkou B is a senkou_b_period window shifted forward by kijun_period.
+        return int(params.get('senkou_b_period', 52)) + int(params.get('kijun_period', 26)) + 1
+
     def calculate(self) -> 'IchimokuIndicator':
         # --- This function remains unchanged ---
         if len(self.df) < self.senkou_b_period:
@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, ewm_rows, rolling_rank_pct_rows, nan_where_zero, stack_columns
 from .utils import get_indicator_config_key
 
 logger = logging.getLogger(__name__)
@@ -20,6 +20,7 @@ class KeltnerChannelIndicator(BaseIndicator):
     that true breakouts and breakdowns are accurately detected and reported.
     """
     # dependencies: list = ['atr'] # This attribute is obsolete in the new architecture
+    batched = True
     
     default_config: Dict[str, Any] = {
         'ema_period': 20,
@@ -52,6 +53,11 @@ class KeltnerChannelIndicator(BaseIndicator):
         self.bandwidth_col = f'KC_BW{suffix}'
         self.bw_percentile_col = f'KC_BW_PCT{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        cfg = {**cls.default_config, **params}
+        return int(cfg['ema_period']) + int(cfg['volatility_period'])
+
     def calculate(self) -> 'KeltnerChannelIndicator':
         my_deps_config = self.params.get("dependencies", self.default_config['dependencies'])
         atr_order_params = my_deps_config.get('atr')
@@ -69,7 +75,7 @@ class KeltnerChannelIndicator(BaseIndicator):
              logger.warning(f"[{self.__class__.__name__}] on {self.timeframe}: could not find ATR column '{atr_col_name}'.")
              return self
         
-        df_for_calc = self.df.join(atr_instance.df[[atr_col_name]], how='left')
+        df_for_calc = self.df.assign(**{atr_col_name: self.dependency_column(atr_instance, atr_col_name)})
         atr_period = int(atr_instance.params.get('period', 10))
 
         if len(df_for_calc) < max(self.ema_period, atr_period, self.volatility_period):
@@ -91,6 +97,33 @@ class KeltnerChannelIndicator(BaseIndicator):
         
         return self
 
+    def _atr_source(self) -> Optional[BaseIndicator]:
+        """ The injected ATR instance when it is usable, else None (calculate() logs why). """
+        atr_order_params = self.params.get("dependencies", self.default_config['dependencies']).get('atr')
+        atr_instance = self.dependencies.get(get_indicator_config_key('atr', atr_order_params))
+        if not isinstance(atr_instance, BaseIndicator) or getattr(atr_instance, 'atr_col', None) not in atr_instance.df.columns: return None
+        return atr_instance
+
+    @classmethod
+    def calculate_batch(cls, instances: List['KeltnerChannelIndicator']) -> List['KeltnerChannelIndicator']:
+        first = instances[0]
+        sources = [instance._atr_source() for instance in instances]
+        if any(source is None for source in sources) or len(first.df) < max(first.ema_period, int(sources[0].params.get('period', 10)), first.volatility_period):
+            return super().calculate_batch(instances)
+        high, low, close = (stack_columns(instances, c) for c in ('high', 'low', 'close'))
+        atr_value = np.vstack([instance.dependency_column(source, source.atr_col).to_numpy(dtype=float) for instance, source in zip(instances, sources)]) * first.atr_multiplier
+        middle_band = ewm_rows((high + low + close) / 3, 2 / (first.ema_period + 1))
+        upper, lower = middle_band + atr_value, middle_band - atr_value
+        bandwidth = (upper - lower) / nan_where_zero(middle_band) * 100
+        bw_percentile = rolling_rank_pct_rows(bandwidth, first.volatility_period, int(first.volatility_period / 2)) * 100
+        for row, instance in enumerate(instances):
+            instance.df[instance.upper_col] = upper[row]
+            instance.df[instance.lower_col] = lower[row]
+            instance.df[instance.middle_col] = middle_band[row]
+            instance.df[instance.bandwidth_col] = bandwidth[row]
+            instance.df[instance.bw_percentile_col] = bw_percentile[row]
+        return instances
+
     def analyze(self) -> Dict[str, Any]:
         required_cols = [self.upper_col, self.lower_col, self.middle_col, self.bandwidth_col, self.bw_percentile_col, 'high', 'low']
         empty_analysis = {"values": {}, "analysis": {}}
@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, ewm_continue, at_checkpoint, ewm_rows, rolling_rows, ffill_rows, bfill_rows, nan_where_zero, stack_columns
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +19,8 @@ class MacdIndicator(BaseIndicator):
     White_Down), providing maximum clarity for advanced strategies.
     """
     dependencies: list = []
+    incremental = True
+    batched = True
 
     def __init__(self, df: pd.DataFrame, **kwargs):
         super().__init__(df, **kwargs)
@@ -40,6 +42,10 @@ class MacdIndicator(BaseIndicator):
         self.hist_col = f'macd_hist{suffix}'
         self.hist_norm_col = f'macd_hist_norm{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return int(params.get('slow_period', 26)) + int(params.get('signal_period', 9))
+
     def calculate(self) -> 'MacdIndicator':
         # --- This function remains unchanged ---
         if len(self.df) < self.slow_period + self.signal_period:
@@ -62,6 +68,43 @@ class MacdIndicator(BaseIndicator):
         self.df[self.hist_col] = hist_series.ffill(limit=fill_limit).bfill(limit=2)
         self.df[self.hist_norm_col] = hist_norm_series.ffill(limit=fill_limit).bfill(limit=2)
 
+        if len(self.df) >= 2: self._carry = {'fast': float(ema_fast.iloc[-2]), 'slow': float(ema_slow.iloc[-2])}
+        return self
+
+    @classmethod
+    def calculate_batch(cls, instances: List['MacdIndicator']) -> List['MacdIndicator']:
+        first = instances[0]
+        if len(first.df) < first.slow_period + first.signal_period: return super().calculate_batch(instances)
+        close = stack_columns(instances, 'close')
+        ema_fast = ewm_rows(close, 2 / (first.fast_period + 1))
+        ema_slow = ewm_rows(close, 2 / (first.slow_period + 1))
+        macd = ema_fast - ema_slow
+        signal = ewm_rows(macd, 2 / (first.signal_period + 1))
+        hist = macd - signal
+        hist_norm = hist / nan_where_zero(rolling_rows(close, first.slow_period, 'std', ddof=1))
+        columns = {'macd_col': macd, 'signal_col': signal, 'hist_col': hist, 'hist_norm_col': hist_norm}
+        columns = {attr: bfill_rows(ffill_rows(values, 3), 2) for attr, values in columns.items()}
+        for row, instance in enumerate(instances):
+            for attr, values in columns.items(): instance.df[getattr(instance, attr)] = values[row]
+            instance._carry = {'fast': float(ema_fast[row, -2]), 'slow': float(ema_slow[row, -2])}
+        return instances
+
+    def output_columns(self) -> List[str]:
+        return [self.macd_col, self.signal_col, self.hist_col, self.hist_norm_col]
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'MacdIndicator':
+        n = len(new_rows); close = new_rows['close'].to_numpy(dtype=float)
+        ema_fast = ewm_continue(state['carry']['fast'], close, 2 / (self.fast_period + 1))
+        ema_slow = ewm_continue(state['carry']['slow'], close, 2 / (self.slow_period + 1))
+        macd = ema_fast - ema_slow
+        signal = ewm_continue(self._carried(state, self.signal_col, n)[-1], macd, 2 / (self.signal_period + 1))
+        hist = macd - signal
+        # The normalised histogram is re-derived over a few carried rows too, so its limited ffill sees the same gaps.
+        fill_limit = 3; hist_tail = np.r_[self._carried(state, self.hist_col, n)[-fill_limit:], hist]
+        close_std = self.df['close'].iloc[-(len(hist_tail) + self.slow_period - 1):].rolling(window=self.slow_period).std().replace(0, np.nan).to_numpy()[-len(hist_tail):]
+        hist_norm = pd.Series(hist_tail / close_std).ffill(limit=fill_limit).to_numpy()[-n:]
+        self._write_incremental(state, {self.macd_col: macd, self.signal_col: signal, self.hist_col: hist, self.hist_norm_col: hist_norm})
+        self._carry = {'fast': at_checkpoint(state['carry']['fast'], ema_fast), 'slow': at_checkpoint(state['carry']['slow'], ema_slow)}
         return self
 
     def analyze(self) -> Dict[str, Any]:
@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from .base import BaseIndicator
 
@@ -36,6 +36,10 @@ class MfiIndicator(BaseIndicator):
         self.mfi_col = f'mfi{suffix}'
         self.vol_ma_col = f'mfi_vol_ma{suffix}' # For context analysis
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return int(params.get('period', 14)) + 1
+
     def calculate(self) -> 'MfiIndicator':
         if len(self.df) < self.period:
             logger.warning(f"Not enough data for MFI on {self.timeframe or 'base'}.")
@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, ewm_continue
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,7 @@ class ObvIndicator(BaseIndicator):
     naming, data filling, and a Sentinel-compliant output.
     """
     dependencies: list = []
+    incremental = True
 
     def __init__(self, df: pd.DataFrame, **kwargs):
         super().__init__(df, **kwargs)
@@ -40,6 +41,10 @@ class ObvIndicator(BaseIndicator):
         self.price_ma_col = f'price_ma{suffix}'
         self.obv_roc_col = f'obv_roc{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return max(int(params.get('signal_period', 20)), int(params.get('rvol_period', 20)), int(params.get('price_ma_period', 20))) + int(params.get('roc_period', 5)) + 1
+
     def calculate(self) -> 'ObvIndicator':
         if len(self.df) < max(self.signal_period, self.rvol_period, self.price_ma_period):
             logger.warning(f"Not enough data for OBV on {self.timeframe or 'base'}.")
@@ -69,6 +74,35 @@ class ObvIndicator(BaseIndicator):
         self.df[self.price_ma_col] = price_ma_series.ffill(limit=fill_limit).bfill(limit=2)
         self.df[self.obv_roc_col] = obv_roc_series.ffill(limit=fill_limit).bfill(limit=2)
 
+
+        self._carry = {}
+        return self
+
+    def output_columns(self) -> List[str]:
+        return [self.obv_col, self.obv_signal_col, self.rvol_col, self.price_ma_col, self.obv_roc_col]
+
+    def _rvol_tail(self, n: int, fill_limit: int) -> np.ndarray:
+        """RVOL for the last n rows, re-derived over enough rows for the rolling mean and the limited ffill."""
+        volume = self.df['volume'].iloc[-(n + fill_limit + self.rvol_period - 1):]
+        rvol = (volume / volume.rolling(window=self.rvol_period).mean().replace(0, np.nan)).replace([np.inf, -np.inf], np.nan)
+        return rvol.ffill(limit=fill_limit).to_numpy()[-n:]
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'ObvIndicator':
+        n, fill_limit = len(new_rows), 3
+        close, volume = self.df['close'].to_numpy(dtype=float)[-n - 1:], new_rows['volume'].to_numpy(dtype=float)
+        carried_obv = self._carried(state, self.obv_col, n)
+        obv = carried_obv[-1] + np.cumsum(np.where(close[1:] > close[:-1], volume, np.where(close[1:] < close[:-1], -volume, 0)))
+        history = np.r_[carried_obv[-(fill_limit + self.roc_period):], obv]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roc = (history[self.roc_period:] / history[:-self.roc_period] - 1) * 100
+        self._write_incremental(state, {
+            self.obv_col: obv,
+            self.obv_signal_col: ewm_continue(self._carried(state, self.obv_signal_col, n)[-1], obv, 2 / (self.signal_period + 1)),
+            self.rvol_col: self._rvol_tail(n, fill_limit),
+            self.price_ma_col: ewm_continue(self._carried(state, self.price_ma_col, n)[-1], close[1:], 2 / (self.price_ma_period + 1)),
+            self.obv_roc_col: pd.Series(roc).ffill(limit=fill_limit).to_numpy()[-n:],
+        })
+        self._carry = {}
         return self
 
     def analyze(self) -> Dict[str, Any]:
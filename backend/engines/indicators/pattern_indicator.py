@@ -4,7 +4,7 @@ import pandas as pd
 import numpy as np
 import logging
 import warnings
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 try:
     import pandas_ta as ta
@@ -86,6 +86,11 @@ class PatternIndicator(BaseIndicator):
         res[self.patterns_col] = patterns_df.apply(process_row, axis=1)
         return res
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        # The longest candlestick patterns compare against a 10-candle body/shadow average.
+        return 12
+
     def calculate(self) -> 'PatternIndicator':
         df_for_calc = self.df
         
@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, candles_per_period
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +34,11 @@ class PivotPointIndicator(BaseIndicator):
         
         self.pivot_columns: List[str] = []
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        # Needs the previous reset period complete plus the current (partial) one.
+        return 2 * candles_per_period(params.get('reset_period', '1D'), timeframe)
+
     def calculate(self) -> 'PivotPointIndicator':
         # ... [This method is unchanged and correct] ...
         if len(self.df) < 2:
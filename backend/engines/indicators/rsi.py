@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, ewm_continue, ewm_adjusted_carry, ewm_adjusted_continue, ewm_rows, nan_where_zero, stack_columns
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +19,8 @@ class RsiIndicator(BaseIndicator):
     advanced strategies in the AiSignalPro ecosystem.
     """
     dependencies: list = []
+    incremental = True
+    batched = True
 
     def __init__(self, df: pd.DataFrame, params: Dict[str, Any], **kwargs):
         super().__init__(df, params=params, **kwargs)
@@ -27,6 +29,11 @@ class RsiIndicator(BaseIndicator):
         self.rsi_col = f'RSI_{self.period}'
         self.signal_col = f'RSI_signal_{self.period}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        # The RSI signal line is a 9-span EMA of the RSI.
+        return int(params.get('period', 14)) + 9 + 1
+
     def calculate(self) -> 'RsiIndicator':
         """
         Calculates the RSI value using the standard Wilder's smoothing method.
@@ -49,6 +56,46 @@ class RsiIndicator(BaseIndicator):
         self.df[self.rsi_col] = rsi
         self.df[self.signal_col] = rsi.ewm(span=9, adjust=False).mean()
 
+        if len(self.df) > self.period and not np.isnan(avg_gain.iloc[-2]):
+            position, alpha = len(self.df) - 2, 1 / self.period
+            self._carry = {'gain': ewm_adjusted_carry(avg_gain.iloc[-2], position, alpha), 'loss': ewm_adjusted_carry(avg_loss.iloc[-2], position, alpha)}
+        return self
+
+    @classmethod
+    def calculate_batch(cls, instances: List['RsiIndicator']) -> List['RsiIndicator']:
+        """ calculate() for several symbols at once, on (symbols x candles) matrices. """
+        first = instances[0]
+        if len(first.df) < first.period: return super().calculate_batch(instances)
+        delta = np.diff(stack_columns(instances, 'close'), axis=1, prepend=np.nan)
+        alpha = 1 / first.period
+        avg_gain = ewm_rows(np.where(delta > 0, delta, 0.0), alpha, adjust=True, min_periods=first.period)
+        avg_loss = ewm_rows(np.where(delta < 0, -delta, 0.0), alpha, adjust=True, min_periods=first.period)
+        rsi = 100 - (100 / (1 + avg_gain / nan_where_zero(avg_loss, 1e-9)))
+        signal = ewm_rows(rsi, 2 / (9 + 1))
+        position = len(first.df) - 2
+        for row, instance in enumerate(instances):
+            instance.df[instance.rsi_col] = rsi[row]
+            instance.df[instance.signal_col] = signal[row]
+            if len(instance.df) > instance.period and not np.isnan(avg_gain[row, -2]):
+                instance._carry = {'gain': ewm_adjusted_carry(avg_gain[row, -2], position, alpha), 'loss': ewm_adjusted_carry(avg_loss[row, -2], position, alpha)}
+        return instances
+
+    def output_columns(self) -> List[str]:
+        return [self.rsi_col, self.signal_col]
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'RsiIndicator':
+        n, alpha = len(new_rows), 1 / self.period
+        delta = np.diff(self.df['close'].to_numpy(dtype=float)[-n - 1:])
+        gain, loss = np.where(delta > 0, delta, 0.0), np.where(delta < 0, -delta, 0.0)
+        # Continue up to the new checkpoint first, so its carry can be kept, then the forming candle.
+        gain_head, gain_carry = ewm_adjusted_continue(state['carry']['gain'], gain[:-1], alpha, self.period)
+        loss_head, loss_carry = ewm_adjusted_continue(state['carry']['loss'], loss[:-1], alpha, self.period)
+        avg_gain = np.r_[gain_head, ewm_adjusted_continue(gain_carry, gain[-1:], alpha, self.period)[0]]
+        avg_loss = np.r_[loss_head, ewm_adjusted_continue(loss_carry, loss[-1:], alpha, self.period)[0]]
+        rsi = 100 - (100 / (1 + avg_gain / np.where(avg_loss == 0, 1e-9, avg_loss)))
+        signal = ewm_continue(self._carried(state, self.signal_col, n)[-1], rsi, 2 / (9 + 1))
+        self._write_incremental(state, {self.rsi_col: rsi, self.signal_col: signal})
+        self._carry = {'gain': gain_carry, 'loss': loss_carry}
         return self
 
     def analyze(self) -> Dict[str, Any]:
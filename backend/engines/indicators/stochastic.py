@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, rolling_rows, ffill_rows, bfill_rows, nan_where_zero, stack_columns
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,7 @@ class StochasticIndicator(BaseIndicator):
     architecture for flawless integration and maximum analytical depth.
     """
     dependencies: list = []
+    batched = True
 
     def __init__(self, df: pd.DataFrame, params: Dict[str, Any], **kwargs):
         super().__init__(df, params=params, **kwargs)
@@ -39,6 +40,10 @@ class StochasticIndicator(BaseIndicator):
         self.k_col = f'stoch_k{suffix}'
         self.d_col = f'stoch_d{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return int(params.get('k_period', 14)) + int(params.get('d_period', 3)) + int(params.get('smooth_k', 3))
+
     def calculate(self) -> 'StochasticIndicator':
         if len(self.df) < self.k_period + self.d_period + self.smooth_k:
             logger.warning(f"Not enough data for Stochastic on {self.timeframe or 'base'}.")
@@ -60,6 +65,21 @@ class StochasticIndicator(BaseIndicator):
         self.df[self.k_col] = k_series.ffill(limit=fill_limit).bfill(limit=2)
         self.df[self.d_col] = d_series.ffill(limit=fill_limit).bfill(limit=2)
         return self
+
+    @classmethod
+    def calculate_batch(cls, instances: List['StochasticIndicator']) -> List['StochasticIndicator']:
+        first = instances[0]
+        if len(first.df) < first.k_period + first.d_period + first.smooth_k: return super().calculate_batch(instances)
+        high, low, close = (stack_columns(instances, c) for c in ('high', 'low', 'close'))
+        low_min, high_max = rolling_rows(low, first.k_period, 'min'), rolling_rows(high, first.k_period, 'max')
+        fast_k = 100 * ((close - low_min) / nan_where_zero(high_max - low_min))
+        k_values = rolling_rows(fast_k, first.smooth_k, 'mean')
+        d_values = rolling_rows(k_values, first.d_period, 'mean')
+        k_values, d_values = bfill_rows(ffill_rows(k_values, 3), 2), bfill_rows(ffill_rows(d_values, 3), 2)
+        for row, instance in enumerate(instances):
+            instance.df[instance.k_col] = k_values[row]
+            instance.df[instance.d_col] = d_values[row]
+        return instances
     
     def analyze(self) -> Dict[str, Any]:
         required_cols = [self.k_col, self.d_col]
@@ -65,7 +65,7 @@ class StructureIndicator(BaseIndicator):
         if not self.zigzag_instance:
             return {"status": "Calculation Incomplete - ZigZag dependency missing", "key_levels": {}, "values": analysis_content, "analysis": analysis_content}
 
-        zigzag_analysis = self.zigzag_instance.analyze()
+        zigzag_analysis = self.zigzag_instance.cached_analysis()
         if zigzag_analysis.get('status') != 'OK':
             return {"status": f"Awaiting Pivots from ZigZag ({zigzag_analysis.get('status')})", "key_levels": {}, "values": analysis_content, "analysis": analysis_content}
         
@@ -74,7 +74,7 @@ class StructureIndicator(BaseIndicator):
         except IndexError:
             return {"status": "Insufficient Data for Current Price", "key_levels": {}, "values": analysis_content, "analysis": analysis_content}
 
-        pivots_df = self.zigzag_instance.df[self.zigzag_instance.df[self.zigzag_instance.pivots_col] != 0]
+        pivots_df = self.zigzag_instance.pivot_rows()
         
         all_supports_raw = pivots_df[pivots_df[self.zigzag_instance.pivots_col] == -1][self.zigzag_instance.prices_col].tolist()
         all_resistances_raw = pivots_df[pivots_df[self.zigzag_instance.pivots_col] == 1][self.zigzag_instance.prices_col].tolist()
@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple, Optional
 
 from .base import BaseIndicator
 from .utils import get_indicator_config_key
@@ -19,6 +19,7 @@ class SuperTrendIndicator(BaseIndicator):
     'analyze' method and eliminating all "ATR column not found" warnings.
     """
     dependencies: list = ['atr']
+    incremental = True
 
     def __init__(self, df: pd.DataFrame, params: Dict[str, Any], **kwargs):
         super().__init__(df, params=params, **kwargs)
@@ -34,7 +35,12 @@ class SuperTrendIndicator(BaseIndicator):
         self.atr_instance: BaseIndicator | None = None
         self.atr_col_name: str | None = None
 
-    def _calculate_supertrend(self, df: pd.DataFrame, multiplier: float, atr_col: str) -> Tuple[pd.Series, pd.Series]:
+    def _calculate_supertrend(self, df: pd.DataFrame, multiplier: float, atr_col: str, seed: Optional[Dict[str, Any]] = None) -> Tuple[pd.Series, pd.Series]:
+        """
+        Runs the band recursion over `df`. With a `seed` (the carried state of the
+        row before df's first row, passed as df's first row), the first row keeps
+        the carried supertrend, direction and final bands instead of fresh ones.
+        """
         high, low, close, atr = df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), df[atr_col].to_numpy()
         with np.errstate(invalid='ignore'):
             hl2 = (high + low) / 2
@@ -42,6 +48,9 @@ class SuperTrendIndicator(BaseIndicator):
             final_lower_band = hl2 - (multiplier * atr)
         
         supertrend = np.full(len(df), np.nan); direction = np.full(len(df), 1)
+        if seed is not None:
+            supertrend[0], direction[0] = seed['supertrend'], seed['direction']
+            final_upper_band[0], final_lower_band[0] = seed['upper'], seed['lower']
         
         for i in range(1, len(df)):
             prev_close = close[i-1]
@@ -59,29 +68,39 @@ class SuperTrendIndicator(BaseIndicator):
             else: direction[i] = direction[i-1]
             
             supertrend[i] = final_lower_band[i] if direction[i] == 1 else final_upper_band[i]
-            
+        
+        if len(df) >= 2: self._carry = {'upper': float(final_upper_band[-2]), 'lower': float(final_lower_band[-2])}
         return pd.Series(supertrend, index=df.index), pd.Series(direction, index=df.index)
 
-    def calculate(self) -> 'SuperTrendIndicator':
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        # analyze() measures the band slope over its last 5 values.
+        return int(params.get('period', 10)) + 5 + 1
+
+    def _join_atr(self) -> bool:
         my_deps_config = self.params.get("dependencies", {})
         atr_order_params = my_deps_config.get('atr')
         if not atr_order_params:
-            logger.error(f"[{self.__class__.__name__}] on {self.timeframe}: 'atr' dependency not defined."); return self
+            logger.error(f"[{self.__class__.__name__}] on {self.timeframe}: 'atr' dependency not defined."); return False
         
         atr_unique_key = get_indicator_config_key('atr', atr_order_params)
         self.atr_instance = self.dependencies.get(atr_unique_key)
         
         if not isinstance(self.atr_instance, BaseIndicator) or not hasattr(self.atr_instance, 'atr_col'):
             logger.warning(f"[{self.__class__.__name__}] on {self.timeframe}: missing or invalid ATR dependency '{atr_unique_key}'.")
-            return self
+            return False
         
         self.atr_col_name = self.atr_instance.atr_col
         if self.atr_col_name not in self.atr_instance.df.columns:
              logger.warning(f"[{self.__class__.__name__}] on {self.timeframe}: could not find ATR column '{self.atr_col_name}'.")
-             return self
+             return False
         
-        # ✅ DATA INTEGRITY PATCH (v7.4): Join ATR to the main instance dataframe.
-        self.df = self.df.join(self.atr_instance.df[[self.atr_col_name]], how='left')
+        # ✅ DATA INTEGRITY PATCH (v7.4): Attach ATR to the main instance dataframe (by reference, no join).
+        self.df[self.atr_col_name] = self.dependency_column(self.atr_instance, self.atr_col_name)
+        return True
+
+    def calculate(self) -> 'SuperTrendIndicator':
+        if not self._join_atr(): return self
         
         df_for_calc = self.df.dropna(subset=[self.atr_col_name])
         if len(df_for_calc) < self.period + 1:
@@ -96,6 +115,19 @@ class SuperTrendIndicator(BaseIndicator):
         fill_limit = 3
         self.df[self.supertrend_col] = self.df[self.supertrend_col].ffill(limit=fill_limit)
         self.df[self.direction_col] = self.df[self.direction_col].ffill(limit=fill_limit)
+        # Bands are carried only when the recursion covered every row (no ATR gaps were dropped).
+        if len(df_for_calc) != len(self.df): self._carry = None
+        return self
+
+    def output_columns(self) -> List[str]:
+        return [self.supertrend_col, self.direction_col]
+
+    def update(self, new_rows: pd.DataFrame, state: Dict[str, Any]) -> 'SuperTrendIndicator':
+        if not self._join_atr(): return self
+        n = len(new_rows); window = self.df.iloc[-n - 1:]
+        seed = {**state['carry'], 'supertrend': self._carried(state, self.supertrend_col, n)[-1], 'direction': self._carried(state, self.direction_col, n)[-1]}
+        st_series, dir_series = self._calculate_supertrend(window, self.multiplier, self.atr_col_name, seed=seed)
+        self._write_incremental(state, {self.supertrend_col: st_series.to_numpy()[1:], self.direction_col: dir_series.to_numpy()[1:]})
         return self
 
     def analyze(self) -> Dict[str, Any]:
@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from .base import BaseIndicator
 
@@ -51,6 +51,11 @@ class VolumeIndicator(BaseIndicator):
         self.z_score_col = f'vol_zscore{suffix}'
         self.volume_percentile_col = f'vol_pct{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        cfg = {**cls.default_config, **params}
+        return max(int(cfg['long_period']), int(cfg['regime_period']), int(cfg['period'])) + int(cfg['series_lookback'])
+
     def calculate(self) -> 'VolumeIndicator':
         if 'volume' not in self.df.columns or len(self.df) < max(self.long_period, self.regime_period):
             logger.warning(f"Not enough data or missing 'volume' column for VolumeIndicator on timeframe {self.timeframe or 'base'}.")
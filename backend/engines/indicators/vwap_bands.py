@@ -1,9 +1,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, candles_per_period
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +37,11 @@ class VwapBandsIndicator(BaseIndicator):
         self.zscore_col = f'vwap_zscore{suffix}'
         self.bandwidth_col = f'vwap_bw{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        # Anchored VWAP: one full reset period of candles.
+        return candles_per_period(str(params.get('reset_period', 'D')), timeframe)
+
     def calculate(self) -> 'VwapBandsIndicator':
         """
         ✨ FINAL ARCHITECTURE: This indicator's logic is fundamentally different
@@ -36,6 +36,10 @@ class WhaleIndicator(BaseIndicator):
         self.atr_instance: Optional[BaseIndicator] = None
         self.atr_col_name: Optional[str] = None
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return int(params.get('period', 20)) + 1
+
     def calculate(self) -> 'WhaleIndicator':
         my_deps_config = self.params.get("dependencies", {})
         atr_order_params = my_deps_config.get('atr')
@@ -45,7 +49,7 @@ class WhaleIndicator(BaseIndicator):
             if self.atr_instance and hasattr(self.atr_instance, 'atr_col'):
                 self.atr_col_name = self.atr_instance.atr_col
                 if self.atr_col_name in self.atr_instance.df.columns:
-                    self.df = self.df.join(self.atr_instance.df[[self.atr_col_name]], how='left')
+                    self.df[self.atr_col_name] = self.dependency_column(self.atr_instance, self.atr_col_name)
 
         if len(self.df) < self.period:
             logger.warning(f"Not enough data for Whale Indicator on {self.timeframe or 'base'}.")
@@ -2,9 +2,9 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-from .base import BaseIndicator
+from .base import BaseIndicator, rolling_rows, ffill_rows, bfill_rows, nan_where_zero, stack_columns
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,7 @@ class WilliamsRIndicator(BaseIndicator):
     it a flawless component for the AiSignalPro ecosystem.
     """
     dependencies: list = []
+    batched = True
 
     def __init__(self, df: pd.DataFrame, **kwargs):
         super().__init__(df, **kwargs)
@@ -33,6 +34,10 @@ class WilliamsRIndicator(BaseIndicator):
         else: suffix += '_base'
         self.wr_col = f'wr{suffix}'
 
+    @classmethod
+    def required_lookback(cls, params: Dict[str, Any], timeframe: Optional[str] = None) -> int:
+        return int(params.get('period', 14)) + 1
+
     def calculate(self) -> 'WilliamsRIndicator':
         if len(self.df) < self.period:
             logger.warning(f"Not enough data for Williams %R on {self.timeframe or 'base'}.")
@@ -51,6 +56,17 @@ class WilliamsRIndicator(BaseIndicator):
         self.df[self.wr_col] = wr_series.ffill(limit=3).bfill(limit=2)
         return self
 
+    @classmethod
+    def calculate_batch(cls, instances: List['WilliamsRIndicator']) -> List['WilliamsRIndicator']:
+        first = instances[0]
+        if len(first.df) < first.period: return super().calculate_batch(instances)
+        highest_high = rolling_rows(stack_columns(instances, 'high'), first.period, 'max')
+        lowest_low = rolling_rows(stack_columns(instances, 'low'), first.period, 'min')
+        wr_values = (highest_high - stack_columns(instances, 'close')) / nan_where_zero(highest_high - lowest_low) * -100
+        wr_values = bfill_rows(ffill_rows(wr_values, 3), 2)
+        for row, instance in enumerate(instances): instance.df[instance.wr_col] = wr_values[row]
+        return instances
+
     def analyze(self) -> Dict[str, Any]:
         empty_analysis = {"values": {}, "analysis": {}}
         if self.wr_col not in self.df.columns or self.df[self.wr_col].isnull().all():
@@ -26,6 +26,7 @@ class ZigzagIndicator(BaseIndicator):
         self.timeframe = self.params.get('timeframe')
         self.pivots_col = 'PIVOTS'
         self.prices_col = 'PRICES'
+        self._pivot_rows: Optional[pd.DataFrame] = None
 
     def _get_pivots(self, df: pd.DataFrame, deviation_threshold: float) -> Tuple[np.ndarray, np.ndarray]:
         # The core pivot detection algorithm is preserved and robust.
@@ -77,8 +78,14 @@ class ZigzagIndicator(BaseIndicator):
             return self
         pivots, prices = self._get_pivots(self.df, self.deviation)
         self.df[self.pivots_col] = pivots; self.df[self.prices_col] = prices
+        self._pivot_rows = None
         return self
 
+    def pivot_rows(self) -> pd.DataFrame:
+        """The rows holding a pivot (peaks and troughs), filtered once and shared with consumers like Structure."""
+        if self._pivot_rows is None: self._pivot_rows = self.df[self.df[self.pivots_col] != 0]
+        return self._pivot_rows
+
     def _format_pivot_data(self, pivot_series: pd.Series) -> Dict:
         """Helper to format a pivot point into a clean dictionary."""
         pivot_type = 'peak' if pivot_series[self.pivots_col] == 1 else 'trough'
@@ -89,7 +96,7 @@ class ZigzagIndicator(BaseIndicator):
         }
 
     def analyze(self) -> dict:
-        pivots_df = self.df[self.df[self.pivots_col] != 0]
+        pivots_df = self.pivot_rows()
         
         # If not even one pivot is found, there is no structure yet.
         if len(pivots_df) < 1:
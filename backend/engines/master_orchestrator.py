@@ -5,19 +5,34 @@ import logging
 import time
 import json
 import inspect
-from typing import Dict, Any, List, Type, Optional, Tuple
+import os
+from typing import Dict, Any, FrozenSet, List, Set, Type, Optional, Tuple
 import asyncio
 from copy import deepcopy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from .indicator_analyzer import IndicatorAnalyzer
+from .indicator_analyzer import IndicatorAnalyzer, indicator_plan_key
+from .analysis_worker import analyze_shared_frame, init_worker, write_shared_frame
 from .gemini_handler import GeminiHandler
 from .strategies import *
+from core.candle_history import CandleHistory
 from core.news_fetcher import NewsFetcher
 from engines.signal_adapter import SignalAdapter
 from .telegram_handler import TelegramHandler
 
 logger = logging.getLogger(__name__)
 
+# Default analysis process count when general.analysis_execution.processes is 0: every worker
+# re-imports pandas, TA-Lib and Django, so stay well below the core count on large hosts.
+DEFAULT_MAX_ANALYSIS_PROCESSES = 4
+
+def available_cpus() -> int:
+    """CPUs this process may run on (its affinity mask, which containers restrict), not the host's core count."""
+    try: return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError): return os.cpu_count() or 1
+
 class MasterOrchestrator:
     """
     The strategic mastermind of AiSignalPro (v36.2 - The Quantum Briefing Upgrade).
@@ -30,9 +45,11 @@ class MasterOrchestrator:
     decision-making, while all other functionalities of the orchestrator remain
     100% preserved.
     """
+    # What the AI mission briefing (and the signal adapter's fallback levels) read besides the strategies.
+    BRIEFING_INDICATORS: Tuple[str, ...] = ('adx', 'macd', 'rsi', 'stochastic', 'bollinger', 'volume', 'structure')
+    BRIEFING_HTF_INDICATORS: Tuple[str, ...] = ('ichimoku', 'supertrend', 'stochastic', 'structure', 'pivots', 'divergence')
 
     def __init__(self, config: Dict[str, Any], telegram_handler: TelegramHandler):
-        # --- This method is 100% UNCHANGED ---
         self.config = config
         self.telegram_handler = telegram_handler
         self._strategy_classes: List[Type[BaseStrategy]] = [
@@ -42,39 +59,218 @@ class MasterOrchestrator:
             EmaCrossoverStrategy, OracleXPro, QuantumChannelSurfer, IchiMACDPro,
         ]
         self.gemini_handler = GeminiHandler()
+        # The config is fixed for the orchestrator's lifetime, so its indicator plan is hashed once.
+        self._plan_key = indicator_plan_key(config.get("indicators", {}), config.get("strategies", {}), self._strategy_classes)
+        # How the indicator analysis runs; the modes are exclusive and the first enabled one wins:
+        #   "batched" (general.batched_indicators): each timeframe's symbols go through one vectorized pass in a worker thread;
+        #   "process" (general.analysis_execution.mode): each analysis runs in a process pool;
+        #   "inline": on the event loop, with independent indicators on general.indicator_threads threads.
+        general = config.get("general", {}); execution = general.get("analysis_execution", {})
+        self.batched = bool(general.get("batched_indicators", False))
+        self.execution_mode = "batched" if self.batched else "process" if execution.get("mode", "inline") == "process" else "inline"
+        if self.batched and execution.get("mode", "inline") == "process":
+            logger.warning("general.batched_indicators overrides analysis_execution.mode 'process'; no analysis process pool is started.")
+        # Independent indicators of one analysis run concurrently on this pool (shared by all pairs); capped at the core count.
+        indicator_threads = min(int(general.get("indicator_threads", 0)), available_cpus()) if self.execution_mode == "inline" else 0
+        self._indicator_executor = ThreadPoolExecutor(max_workers=indicator_threads, thread_name_prefix="indicators") if indicator_threads > 1 else None
+        self._analysis_processes = int(execution.get("processes", 0)) or min(available_cpus(), DEFAULT_MAX_ANALYSIS_PROCESSES)
+        self._analysis_pool: Optional[ProcessPoolExecutor] = self._create_analysis_pool() if self.execution_mode == "process" else None
+        # (fetch/keep candles, minimum rows) per timeframe, derived once from the indicator plan.
+        self._kline_requirements: Dict[str, Tuple[int, int]] = {}
+        # Indicators read from each timeframe's analysis (None = all), derived once; see general.lazy_indicators.
+        self._indicator_demand: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._htf_timeframes: Dict[str, Set[str]] = {}
+        # Carried incremental-indicator state per (symbol, timeframe); see general.incremental_indicators.
+        self._indicator_states: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
         self.news_fetcher = NewsFetcher()
         self.last_gemini_call_times: Dict[Tuple[str, str], float] = {}
         self.ENGINE_VERSION = "36.2.0" # Version updated
         logger.info(f"MasterOrchestrator v{self.ENGINE_VERSION} (Quantum Briefing Upgrade) initialized.")
 
+    def _create_analysis_pool(self) -> ProcessPoolExecutor:
+        logger.info(f"Indicator analysis runs in a pool of {self._analysis_processes} worker process(es).")
+        # 'spawn' keeps the children clear of the parent's event loop and threads.
+        return ProcessPoolExecutor(max_workers=self._analysis_processes, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=init_worker, initargs=(self.config, self._strategy_classes, logging.getLogger().getEffectiveLevel()))
+
+    async def _analyze_in_pool(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """Runs the indicator analysis of `df` in the process pool; only the summary crosses back."""
+        shm = write_shared_frame(df); pool = self._analysis_pool
+        try:
+            summary = await asyncio.get_running_loop().run_in_executor(pool, analyze_shared_frame, shm.name, len(df), symbol, timeframe, self.indicator_demand(timeframe))
+        except BrokenProcessPool:
+            # Every analysis in flight on the broken pool lands here; only the first one replaces it.
+            if self._analysis_pool is pool:
+                logger.error(f"Analysis process pool broke while analyzing {symbol}@{timeframe}. Restarting it.")
+                pool.shutdown(wait=False, cancel_futures=True); self._analysis_pool = self._create_analysis_pool()
+            return None
+        finally:
+            shm.close(); shm.unlink()
+        rows = summary.pop("_final_rows", 0) if summary else 0
+        if rows: summary["final_df"] = df.tail(rows)
+        return summary
+
+    def close(self):
+        """Shuts down the analysis process pool and the indicator thread pool."""
+        if self._analysis_pool is not None: self._analysis_pool.shutdown(cancel_futures=True); self._analysis_pool = None
+        if self._indicator_executor is not None: self._indicator_executor.shutdown(cancel_futures=True); self._indicator_executor = None
+
+    def indicator_demand(self, timeframe: str) -> Optional[FrozenSet[str]]:
+        """
+        The indicators anything reads from a `timeframe` analysis, or None (calculate all)
+        when `general.lazy_indicators` is off or an enabled strategy declares no requirements.
+        That is every enabled strategy's primary demand, its HTF demand when `timeframe`
+        is its HTF for one of the analyzed timeframes, and what the AI briefing reads.
+        """
+        if timeframe in self._indicator_demand: return self._indicator_demand[timeframe]
+        general = self.config.get("general", {}); strategies_config = self.config.get("strategies", {})
+        demand: Optional[set] = set(self.BRIEFING_INDICATORS) if general.get("lazy_indicators", False) else None
+        timeframes = general.get("timeframes_to_analyze", [])
+        is_htf_of = lambda htf_map: any(htf_map.get(tf) == timeframe != tf for tf in timeframes)
+        for sc in self._strategy_classes if demand is not None else ():
+            strategy_config = strategies_config.get(sc.strategy_name, {})
+            if not strategy_config.get("enabled", True): continue
+            primary, htf = sc.indicator_demand(strategy_config)
+            if primary is None:
+                logger.info(f"Strategy '{sc.strategy_name}' declares no indicator requirements; calculating every indicator on {timeframe}."); demand = None; break
+            demand |= primary
+            # The same merge run_strategy_pipeline uses to decide whether the strategy gets an HTF analysis.
+            merged_strat_config = {**getattr(sc, "default_config", {}), **strategy_config}
+            if merged_strat_config.get("htf_confirmation_enabled") and is_htf_of(merged_strat_config.get("htf_map", {})): demand |= htf
+            if is_htf_of(strategy_config.get("htf_map", {})): demand.update(self.BRIEFING_HTF_INDICATORS)
+        self._indicator_demand[timeframe] = frozenset(demand) if demand is not None else None
+        return self._indicator_demand[timeframe]
+
+    def htf_timeframes(self, timeframe: str) -> Set[str]:
+        """The other timeframes whose analysis run_strategy_pipeline (with the AI briefing) may read for `timeframe`."""
+        if timeframe not in self._htf_timeframes:
+            strategies_config = self.config.get("strategies", {}); htfs = set()
+            for sc in self._strategy_classes:
+                strategy_config = strategies_config.get(sc.strategy_name, {})
+                if not strategy_config.get("enabled", True): continue
+                merged_strat_config = {**getattr(sc, "default_config", {}), **strategy_config}
+                if merged_strat_config.get("htf_confirmation_enabled"): htfs.add(merged_strat_config.get("htf_map", {}).get(timeframe))
+                htfs.add(strategy_config.get("htf_map", {}).get(timeframe))
+            self._htf_timeframes[timeframe] = {tf for tf in htfs if tf and tf != timeframe}
+        return self._htf_timeframes[timeframe]
+
+    def get_kline_requirements(self, timeframe: str) -> Tuple[int, int]:
+        """
+        Returns (candles to fetch and keep, minimum rows for analysis) for a timeframe.
+        With `general.lookback_sizing` enabled both come from the enabled indicators'
+        required lookback (plus a warm-up margin for recursive smoothers); otherwise
+        the fixed `fetcher_limit` / `min_rows_for_analysis` apply.
+        """
+        if timeframe in self._kline_requirements: return self._kline_requirements[timeframe]
+        general = self.config.get("general", {}); sizing = general.get("lookback_sizing", {})
+        limit, min_rows = general.get("fetcher_limit", 500), general.get("min_rows_for_analysis", 300)
+        if sizing.get("enabled", False):
+            min_rows = IndicatorAnalyzer.required_lookback(self.config.get("indicators", {}), self.config.get("strategies", {}), self._strategy_classes, timeframe, self._plan_key, self.indicator_demand(timeframe))
+            limit = min(max(min_rows + int(sizing.get("warmup_candles", 100)), int(sizing.get("min_candles", 150))), int(sizing.get("max_candles", 1500)))
+            min_rows = min(min_rows, limit)
+            logger.info(f"Lookback sizing for {timeframe}: indicators need {min_rows} candles; fetching and keeping {limit}.")
+        self._kline_requirements[timeframe] = (limit, min_rows)
+        return limit, min_rows
+
+    def get_history_sizing(self, timeframe: str) -> Tuple[int, int]:
+        """
+        (rows kept, rows trimmed at once when full) for a pair's candle history. With
+        incremental indicators the history keeps `general.incremental_trim_candles`
+        (default: a quarter of the fetch limit) extra rows and drops them in one step,
+        so its first row, and with it the carried indicator states, survive that many
+        cycles; the trim cycle recalculates in full.
+        """
+        limit = self.get_kline_requirements(timeframe)[0]; general = self.config.get("general", {})
+        if not general.get("incremental_indicators", False): return limit, 1
+        step = max(1, int(general.get("incremental_trim_candles", limit // 4)))
+        return limit + step, step
+
+    def _is_analyzable(self, df: pd.DataFrame, symbol: str, timeframe: str) -> bool:
+        required_cols = ['open', 'high', 'low', 'close', 'volume']
+        missing_cols = [c for c in required_cols if c not in df.columns]
+        if missing_cols:
+            logger.error(f"DataFrame for {symbol}@{timeframe} missing required columns: {missing_cols}. Skipping analysis.")
+            return False
+        if df[required_cols].isnull().values.any():
+            nan_info = df[required_cols].isnull().sum()
+            logger.error(f"CORRUPT DATA DETECTED for {symbol}@{timeframe}. Contains NaN values. NaN counts: {nan_info.to_dict()}")
+            return False
+        return True
+
     async def run_analysis_pipeline(
         self, df: pd.DataFrame, symbol: str, timeframe: str, previous_df: Optional[pd.DataFrame] = None,
+        history: Optional[CandleHistory] = None,
     ) -> Tuple[Optional[Dict[str, Any]], Optional[pd.DataFrame]]:
-        # --- This method is 100% UNCHANGED ---
+        """
+        Runs the indicator analysis for one symbol/timeframe. With a `history` ring
+        buffer the validated candles are merged into it in place and the analysis runs
+        on its bounded window; the legacy `previous_df` path concatenates instead.
+        """
         try:
-            required_cols = ['open', 'high', 'low', 'close', 'volume']
-            missing_cols = [c for c in required_cols if c not in df.columns]
-            if missing_cols:
-                logger.error(f"DataFrame for {symbol}@{timeframe} missing required columns: {missing_cols}. Skipping analysis.")
-                return None, previous_df
-            if df[required_cols].isnull().values.any():
-                nan_info = df[required_cols].isnull().sum()
-                logger.error(f"CORRUPT DATA DETECTED for {symbol}@{timeframe}. Contains NaN values. NaN counts: {nan_info.to_dict()}")
-                return None, previous_df
+            if not self._is_analyzable(df, symbol, timeframe): return None, previous_df
             indicators_config = self.config.get("indicators", {})
             strategies_config = self.config.get("strategies", {})
-            analyzer = IndicatorAnalyzer(df, indicators_config, strategies_config, self._strategy_classes, timeframe, symbol, previous_df)
-            await analyzer.calculate_all()
-            primary_analysis = await analyzer.get_analysis_summary()
-            return primary_analysis, analyzer.final_df
+            if history is not None:
+                history.merge(df); df, previous_df = history.frame(), None
+            if self._analysis_pool is not None:
+                if previous_df is not None and not previous_df.empty:
+                    df = pd.concat([previous_df, df]).sort_index(); df = df[~df.index.duplicated(keep="last")]
+                primary_analysis, state_df = await self._analyze_in_pool(df, symbol, timeframe), df
+            else:
+                incremental = self.config.get("general", {}).get("incremental_indicators", False)
+                # The carried states only match the carried frame they were computed on.
+                indicator_states = self._indicator_states.get((symbol, timeframe)) if incremental and (previous_df is not None or history is not None) else None
+                analyzer = IndicatorAnalyzer(df, indicators_config, strategies_config, self._strategy_classes, timeframe, symbol, previous_df, indicator_states, self._plan_key, self._indicator_executor, self.indicator_demand(timeframe))
+                await analyzer.calculate_all()
+                if incremental: self._indicator_states[(symbol, timeframe)] = analyzer.indicator_states
+                primary_analysis = await analyzer.get_analysis_summary()
+                state_df = analyzer.final_df
+            # Without sizing the carried state grows every cycle; with it, keep only what the plan needs, trimmed in steps like CandleHistory.
+            if state_df is not None and history is None and self.config.get("general", {}).get("lookback_sizing", {}).get("enabled", False):
+                capacity, trim_step = self.get_history_sizing(timeframe)
+                if len(state_df) > capacity: state_df = state_df.iloc[max(len(state_df) - capacity, trim_step):]
+            return primary_analysis, state_df
         except Exception as e:
             logger.error(f"Critical error in ANALYSIS pipeline for {symbol}@{timeframe}: {e}", exc_info=True)
             return None, previous_df
 
+    async def run_batch_analysis_pipeline(self, frames: Dict[str, pd.DataFrame], timeframe: str, histories: Dict[str, CandleHistory]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Runs the indicator analysis for several symbols on one timeframe in one pass
+        (see IndicatorAnalyzer.calculate_batch): each symbol's candles are merged into its
+        history as in run_analysis_pipeline, and symbols whose windows share a candle index
+        go through the batched indicators together. Returns the summary per symbol (None
+        when its candles were rejected or the batch failed). The calculation and the
+        summaries run in one worker thread, off the event loop.
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(frames)
+        try:
+            incremental = self.config.get("general", {}).get("incremental_indicators", False); analyzers: List[IndicatorAnalyzer] = []
+            for symbol, df in frames.items():
+                if not self._is_analyzable(df, symbol, timeframe): continue
+                histories[symbol].merge(df)
+                indicator_states = self._indicator_states.get((symbol, timeframe)) if incremental else None
+                analyzers.append(IndicatorAnalyzer(histories[symbol].frame(), self.config.get("indicators", {}), self.config.get("strategies", {}), self._strategy_classes, timeframe, symbol,
+                                                   None, indicator_states, self._plan_key, None, self.indicator_demand(timeframe)))
+            summaries = await asyncio.to_thread(self._analyze_batch, analyzers)
+            for analyzer, summary in zip(analyzers, summaries):
+                if incremental: self._indicator_states[(analyzer.symbol, timeframe)] = analyzer.indicator_states
+                results[analyzer.symbol] = summary
+        except Exception as e:
+            logger.error(f"Critical error in batched ANALYSIS pipeline for {len(frames)} symbols @{timeframe}: {e}", exc_info=True)
+        return results
+
+    @staticmethod
+    def _analyze_batch(analyzers: List[IndicatorAnalyzer]) -> List[Dict[str, Any]]:
+        """calculate_batch plus every analyzer's summary (each runs all of its indicators' analyze()); blocking."""
+        IndicatorAnalyzer.calculate_batch(analyzers)
+        async def summarize() -> List[Dict[str, Any]]:
+            return [await analyzer.get_analysis_summary() for analyzer in analyzers]
+        return asyncio.run(summarize())
+
     async def run_strategy_pipeline(
         self, primary_analysis: Dict[str, Any], htf_context: Dict[str, Any], symbol: str, timeframe: str,
     ) -> Optional[Dict[str, Any]]:
-        # --- This method is 100% UNCHANGED ---
         if not isinstance(primary_analysis, dict):
             logger.error(f"Primary analysis for {symbol}@{timeframe} is invalid (not a dict). Skipping strategies.")
             return {"status": "NEUTRAL", "message": "Invalid primary analysis package."}
@@ -94,6 +290,7 @@ class MasterOrchestrator:
                         if target_htf in htf_context:
                             temp_htf_analysis = htf_context[target_htf]
                             min_rows = self.config.get("general", {}).get("min_rows_for_htf", 300)
+                            if self.config.get("general", {}).get("lookback_sizing", {}).get("enabled", False): min_rows = min(min_rows, self.get_kline_requirements(target_htf)[1])
                             htf_df = temp_htf_analysis.get("final_df")
                             rows_info = len(htf_df) if isinstance(htf_df, pd.DataFrame) else "invalid/None"
                             if isinstance(htf_df, pd.DataFrame) and len(htf_df) >= min_rows:
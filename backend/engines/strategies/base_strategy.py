@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, ClassVar, Tuple
+from typing import Dict, Any, Optional, List, ClassVar, Set, Tuple
 import logging
 import pandas as pd
 import json
@@ -38,11 +38,40 @@ class BaseStrategy(ABC):
     """
     strategy_name: str = "BaseStrategy"
     default_config: ClassVar[Dict[str, Any]] = {}
+    # The indicators (names or indicator_configs aliases) a strategy reads from its primary and
+    # its HTF analysis; see indicator_demand. None means undeclared: the analyzer then computes everything.
+    required_indicators: ClassVar[Optional[Tuple[str, ...]]] = None
+    required_htf_indicators: ClassVar[Tuple[str, ...]] = ()
+    # Read by the shared risk engine for every blueprint, whatever the strategy declares.
+    RISK_INDICATORS: ClassVar[Tuple[str, ...]] = ('atr', 'adx', 'structure', 'pivots')
 
     def __init__(self, primary_analysis: Dict[str, Any], config: Dict[str, Any], main_config: Dict[str, Any], primary_timeframe: str, symbol: str, htf_analysis: Optional[Dict[str, Any]] = None):
         self.analysis, self.config, self.main_config, self.htf_analysis = primary_analysis, deep_merge(self.default_config, config or {}), main_config, htf_analysis or {}
         self.primary_timeframe, self.symbol, self.price_data, self.df = primary_timeframe, symbol, self.analysis.get('price_data'), self.analysis.get('final_df')
         self.indicator_configs, self.log_details, self.name = self.config.get('indicator_configs', {}), {"criteria_results": [], "indicator_trace": [], "risk_trace": []}, self.config.get('name', self.strategy_name)
+        # indicator_configs alias -> unique key, resolved on first lookup (the config is fixed for the instance).
+        self._alias_keys: Dict[str, str] = {}
+
+    @classmethod
+    def indicator_demand(cls, config: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Set[str]], Set[str]]:
+        """
+        (primary, HTF) indicators this strategy reads under `config`, resolved the way
+        get_indicator resolves them: an indicator_configs alias becomes its unique key,
+        any other name stays a name. The HTF set adds the htf_confirmations rules.
+        The primary set is None when the strategy declares no requirements.
+        """
+        merged = deep_merge(cls.default_config, config or {}); aliases = merged.get('indicator_configs', {})
+        def resolve(name: str) -> str:
+            if name not in aliases: return name
+            return get_indicator_config_key(aliases[name].get('name', name), aliases[name].get('params', {}))
+        htf = {resolve(name) for name in (*cls.required_htf_indicators, *merged.get('htf_confirmations', {})) if name != 'min_required_score'}
+        if cls.required_indicators is None: return None, htf
+        return {resolve(name) for name in (*cls.required_indicators, *cls.RISK_INDICATORS, *cls.configured_indicators(merged))}, htf
+
+    @classmethod
+    def configured_indicators(cls, config: Dict[str, Any]) -> Tuple[str, ...]:
+        """Primary indicators chosen by config values rather than fixed by the strategy; none by default."""
+        return ()
 
     # --- Logging Methods (Unchanged) ---
     def _log_criteria(self, criterion_name: str, status: Any, reason: str = ""):
@@ -70,7 +99,9 @@ class BaseStrategy(ABC):
         if not source: return None
         indicator_map = source.get('_indicator_map', {}); indicator_data, unique_key = None, None
         if name_or_alias in self.indicator_configs:
-            order = self.indicator_configs[name_or_alias]; unique_key = get_indicator_config_key(order.get('name', name_or_alias), order.get('params', {}))
+            unique_key = self._alias_keys.get(name_or_alias)
+            if unique_key is None:
+                order = self.indicator_configs[name_or_alias]; unique_key = self._alias_keys[name_or_alias] = get_indicator_config_key(order.get('name', name_or_alias), order.get('params', {}))
         elif name_or_alias in indicator_map: unique_key = indicator_map.get(name_or_alias)
         if not unique_key: self._log_indicator_trace(name_or_alias, None, status="FAILED", reason="Indicator key could not be resolved."); return None
         indicator_data = source.get(unique_key)
@@ -1,7 +1,7 @@
 # backend/engines/strategies/BollingerBandsDirectedMaestro.py (v17.0 - The Unified Squeeze Engine)
 
 import logging
-from typing import Dict, Any, Optional, ClassVar, List
+from typing import Dict, Any, Optional, ClassVar, List, Tuple
 
 from .base_strategy import BaseStrategy
 
@@ -20,6 +20,7 @@ class BollingerBandsDirectedMaestro(BaseStrategy):
     squeeze breakouts. All other fronts are preserved in their perfected state.
     """
     strategy_name: str = "BollingerBandsDirectedMaestro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('bollinger', 'rsi', 'adx', 'patterns', 'volume', 'atr', 'divergence', 'macd', 'pivots', 'structure', 'supertrend', 'ranging_divergence')
     
     default_config: ClassVar[Dict[str, Any]] = {
       "enabled": True, "direction": 0,
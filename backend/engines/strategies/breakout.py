@@ -18,6 +18,7 @@ class BreakoutHunter(BaseStrategy):
     `indicators` dictionary, completing the intended code cleanup.
     """
     strategy_name: str = "BreakoutHunter"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('donchian_channel', 'bollinger', 'whales', 'cci', 'atr', 'structure', 'pivots', 'adx')
 
     default_config: ClassVar[Dict[str, Any]] = {
         "min_breakout_score": 6,
@@ -77,8 +78,7 @@ class BreakoutHunter(BaseStrategy):
             return None
         
         # --- 1. Data Gathering & Availability Check ---
-        required_names = ['donchian_channel', 'bollinger', 'whales', 'cci', 'atr', 'structure', 'pivots', 'adx']
-        indicators = {name.lower(): self.get_indicator(name) for name in required_names}
+        indicators = {name.lower(): self.get_indicator(name) for name in self.required_indicators}
         
         missing_indicators = [name for name, data in indicators.items() if data is None]
         if missing_indicators:
@@ -2,7 +2,7 @@
 
 import logging
 import pandas as pd
-from typing import Dict, Any, Optional, ClassVar
+from typing import Dict, Any, Optional, ClassVar, Tuple
 
 from .base_strategy import BaseStrategy
 
@@ -21,6 +21,7 @@ class ChandelierTrendRider(BaseStrategy):
     sacrificing its core risk management principles.
     """
     strategy_name = "ChandelierTrendRider"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('supertrend', 'adx', 'chandelier_exit', 'bollinger', 'atr')
 
     default_config: ClassVar[Dict[str, Any]] = {
         # ✅ ARCHITECTURAL UPGRADE (v6.0): New Scoring Engine
@@ -83,8 +84,7 @@ class ChandelierTrendRider(BaseStrategy):
             self._log_final_decision("HOLD", "No price data available.")
             return None
             
-        required_names = ['supertrend', 'adx', 'chandelier_exit', 'bollinger', 'atr']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         missing_indicators = [name for name, data in indicators.items() if data is None]
         data_is_ok = not missing_indicators
         self._log_criteria("Data Availability", data_is_ok, f"Invalid/Missing: {', '.join(missing_indicators)}" if not data_is_ok else "All required indicator data is valid.")
@@ -1,7 +1,7 @@
 # backend/engines/strategies/divergence_sniper.py (v5.0 - Peer-Reviewed & Hardened)
 
 import logging
-from typing import Dict, Any, Optional, List, ClassVar
+from typing import Dict, Any, Optional, List, ClassVar, Tuple
 from .base_strategy import BaseStrategy
 
 logger = logging.getLogger(__name__)
@@ -16,6 +16,7 @@ class DivergenceSniperPro(BaseStrategy):
     complete HTF confirmation logic.
     """
     strategy_name: str = "DivergenceSniperPro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('divergence', 'structure', 'williams_r', 'atr', 'whales', 'patterns')
 
     default_config: ClassVar[Dict[str, Any]] = {
         "volume_confirmation_enabled": True,
@@ -58,8 +59,7 @@ class DivergenceSniperPro(BaseStrategy):
             return None
 
         # --- 1. Data Availability Check ---
-        required_names = ['divergence', 'structure', 'williams_r', 'atr', 'whales', 'patterns']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         missing_indicators = [name for name, data in indicators.items() if data is None]
         data_is_ok = not missing_indicators
         self._log_criteria("Data Availability", data_is_ok, "All required indicator data is valid." if data_is_ok else f"Invalid/Missing: {', '.join(missing_indicators)}")
@@ -1,7 +1,7 @@
 # backend/engines/strategies/Ema_Crossover.py - (v8.1 - Critical Bug Fix)
 
 import logging
-from typing import Dict, Any, Optional, ClassVar, List
+from typing import Dict, Any, Optional, ClassVar, List, Tuple
 from .base_strategy import BaseStrategy
 
 logger = logging.getLogger(__name__)
@@ -16,6 +16,7 @@ class EmaCrossoverStrategy(BaseStrategy):
     features and the OHRE v3.0 harmonization from v8.0 are preserved.
     """
     strategy_name: str = "EmaCrossoverStrategy"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('ema_cross', 'atr', 'adx', 'rsi', 'divergence', 'structure', 'pivots', 'macd', 'whales', 'patterns', 'stochastic', 'volume')
 
     # --- Default config is now fully harmonized with the code logic ---
     default_config: ClassVar[Dict[str, Any]] = {
@@ -48,6 +49,10 @@ class EmaCrossoverStrategy(BaseStrategy):
             "supertrend": {"weight": 1}
         }
     }
+
+    @classmethod
+    def configured_indicators(cls, config: Dict[str, Any]) -> Tuple[str, ...]:
+        return (config.get('master_trend_ma_indicator', 'fast_ma'),) if config.get('master_trend_filter_enabled') else ()
     
     def check_signal(self) -> Optional[Dict[str, Any]]:
         cfg = self.config
@@ -17,6 +17,7 @@ class ConfluenceSniper(BaseStrategy):
     all original trading logic.
     """
     strategy_name: str = "ConfluenceSniper"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('fibonacci', 'structure', 'rsi', 'stochastic', 'atr', 'patterns', 'whales', 'adx')
     
     default_config: ClassVar[Dict[str, Any]] = {
         "fib_levels_to_watch": ["38.2%", "50.0%", "61.8%", "78.6%"],
@@ -132,8 +133,7 @@ class ConfluenceSniper(BaseStrategy):
             return None
 
         # --- 1. Data Availability ---
-        required_names = ['fibonacci', 'structure', 'rsi', 'stochastic', 'atr', 'patterns', 'whales', 'adx']
-        indicators = {name: self.get_indicator(name) for name in list(set(required_names))}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         missing = [name for name, data in indicators.items() if data is None]
         if missing:
             self._log_final_decision("HOLD", f"Indicators missing: {', '.join(missing)}")
@@ -17,6 +17,7 @@ class IchiMACDPro(BaseStrategy):
     eliminating any ambiguity in the strategy's decision-making process.
     """
     strategy_name: str = "IchiMACDPro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('ichimoku', 'macd', 'rsi', 'adx', 'structure', 'pivots', 'atr')
 
     default_config: ClassVar[Dict[str, Any]] = {
         "market_regime_filter": {
@@ -41,9 +42,7 @@ class IchiMACDPro(BaseStrategy):
     def check_signal(self) -> Optional[Dict[str, Any]]:
         cfg = self.config
         
-        required_names = ['ichimoku', 'macd', 'rsi', 'adx', 'structure', 'pivots', 'atr']
-        
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         if any(data is None for data in indicators.values()):
             missing = [name for name, data in indicators.items() if data is None]
             self._log_final_decision("HOLD", f"Indicators missing: {', '.join(missing)}"); return None
@@ -22,6 +22,8 @@ class IchimokuHybridPro(BaseStrategy):
     gold standard.
     """
     strategy_name: str = "IchimokuHybridPro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('ichimoku', 'adx', 'atr', 'volume', 'keltner_channel', 'rsi', 'patterns', 'macd', 'supertrend', 'pivots', 'structure')
+    required_htf_indicators: ClassVar[Tuple[str, ...]] = ('ichimoku', 'adx', 'supertrend', 'macd')
     
     # --- Default config cleaned of all obsolete risk parameters ---
     default_config: ClassVar[Dict[str, Any]] = {
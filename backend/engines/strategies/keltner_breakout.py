@@ -25,6 +25,7 @@ class KeltnerMomentumBreakout(BaseStrategy):
         indicators like ADX and Volume, creating a more efficient system.
     """
     strategy_name: str = "KeltnerMomentumBreakout"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('keltner_channel', 'cci', 'volume', 'adx', 'atr', 'rsi', 'patterns', 'supertrend', 'macd', 'pivots', 'structure', 'fibonacci')
 
     default_config: ClassVar[Dict[str, Any]] = {
         "market_regime_filter_enabled": True, "required_regime": "TRENDING", "adx_percentile_threshold": 80.0,
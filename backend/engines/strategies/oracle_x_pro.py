@@ -25,6 +25,8 @@ class OracleXPro(BaseStrategy):
         detection and confirmation scoring engines are 100% preserved.
     """
     strategy_name: str = "OracleXPro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('fibonacci', 'pivots', 'structure', 'rsi', 'stochastic', 'whales', 'patterns', 'atr', 'adx', 'ichimoku')
+    required_htf_indicators: ClassVar[Tuple[str, ...]] = ('ichimoku', 'adx')
 
     # --- Default config updated for new architecture ---
     default_config: ClassVar[Dict[str, Any]] = {
@@ -1,7 +1,7 @@
 # strategies/pivot_reversal.py (v4.2 - Flexible Oscillator Logic)
 
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, ClassVar, Tuple
 
 from .base_strategy import BaseStrategy
 
@@ -18,6 +18,7 @@ class PivotConfluenceSniper(BaseStrategy):
     This elevates the strategy's adaptability to match our best practices.
     """
     strategy_name: str = "PivotConfluenceSniper"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('pivots', 'structure', 'stochastic', 'cci', 'atr', 'patterns')
 
     default_config = {
         "default_params": {
@@ -77,8 +78,7 @@ class PivotConfluenceSniper(BaseStrategy):
             self._log_final_decision("HOLD", "No price data available.")
             return None
         
-        required_names = ['pivots', 'structure', 'stochastic', 'cci', 'atr', 'patterns']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         missing_indicators = [name for name, data in indicators.items() if data is None]
         
         data_is_ok = not missing_indicators
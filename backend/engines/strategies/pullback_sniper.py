@@ -17,6 +17,7 @@ class PullbackSniperPro(BaseStrategy):
     elevating the strategy to its ultimate, legendary form.
     """
     strategy_name: str = "PullbackSniperPro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('fast_ma', 'supertrend', 'fibonacci', 'divergence', 'patterns', 'atr', 'structure', 'pivots', 'rsi', 'stochastic', 'volume', 'adx')
 
     # --- [ORACLE-X CALIBRATION v2.2] ---
     # Final calibrations applied for The Ghost Protocol doctrine.
@@ -152,9 +153,7 @@ class PullbackSniperPro(BaseStrategy):
     def check_signal(self) -> Optional[Dict[str, Any]]:
         cfg = self.config
         if not self.price_data: return None
-        required_names = ['fast_ma', 'supertrend', 'fibonacci', 'divergence', 'patterns', 'atr', 
-                          'structure', 'pivots', 'rsi', 'stochastic', 'volume', 'adx']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         if any(data is None for data in indicators.values()):
             self._log_criteria("Data Availability", False, "One or more required indicators are missing."); return None
         
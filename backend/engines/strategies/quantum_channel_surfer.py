@@ -18,6 +18,8 @@ class QuantumChannelSurfer(BaseStrategy):
     ensures flawless, stable execution.
     """
     strategy_name: str = "QuantumChannelSurfer"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('fast_ma', 'stochastic', 'macd', 'structure', 'pivots', 'atr', 'adx', 'donchian_channel')
+    required_htf_indicators: ClassVar[Tuple[str, ...]] = ('adx', 'donchian_channel')
 
     default_config: ClassVar[Dict[str, Any]] = {
         # ✅ ARCHITECTURE: Now follows the standard, robust pattern.
@@ -96,8 +98,7 @@ class QuantumChannelSurfer(BaseStrategy):
         cfg = self.config
         
         # ✅ SIMPLIFIED: No more 'htf_' aliases needed. BaseStrategy handles HTF access.
-        required_names = ['fast_ma', 'stochastic', 'macd', 'structure', 'pivots', 'atr']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         if any(data is None for data in indicators.values()):
             missing = [name for name, data in indicators.items() if data is None]
             self._log_final_decision("HOLD", f"Indicators missing: {', '.join(missing)}"); return None
@@ -18,6 +18,7 @@ class RangeHunterPro(BaseStrategy):
     ensuring maximum robustness against incomplete data from any source.
     """
     strategy_name: str = "RangeHunterPro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('bollinger', 'adx', 'rsi', 'atr', 'stochastic', 'patterns', 'structure', 'pivots', 'macd', 'ranging_divergence')
 
     default_config: ClassVar[Dict[str, Any]] = {
         "regime_filter": {
@@ -87,8 +88,7 @@ class RangeHunterPro(BaseStrategy):
             self._log_final_decision("HOLD", "Price data is not available for this candle.")
             return None
 
-        required_names = ['bollinger', 'adx', 'rsi', 'atr', 'stochastic', 'patterns', 'structure', 'pivots', 'macd', 'ranging_divergence']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         
         missing_indicators = [
             name for name, data in indicators.items()
@@ -19,6 +19,7 @@ class TrendRiderPro(BaseStrategy):
     evolutionary line.
     """
     strategy_name: str = "TrendRiderPro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('adx', 'fast_ma', 'supertrend', 'rsi', 'macd', 'structure', 'pivots', 'atr')
 
     default_config: ClassVar[Dict[str, Any]] = {
         # --- Stage 1: Battlefield Selection ---
@@ -125,9 +126,7 @@ class TrendRiderPro(BaseStrategy):
         cfg = self._get_signal_config()
         if not self.price_data: self._log_final_decision("HOLD", "No price data available."); return None
 
-        # ✅ CRITICAL FIX: Added 'atr' which is essential for OHRE v3.0
-        required_names = ['adx', 'fast_ma', 'supertrend', 'rsi', 'macd', 'structure', 'pivots', 'atr']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         if any(data is None for data in indicators.values()):
             self._log_final_decision("HOLD", f"Indicators missing: {', '.join(missing)}"); return None
         
@@ -18,6 +18,7 @@ class VolumeCatalystPro(BaseStrategy):
     trends for superior observability.
     """
     strategy_name: str = "VolumeCatalystPro"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('structure', 'whales', 'cci', 'keltner_channel', 'bollinger', 'atr')
     default_config: ClassVar[Dict[str, Any]] = {
         "min_quality_score": 70.0, # Now a float for higher precision
         "weights": { "volume_catalyst_strength": 4, "momentum_thrust": 3, "volatility_release": 3, },
@@ -84,8 +85,7 @@ class VolumeCatalystPro(BaseStrategy):
         cfg = self.config
         if not self.price_data: self._log_final_decision("HOLD", "No price data available."); return None
         
-        required_names = ['structure', 'whales', 'cci', 'keltner_channel', 'bollinger', 'atr']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         missing = [name for name, data in indicators.items() if data is None or not data.get('values')]
         if missing:
             reason = f"Invalid/Missing indicators (or 'values' key): {', '.join(missing)}"
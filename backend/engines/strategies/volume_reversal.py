@@ -18,6 +18,7 @@ class WhaleReversal(BaseStrategy):
     making it a truly robust and flexible reversal hunting engine.
     """
     strategy_name: str = "WhaleReversal"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('structure', 'whales', 'patterns', 'atr', 'bollinger', 'adx')
     default_config: ClassVar[Dict[str, Any]] = {
         "min_reversal_score": 7,
         "weights": { "whale_intensity": 4, "rejection_wick": 3, "volatility_context": 2, "candlestick_pattern": 2 },
@@ -85,8 +86,7 @@ class WhaleReversal(BaseStrategy):
         cfg = self.config or {}
         if not self.price_data: self._log_final_decision("HOLD", "No price data available."); return None
             
-        required_names = ['structure', 'whales', 'patterns', 'atr', 'bollinger', 'adx']
-        indicators = {name: self.get_indicator(name) for name in required_names}
+        indicators = {name: self.get_indicator(name) for name in self.required_indicators}
         missing = [k for k, v in indicators.items() if v is None or not v.get('values')]
         if missing:
             reason = f"Invalid/Missing indicators (or 'values' key): {', '.join(missing)}"
@@ -19,6 +19,7 @@ class VwapMeanReversion(BaseStrategy):
     production use.
     """
     strategy_name: str = "VwapMeanReversion"
+    required_indicators: ClassVar[Tuple[str, ...]] = ('vwap_bands', 'atr', 'adx')
     default_config: ClassVar[Dict[str, Any]] = {
         "max_adx_for_reversion": 22.0,
         "min_rr_ratio": 1.5,
@@ -35,6 +36,10 @@ class VwapMeanReversion(BaseStrategy):
         }
     }
 
+    @classmethod
+    def configured_indicators(cls, config: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(name for key, name in (('use_rsi', 'rsi'), ('use_williams_r', 'williams_r'), ('require_candle_confirmation', 'patterns')) if config.get(key))
+
     # ---------- Helpers (Unchanged) ----------
     def _get_signal_config(self) -> Dict[str, Any]:
         return self.config
@@ -82,11 +87,7 @@ class VwapMeanReversion(BaseStrategy):
             return None
 
         # --- 1. Data Availability (Unchanged) ---
-        required_names = ['vwap_bands', 'atr', 'adx']
-        if cfg.get('use_rsi'): required_names.append('rsi')
-        if cfg.get('use_williams_r'): required_names.append('williams_r')
-        if cfg.get('require_candle_confirmation'): required_names.append('patterns')
-        indicators = {name: self.get_indicator(name) for name in dict.fromkeys(required_names)}
+        indicators = {name: self.get_indicator(name) for name in (*self.required_indicators, *self.configured_indicators(cfg))}
         missing = [name for name, data in indicators.items() if not data or 'values' not in data]
         if missing:
             reason = f"Invalid/Missing indicators (or 'values' key): {', '.join(missing)}"
@@ -6,6 +6,8 @@ import logging
 import asyncio
 from typing import Optional
 
+from core.transport import build_transport, is_replaying, REDACTED
+
 logger = logging.getLogger(__name__)
 
 class TelegramHandler:
@@ -17,8 +19,10 @@ class TelegramHandler:
     - Features a generous and configurable timeout.
     """
     def __init__(self):
-        self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-        self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
+        # A replay answers from the cassette, which never holds the real credentials.
+        placeholder = REDACTED if is_replaying() else None
+        self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN') or placeholder
+        self.chat_id = os.getenv('TELEGRAM_CHAT_ID') or placeholder
         
         if not self.bot_token or not self.chat_id:
             logger.error("TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set. Notifications disabled.")
@@ -29,7 +33,7 @@ class TelegramHandler:
             # ✅ UPGRADE: Define a generous timeout
             timeout = httpx.Timeout(10.0, read=20.0, connect=5.0)
             # ✅ UPGRADE: Create a single, persistent client for efficiency
-            self.client = httpx.AsyncClient(timeout=timeout)
+            self.client = httpx.AsyncClient(timeout=timeout, transport=build_transport('telegram'))
             self.is_configured = True
             logger.info("TelegramHandler initialized successfully.")
 
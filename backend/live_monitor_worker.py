@@ -1,6 +1,7 @@
-# live_monitor_worker.py (v4.2 - Dependency Injection)
+# live_monitor_worker.py (v4.5 - Cross-Symbol Indicator Batches)
 
 import asyncio
+import hashlib
 import logging
 import os
 import django
@@ -8,7 +9,6 @@ import time
 import json
 from typing import Dict, Tuple, List, Any, Optional
 
-import pandas as pd
 from asgiref.sync import sync_to_async
 
 logger = logging.getLogger(__name__)
@@ -16,8 +16,12 @@ logger = logging.getLogger(__name__)
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'trading_app.settings')
 django.setup()
 
+from core.candle_history import CandleHistory
 from core.exchange_fetcher import ExchangeFetcher
+from core.stream_fetcher import CandleStreamFetcher
+from core.transport import transport_stats
 from engines.master_orchestrator import MasterOrchestrator
+from engines.indicators.base import enable_copy_on_write
 from engines.signal_adapter import SignalAdapter
 from engines.telegram_handler import TelegramHandler
 from core.models import AnalysisSnapshot
@@ -42,6 +46,54 @@ class SignalCache:
         self._cache[(symbol, timeframe, direction)] = time.time()
         logger.info(f"Signal {(symbol, timeframe, direction)} stored in cache.")
 
+class UnchangedCandleCache:
+    """
+    The last analysis and strategy inputs per (symbol, timeframe), keyed by a fingerprint
+    of the pair's last closed candle and the config. While a pair's next candle cannot
+    have closed yet its fetch is skipped; when a fetch shows the same last closed candle
+    its analysis is reused; a strategy run whose primary and HTF fingerprints all match
+    the previous run is skipped (its snapshot and alert were already handled).
+    """
+    def __init__(self, config_hash: str):
+        self.config_hash = config_hash
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.stats = {'fetches_skipped': 0, 'analyses_reused': 0, 'strategies_skipped': 0}
+
+    def fingerprint(self, df, timeframe_ms: int, now_ms: int) -> Optional[Tuple]:
+        """(config hash, open time and OHLCV of the last closed candle), or None when none has closed."""
+        open_ms = df.index.as_unit('ms').asi8; closed = open_ms + timeframe_ms <= now_ms
+        if not closed.any(): return None
+        row = int(closed.nonzero()[0][-1]); last = df.iloc[row]
+        return (self.config_hash, int(open_ms[row]), *(float(last[c]) for c in ('open', 'high', 'low', 'close', 'volume')))
+
+    def fresh_analysis(self, key: Tuple[str, str], timeframe_ms: int, now_ms: int) -> Optional[Dict[str, Any]]:
+        """The cached analysis while the candle after the cached last closed one is still forming."""
+        entry = self._entries.get(key)
+        if not entry or entry['fingerprint'][0] != self.config_hash or now_ms >= entry['fingerprint'][1] + 2 * timeframe_ms: return None
+        self.stats['fetches_skipped'] += 1; return entry['analysis']
+
+    def reuse_analysis(self, key: Tuple[str, str], fingerprint: Optional[Tuple]) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if fingerprint is None or not entry or entry['fingerprint'] != fingerprint: return None
+        self.stats['analyses_reused'] += 1; return entry['analysis']
+
+    def store_analysis(self, key: Tuple[str, str], fingerprint: Optional[Tuple], analysis: Dict[str, Any]):
+        if fingerprint is None: self._entries.pop(key, None)
+        else: self._entries[key] = {'fingerprint': fingerprint, 'analysis': analysis, 'strategy_inputs': None}
+
+    def strategy_inputs(self, symbol: str, timeframes: List[str]) -> Optional[Tuple]:
+        """The fingerprints a strategy run on timeframes[0] depends on, or None if one is unknown."""
+        entries = [self._entries.get((symbol, tf)) for tf in timeframes]
+        return tuple(e['fingerprint'] for e in entries) if all(entries) else None
+
+    def strategy_unchanged(self, key: Tuple[str, str], inputs: Optional[Tuple]) -> bool:
+        entry = self._entries.get(key)
+        if inputs is None or not entry or entry['strategy_inputs'] != inputs: return False
+        self.stats['strategies_skipped'] += 1; return True
+
+    def store_strategy(self, key: Tuple[str, str], inputs: Optional[Tuple]):
+        if key in self._entries: self._entries[key]['strategy_inputs'] = inputs
+
 @sync_to_async
 def save_analysis_snapshot(symbol: str, timeframe: str, package: Dict[str, Any]):
     # This function is unchanged and correct.
@@ -53,29 +105,55 @@ def save_analysis_snapshot(symbol: str, timeframe: str, package: Dict[str, Any])
     except Exception as e:
         logger.error(f"Failed to save AnalysisSnapshot for {symbol}@{timeframe}: {e}", exc_info=True)
 
-async def run_single_analysis(symbol: str, timeframe: str, orchestrator: MasterOrchestrator, fetcher: ExchangeFetcher, analysis_state: Dict, global_context: Dict, new_states: Dict, semaphore: asyncio.Semaphore):
-    # This function is unchanged and correct.
+async def run_single_analysis(symbol: str, timeframe: str, orchestrator: MasterOrchestrator, fetcher: ExchangeFetcher, analysis_state: Dict, global_context: Dict, new_states: Dict, semaphore: asyncio.Semaphore, prefer_exchange: Optional[str] = None, unchanged: Optional[UnchangedCandleCache] = None, batch: Optional[Dict] = None):
     async with semaphore:
         try:
-            state_key = (symbol, timeframe); previous_df = analysis_state.get(state_key)
-            kline_limit = orchestrator.config.get("general", {}).get("fetcher_limit", 500)
-            df, source = await fetcher.get_first_successful_klines(symbol, timeframe, limit=kline_limit)
+            state_key = (symbol, timeframe)
+            # The fetcher's clock, so a replay judges candle closes by the recording time.
+            timeframe_ms, now_ms = fetcher.timeframe_ms(timeframe), fetcher.now_ms()
+            if unchanged and (cached := unchanged.fresh_analysis(state_key, timeframe_ms, now_ms)) is not None:
+                logger.info(f"No new closed candle possible yet for {symbol}@{timeframe}. Reusing the previous analysis without fetching.")
+                global_context[symbol][timeframe] = cached; return
+            kline_limit, min_rows = orchestrator.get_kline_requirements(timeframe)
+            # One fixed-size candle history per pair, sized by the indicator plan; merged in place every cycle.
+            history = analysis_state.get(state_key) or CandleHistory(*orchestrator.get_history_sizing(timeframe))
+            df, source = await fetcher.get_first_successful_klines(symbol, timeframe, limit=kline_limit, prefer=prefer_exchange, min_rows=min_rows)
             if df is None or df.empty:
                 logger.warning(f"Could not fetch data for {symbol}@{timeframe}. Skipping analysis.")
                 return
-            analysis_result, new_state_df = await orchestrator.run_analysis_pipeline(df, symbol, timeframe, previous_df=previous_df)
+            fingerprint = unchanged.fingerprint(df, timeframe_ms, now_ms) if unchanged else None
+            if unchanged and (cached := unchanged.reuse_analysis(state_key, fingerprint)) is not None:
+                logger.info(f"Last closed candle of {symbol}@{timeframe} is unchanged. Reusing the previous analysis.")
+                global_context[symbol][timeframe] = cached; return
+            # In batched mode the fetched candles wait for run_batch_analysis with the other symbols of this timeframe.
+            if batch is not None: batch.setdefault(timeframe, {})[symbol] = (df, history, fingerprint); return
+            analysis_result, _ = await orchestrator.run_analysis_pipeline(df, symbol, timeframe, history=history)
             if analysis_result: global_context[symbol][timeframe] = analysis_result
-            if new_state_df is not None and not new_state_df.empty: new_states[state_key] = new_state_df
+            if unchanged: unchanged.store_analysis(state_key, fingerprint if analysis_result else None, analysis_result)
+            if len(history): new_states[state_key] = history
         except Exception as e:
             logger.error(f"CRITICAL ERROR in analysis task for {symbol}@{timeframe}: {e}", exc_info=True)
             raise
 
-async def run_single_strategy(symbol: str, timeframe: str, orchestrator: MasterOrchestrator, global_context: Dict, cache: SignalCache, telegram: TelegramHandler, semaphore: asyncio.Semaphore):
-    # This function is unchanged and correct.
+async def run_batch_analysis(timeframe: str, entries: Dict[str, Tuple], orchestrator: MasterOrchestrator, global_context: Dict, new_states: Dict, unchanged: Optional[UnchangedCandleCache] = None):
+    try:
+        results = await orchestrator.run_batch_analysis_pipeline({s: e[0] for s, e in entries.items()}, timeframe, {s: e[1] for s, e in entries.items()})
+        for symbol, (_, history, fingerprint) in entries.items():
+            analysis_result = results.get(symbol)
+            if analysis_result: global_context[symbol][timeframe] = analysis_result
+            if unchanged: unchanged.store_analysis((symbol, timeframe), fingerprint if analysis_result else None, analysis_result)
+            if len(history): new_states[(symbol, timeframe)] = history
+    except Exception as e:
+        logger.error(f"CRITICAL ERROR in batched analysis for {len(entries)} symbols @{timeframe}: {e}", exc_info=True)
+
+async def run_single_strategy(symbol: str, timeframe: str, orchestrator: MasterOrchestrator, global_context: Dict, cache: SignalCache, telegram: TelegramHandler, semaphore: asyncio.Semaphore, unchanged: Optional[UnchangedCandleCache] = None):
     async with semaphore:
         try:
             if symbol not in global_context or timeframe not in global_context[symbol]: return
             primary_analysis = global_context[symbol][timeframe]; htf_context = global_context[symbol]
+            inputs = unchanged.strategy_inputs(symbol, [timeframe, *sorted(orchestrator.htf_timeframes(timeframe))]) if unchanged else None
+            if unchanged and unchanged.strategy_unchanged((symbol, timeframe), inputs):
+                logger.info(f"Inputs of {symbol}@{timeframe} are unchanged. Keeping the previous strategy result."); return
             final_signal_package = await orchestrator.run_strategy_pipeline(primary_analysis, htf_context, symbol, timeframe)
             if final_signal_package: await save_analysis_snapshot(symbol, timeframe, final_signal_package)
             if final_signal_package and final_signal_package.get("status") == "SUCCESS":
@@ -85,10 +163,45 @@ async def run_single_strategy(symbol: str, timeframe: str, orchestrator: MasterO
                     logger.info(f"🚀🚀 SIGNAL DETECTED! Preparing alert for {symbol}@{timeframe} {direction}")
                     success = await telegram.send_message_async(message)
                     if success: cache.store_signal(symbol, timeframe, direction)
+            # Recorded only once the result was fully handled, so a failed run is retried next cycle.
+            if unchanged: unchanged.store_strategy((symbol, timeframe), inputs)
         except Exception as e:
             logger.error(f"CRITICAL ERROR in strategy task for {symbol}@{timeframe}: {e}", exc_info=True)
             raise
 
+async def run_cycle(cycle_count: int, pairs: List[Tuple[str, str]], orchestrator: MasterOrchestrator, fetcher: ExchangeFetcher, analysis_state: Dict, global_context: Dict, cache: SignalCache, telegram: TelegramHandler, semaphore: asyncio.Semaphore, prefer_exchange: Optional[str] = None, unchanged: Optional[UnchangedCandleCache] = None, batched: bool = False):
+    start_time = time.time()
+    logger.info(f"--- Starting Cycle #{cycle_count} ({len(pairs)} symbol/timeframe pairs) ---")
+    new_states: Dict = {}
+    # Fetched candles per timeframe and symbol, analyzed together after the fetches (general.batched_indicators).
+    batch: Optional[Dict[str, Dict[str, Tuple]]] = {} if batched else None
+
+    logger.info(f"[Phase 1/2] Creating analysis tasks...")
+    analysis_tasks = [run_single_analysis(s, tf, orchestrator, fetcher, analysis_state, global_context, new_states, semaphore, prefer_exchange, unchanged, batch) for s, tf in pairs]
+    analysis_results = await asyncio.gather(*analysis_tasks, return_exceptions=True)
+    for timeframe, entries in (batch or {}).items(): await run_batch_analysis(timeframe, entries, orchestrator, global_context, new_states, unchanged)
+    analysis_state.update(new_states); logger.info(f"[Phase 1/2] Analysis phase complete.")
+
+    logger.info(f"[Phase 2/2] Creating strategy tasks...")
+    strategy_tasks = [run_single_strategy(s, tf, orchestrator, global_context, cache, telegram, semaphore, unchanged) for s, tf in pairs]
+    strategy_results = await asyncio.gather(*strategy_tasks, return_exceptions=True)
+
+    for i, result in enumerate(analysis_results):
+        if isinstance(result, Exception):
+            logger.error(f"Caught exception in analysis task {i}: {result}")
+    for i, result in enumerate(strategy_results):
+        if isinstance(result, Exception):
+            logger.error(f"Caught exception in strategy task {i}: {result}")
+
+    rate_stats = fetcher.get_rate_limit_stats()
+    if rate_stats: logger.info(f"Rate limiter stats (cumulative): {json.dumps(rate_stats)}")
+    logger.info(f"Fetch cache stats: {json.dumps(fetcher.get_cache_stats())}")
+    if unchanged: logger.info(f"Unchanged candle stats (cumulative): {json.dumps(unchanged.stats)}")
+    cycle_duration = time.time() - start_time
+    io_stats = transport_stats()
+    if io_stats: logger.info(f"Transport stats (cumulative network seconds, measured or replayed): {json.dumps(io_stats)}")
+    logger.info(f"--- Cycle #{cycle_count} finished in {cycle_duration:.2f} seconds. ---")
+
 async def main_loop():
     try:
         with open('config.json', 'r', encoding='utf-8') as f: config = json.load(f)
@@ -101,6 +214,8 @@ async def main_loop():
     logging.basicConfig(level=root_log_level, format='%(asctime)s - %(levelname)s - [%(name)s] - %(message)s', force=True)
     logging.getLogger("core").setLevel(root_log_level); logging.getLogger("engines").setLevel(root_log_level)
     logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Indicators share one OHLCV frame through shallow copies; on pandas 2.x that needs Copy-on-Write switched on.
+    enable_copy_on_write()
 
     symbols = general_config.get("symbols_to_monitor", []); timeframes = general_config.get("timeframes_to_analyze", [])
     poll_interval, max_concurrent = general_config.get("poll_interval_seconds", 300), general_config.get("max_concurrent_tasks", 5)
@@ -115,37 +230,52 @@ async def main_loop():
     orchestrator = MasterOrchestrator(config=config, telegram_handler=telegram)
     cache = SignalCache(ttl_map_hours=config.get("signal_cache", {}).get("ttl_map_hours", {}), default_ttl_hours=config.get("signal_cache", {}).get("default_ttl_hours", 4))
 
-    version = orchestrator.ENGINE_VERSION; analysis_state: Dict[Tuple[str, str], pd.DataFrame] = {}
+    version = orchestrator.ENGINE_VERSION; analysis_state: Dict[Tuple[str, str], CandleHistory] = {}
+    # general.skip_unchanged_candles: pairs whose last closed candle (and the config) did not change are not re-analyzed.
+    config_hash = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    unchanged = UnchangedCandleCache(config_hash) if general_config.get("skip_unchanged_candles", False) else None
+    # general.batched_indicators: each timeframe's symbols share one vectorized pass per batched indicator
+    # (it takes precedence over analysis_execution.mode "process"; see MasterOrchestrator.execution_mode).
+    batched = orchestrator.batched
 
     logger.info("=" * 50); logger.info(f"  AiSignalPro Live Worker (v{version}) - Fully Async & Hardened"); logger.info(f"  Root Log Level set to: {logging.getLevelName(root_log_level)}"); logger.info(f"  Monitoring {len(symbols)} symbols on {len(timeframes)} timeframes."); logger.info("=" * 50)
     await telegram.send_message_async(f"✅ *AiSignalPro Bot (v{version}) is LIVE!* (Log Level: {log_level_str})")
 
-    semaphore = asyncio.Semaphore(max_concurrent); cycle_count = 0
-    while True:
-        cycle_count += 1; start_time = time.time()
-        logger.info(f"--- Starting Cycle #{cycle_count} ---")
-
-        global_context = {s: {} for s in symbols}; new_states: Dict = {}
-        
-        logger.info(f"[Phase 1/2] Creating analysis tasks...")
-        analysis_tasks = [run_single_analysis(s, tf, orchestrator, fetcher, analysis_state, global_context, new_states, semaphore) for s in symbols for tf in timeframes]
-        analysis_results = await asyncio.gather(*analysis_tasks, return_exceptions=True)
-        analysis_state.update(new_states); logger.info(f"[Phase 1/2] Analysis phase complete.")
-
-        logger.info(f"[Phase 2/2] Creating strategy tasks...")
-        strategy_tasks = [run_single_strategy(s, tf, orchestrator, global_context, cache, telegram, semaphore) for s in symbols for tf in timeframes]
-        strategy_results = await asyncio.gather(*strategy_tasks, return_exceptions=True)
-        
-        for i, result in enumerate(analysis_results):
-            if isinstance(result, Exception):
-                logger.error(f"Caught exception in analysis task {i}: {result}")
-        for i, result in enumerate(strategy_results):
-            if isinstance(result, Exception):
-                logger.error(f"Caught exception in strategy task {i}: {result}")
-        
-        cycle_duration = time.time() - start_time
-        logger.info(f"--- Cycle #{cycle_count} finished in {cycle_duration:.2f} seconds. Sleeping for {poll_interval} seconds... ---")
-        await asyncio.sleep(poll_interval)
+    semaphore = asyncio.Semaphore(max_concurrent)
+    ingestion_mode = general_config.get("ingestion_mode", "poll")
+    if ingestion_mode == "stream" and not CandleStreamFetcher.available():
+        logger.error("ingestion_mode 'stream' requires the 'websockets' package. Falling back to REST polling."); ingestion_mode = "poll"
+
+    try:
+        if ingestion_mode == "stream":
+            # ✅ STREAM MODE: analyze each symbol/timeframe as soon as its candle closes instead of on a fixed poll interval.
+            kline_limit = max(orchestrator.get_kline_requirements(tf)[0] for tf in timeframes)
+            stream = CandleStreamFetcher(fetcher, config.get("exchange_settings", {}).get("streaming", {}), symbols, timeframes, kline_limit)
+            stream_task = asyncio.create_task(stream.run()); global_context = {s: {} for s in symbols}; cycle_count = 0
+            logger.info(f"Stream ingestion enabled via '{stream.exchange}' ({stream.url}).")
+            try:
+                while True:
+                    batch_wait = asyncio.create_task(stream.next_batch())
+                    await asyncio.wait({batch_wait, stream_task}, return_when=asyncio.FIRST_COMPLETED)
+                    if stream_task.done():
+                        batch_wait.cancel(); stream_task.result()
+                    pairs = sorted(batch_wait.result()); cycle_count += 1
+                    await run_cycle(cycle_count, pairs, orchestrator, fetcher, analysis_state, global_context, cache, telegram, semaphore, prefer_exchange=stream.exchange, unchanged=unchanged, batched=batched)
+                    logger.info(f"Stream stats: {json.dumps(stream.stats)}")
+            finally:
+                stream_task.cancel()
+
+        cycle_count = 0
+        while True:
+            cycle_count += 1
+            global_context = {s: {} for s in symbols}
+            await run_cycle(cycle_count, [(s, tf) for s in symbols for tf in timeframes], orchestrator, fetcher, analysis_state, global_context, cache, telegram, semaphore, unchanged=unchanged, batched=batched)
+            logger.info(f"Sleeping for {poll_interval} seconds...")
+            await asyncio.sleep(poll_interval)
+    finally:
+        # Stops the analysis process pool (and indicator threads) so no worker processes outlive the bot.
+        orchestrator.close()
+        await fetcher.close()
 
 if __name__ == "__main__":
     try: asyncio.run(main_loop())